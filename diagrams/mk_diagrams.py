@@ -133,7 +133,7 @@ with Diagram("process chk_data", graph_attr=graph_attr, show=False):
             with Cluster("check_archival"):
                 rsc_chk_arch = Compute()
 
-            rsc_multiproc = Batch("multi_chk")
+            rsc_multiproc = Batch("inventory_chk")
 
     (
         cli_chk_data
@@ -14,6 +14,11 @@ Examples
 chk_data --project emorep
 chk_data --project emorep --complete
 chk_data --project archival
+chk_data --refresh-catalog
+chk_data --refresh-catalog --project archival
+chk_data --project emorep --watch --interval 600
+chk_data --project archival --trend --stall-days 30
+chk_data --complete --trend
 
 """
 # %%
@@ -41,6 +46,46 @@ def _get_args():
         default=None,
         help="""Name of project to check for MRI processing output""",
     )
+    parser.add_argument(
+        "--refresh-catalog",
+        action="store_true",
+        help=(
+            "Update the persistent file catalog of --project "
+            + "(default emorep) with\ndirectories changed since the last "
+            + "refresh, then run the check\nif --project is given"
+        ),
+    )
+
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=300,
+        help="Seconds between polls for --watch, default 300",
+    )
+    parser.add_argument(
+        "--stall-days",
+        type=int,
+        default=14,
+        help="Days unchanged before a partial cell is reported by --trend",
+    )
+    parser.add_argument(
+        "--trend",
+        action="store_true",
+        help=(
+            "Report weekly throughput per pipeline step and stalled "
+            + "cells\nfrom the progress history of --project and/or "
+            + "--complete,\nwithout checking files"
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Keep running after the --project check, re-checking "
+            + "participants\nwhose files change and rewriting the "
+            + "progress file"
+        ),
+    )
 
     if len(sys.argv) <= 1:
         parser.print_help(sys.stderr)
@@ -56,9 +101,30 @@ def main():
     project = args.project
     complete = args.complete
 
+    if args.refresh_catalog:
+        num_changed = data_metrics.CheckProjectMri().refresh_catalog(
+            project if project else "emorep"
+        )
+        print(f"Catalog refreshed, {num_changed} directories changed")
+    if args.watch and not project:
+        raise ValueError("--watch requires --project")
+    if args.trend and not (project or complete):
+        raise ValueError("--trend requires --project or --complete")
+    if args.trend:
+        trend_list = [project] if project else []
+        if complete:
+            trend_list.append("emorep_complete")
+        for trend_name in trend_list:
+            data_metrics.CheckProjectMri().report_trend(
+                trend_name, stall_days=args.stall_days
+            )
+        sys.exit(0)
     if project:
         do_chk = data_metrics.CheckProjectMri()
-        do_chk.run_check(project)
+        if args.watch:
+            do_chk.watch_check(project, interval=args.interval)
+        else:
+            do_chk.run_check(project)
     if complete:
         print("Complete is currently deprecated")
         sys.exit(0)
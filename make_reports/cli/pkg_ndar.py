@@ -0,0 +1,85 @@
+r"""Package NDAR submission cycle for upload.
+
+Stream the datasets of a submission cycle and the host files they
+reference (data_file1, data_file2, image_file columns) into a single
+compressed tar archive, keeping the ndar_upload layout. Archive is
+written to:
+    <proj_dir>/ndar_upload/cycle_<close_date>.tar.[zst|gz]
+
+Notes
+-----
+* Requires reports previously generated by rep_ndar.
+* With rep_ndar --incremental, <report>_delta.csv is packaged
+    instead of the cumulative <report>_dataset.csv.
+* Compression defaults to zstd when installed, otherwise gz,
+    utilizing pigz when installed.
+
+Examples
+--------
+pkg_ndar -c 2023-06-01
+pkg_ndar -c 2023-06-01 --compress gz
+
+"""
+
+import sys
+import textwrap
+from datetime import datetime
+from argparse import ArgumentParser, RawTextHelpFormatter
+from make_reports.workflows import required_reports
+
+
+def _get_args():
+    """Get and parse arguments."""
+    parser = ArgumentParser(
+        description=__doc__, formatter_class=RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--compress",
+        type=str,
+        choices=["zstd", "gz"],
+        help="Compression of archive",
+    )
+    parser.add_argument(
+        "--proj-dir",
+        type=str,
+        default="/mnt/keoki/experiments2/EmoRep/Exp2_Compute_Emotion",
+        help=textwrap.dedent(
+            """\
+            Path to project's experiment directory
+            (default : %(default)s)
+            """
+        ),
+    )
+
+    required_args = parser.add_argument_group("Required Arguments")
+    required_args.add_argument(
+        "-c",
+        "--close-date",
+        type=str,
+        help=textwrap.dedent(
+            """\
+            YYYY-06-01 or YYYY-12-01.
+            Close date of NDAR submission cycle to package.
+            """
+        ),
+        required=True,
+    )
+
+    if len(sys.argv) <= 1:
+        parser.print_help(sys.stderr)
+        sys.exit(0)
+
+    return parser
+
+
+def main():
+    """Capture arguments and trigger workflow."""
+    args = _get_args().parse_args()
+    close_date = datetime.strptime(args.close_date, "%Y-%m-%d").date()
+    required_reports.package_ndar(
+        args.proj_dir, close_date, compress=args.compress
+    )
+
+
+if __name__ == "__main__":
+    main()
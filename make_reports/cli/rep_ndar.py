@@ -12,7 +12,8 @@ Notes
 * Available reports:
     affim01, als01, bdi01, brd01, demo_info01, emrq01,
     image03, iec01, ndar_subject01, panas01, pswq01,
-    restsurv01, rrs01, stai01, tas01
+    restsurv01, rrs01, stai01, tas01, and survey reports
+    declared by reference_files/<report>_spec.json
 * Requires global variables 'PAT_REDCAP_EMOREP' and
     'PAT_QUALTRICS_EMOREP' in user env, which hold the
     personal access tokens to the emorep REDCap and
@@ -23,6 +24,11 @@ Examples
 rep_ndar -c 2022-12-01 --names demo_info01 affim01
 rep_ndar -c 2022-12-01 --not-image03
 rep_ndar -c 2022-12-01 --all
+rep_ndar -c 2022-12-01 --names image03 --jobs 8
+rep_ndar -c 2022-12-01 --not-image03 --report-jobs 4
+rep_ndar -c 2022-12-01 --all --gzip
+rep_ndar -c 2023-06-01 --all --incremental
+rep_ndar -c 2023-06-01 --all --checksums
 
 """
 
@@ -39,6 +45,42 @@ def _get_args():
     parser = ArgumentParser(
         description=__doc__, formatter_class=RawTextHelpFormatter
     )
+    parser.add_argument(
+        "--checksums",
+        action="store_true",
+        help=textwrap.dedent(
+            """\
+            Write sha256 manifest of hosted data_* files to
+            cycle_<close_date>/upload_manifest.sha256
+            """
+        ),
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Also write gzip-compressed archive copies of datasets",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=textwrap.dedent(
+            """\
+            Add only data not found in the previous cycle's datasets,
+            also writing new rows to <report>_delta.csv
+            """
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=textwrap.dedent(
+            """\
+            Number of worker processes for building image03,
+            one session per task (default : %(default)s)
+            """
+        ),
+    )
     parser.add_argument(
         "--not-image03",
         action="store_true",
@@ -55,6 +97,18 @@ def _get_args():
             """
         ),
     )
+    parser.add_argument(
+        "--report-jobs",
+        type=int,
+        default=1,
+        help=textwrap.dedent(
+            """\
+            Number of worker processes for building reports
+            other than image03, one report per task
+            (default : %(default)s)
+            """
+        ),
+    )
     parser.add_argument(
         "--all",
         action="store_true",
@@ -130,6 +184,9 @@ def main():
         "stai01",
         "tas01",
     ]
+    valid_reports = sorted(
+        set(valid_reports + report_helper.survey_specs())
+    )
     if ndar_reports_all:
         ndar_reports = valid_reports
     if not_image03:
@@ -139,7 +196,15 @@ def main():
             raise ValueError(f"Unexpected report name : {chk_rep}")
 
     # Generate requested reports
-    make_ndar = required_reports.MakeNdarReports(proj_dir, close_date)
+    make_ndar = required_reports.MakeNdarReports(
+        proj_dir,
+        close_date,
+        jobs=args.jobs,
+        report_jobs=args.report_jobs,
+        compress=args.gzip,
+        incremental=args.incremental,
+        checksums=args.checksums,
+    )
     make_ndar.make_report(ndar_reports)
 
 
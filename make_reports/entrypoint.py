@@ -15,6 +15,7 @@ def main():
                         aggregate task and rest ratings
         rep_regular : Generate regular reports submitted by lab manager
         rep_ndar    : Generate reports for NDAR submission
+        pkg_ndar    : Package NDAR datasets and host files for upload
         rep_metrics : Generate snapshots of the data to aid acquisition
         chk_data    : Check EmoRep and Archival data completeness,
                         pipeline progress.
@@ -3,7 +3,10 @@ from . import calc_metrics, calc_surveys
 from . import report_helper
 from . import survey_clean, survey_download
 from . import manage_data, check_data
-from . import sql_database
+from . import sql_database, file_catalog
+from . import progress_history, host_staging
+from . import acq_header, upload_manifest, ndar_package
+from . import nda_validate
 
 __all__ = [
     "build_ndar",
@@ -16,4 +19,11 @@ __all__ = [
     "manage_data",
     "check_data",
     "sql_database",
+    "file_catalog",
+    "progress_history",
+    "host_staging",
+    "acq_header",
+    "upload_manifest",
+    "ndar_package",
+    "nda_validate",
 ]
@@ -0,0 +1,250 @@
+"""Read BIOPAC AcqKnowledge (.acq) file headers.
+
+read_acq_date : return acquisition date of acq file
+acq_dates : return acquisition dates of acq files
+
+Notes
+-----
+Header layout follows the bioread package
+(https://github.com/uwmadison-chm/bioread), supporting AcqKnowledge
+>= 4.4 files which store marker creation times. Only the headers
+preceding the marker items are read, channel data are skipped.
+
+"""
+
+import os
+import struct
+import threading
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+
+# File revisions of AcqKnowledge 4.0 (first post-4 layout), the revision
+# adding 8 unknown marker bytes, 4.3 (padding headers), and 4.4 (marker
+# creation dates).
+_REV_400B = 61
+_REV_42X = 121
+_REV_430 = 124
+_REV_440 = 128
+
+# Graph header offsets, from the start of the file
+_GRAPH_EXT_LEN = 6
+_GRAPH_NUM_CHAN = 10
+_GRAPH_COMPRESSED = 972
+_GRAPH_PADDINGS = 2398
+
+# Channel header offset of sample count
+_CHAN_BUF_LEN = 88
+
+# Channel data type codes and their sample sizes
+_DTYPE_SIZE = {0: 8, 1: 8, 2: 2}
+_MAX_DTYPE_SCANS = 4096
+
+_REF_DATE = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+_DATE_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+
+class _AcqHeader:
+    """Parse headers of a post-4 AcqKnowledge file up to marker items.
+
+    Parameters
+    ----------
+    acq_file : file object
+        Opened in binary mode
+
+    Attributes
+    ----------
+    revision : int
+        AcqKnowledge file revision
+    marker_dates : list
+        datetime.datetime (UTC) creation times of event markers
+
+    Raises
+    ------
+    ValueError
+        File is from AcqKnowledge < 4 or headers are not recognized
+
+    """
+
+    def __init__(self, acq_file):
+        """Initialize."""
+        self._acq = acq_file
+        self._set_order()
+        if self.revision < _REV_400B:
+            raise ValueError(
+                f"Unsupported AcqKnowledge file revision : {self.revision}"
+            )
+        self._read_graph()
+        self._find_data()
+        self._read_markers()
+
+    def _unpack(self, fmt: str, offset: int) -> tuple:
+        """Unpack fmt at offset in file byte order."""
+        fmt = self._bom + fmt
+        self._acq.seek(offset)
+        buf = self._acq.read(struct.calcsize(fmt))
+        if len(buf) < struct.calcsize(fmt):
+            raise ValueError(f"Unexpected end of file at offset {offset}")
+        return struct.unpack(fmt, buf)
+
+    def _set_order(self):
+        """Determine byte order from file revision field."""
+        self._acq.seek(2)
+        buf = self._acq.read(4)
+        if len(buf) < 4:
+            raise ValueError("File too short for AcqKnowledge header")
+        # Revision is a small positive int in the correct byte order
+        self.revision, self._bom = min(
+            (struct.unpack(f"{x}i", buf)[0], x)
+            for x in ["<", ">"]
+            if struct.unpack(f"{x}i", buf)[0] > 0
+        )
+
+    def _read_graph(self):
+        """Read channel count, compression, and padding headers."""
+        (graph_len,) = self._unpack("i", _GRAPH_EXT_LEN)
+        (self._num_chan,) = self._unpack("h", _GRAPH_NUM_CHAN)
+        (compressed,) = self._unpack("i", _GRAPH_COMPRESSED)
+        self._compressed = compressed != 0
+        num_pad = 0
+        if self.revision >= _REV_430:
+            (num_pad,) = self._unpack("h", _GRAPH_PADDINGS)
+
+        # Skip padding headers, each leads with its length
+        offset = graph_len
+        for _ in range(num_pad):
+            (pad_len,) = self._unpack("i", offset)
+            offset += pad_len
+        self._chan_offset = offset
+
+    def _find_data(self):
+        """Find start and length of channel data."""
+        # Read sample count of each channel header
+        buf_lens = []
+        offset = self._chan_offset
+        for _ in range(self._num_chan):
+            (chan_len,) = self._unpack("i", offset)
+            (buf_len,) = self._unpack("i", offset + _CHAN_BUF_LEN)
+            buf_lens.append(buf_len)
+            offset += chan_len
+
+        # Skip foreign data, then scan for channel data type headers which
+        # occasionally follow extra bytes.
+        (foreign_len,) = self._unpack("i", offset)
+        dtype_offset = offset + foreign_len
+        for scan in range(_MAX_DTYPE_SCANS):
+            dtype_list = self._unpack(
+                "hh" * self._num_chan, dtype_offset + scan
+            )
+            size_list = dtype_list[0::2]
+            type_list = dtype_list[1::2]
+            if all(
+                _DTYPE_SIZE.get(x) == y for x, y in zip(type_list, size_list)
+            ):
+                break
+        else:
+            raise ValueError("Can't find valid channel data type headers")
+        data_start = dtype_offset + scan + 4 * self._num_chan
+
+        # Markers precede compressed data
+        data_len = 0
+        if not self._compressed:
+            data_len = sum(x * y for x, y in zip(buf_lens, size_list))
+        self._marker_offset = data_start + data_len
+
+    def _read_markers(self):
+        """Read creation date of each marker item."""
+        # Marker header : length, count + 1, count, 13 unknown bytes,
+        # and 8 bytes each for revisions >= 4.2x and >= 4.4.
+        hdr_len = 25
+        item_len = 16
+        if self.revision >= _REV_42X:
+            hdr_len += 8
+            item_len += 8
+        if self.revision >= _REV_440:
+            hdr_len += 8
+            item_len += 8
+        (num_extra,) = self._unpack("i", self._marker_offset + 4)
+
+        # Marker item : sample, 4 unknown bytes, channel, style, creation
+        # date (ms since epoch, >= 4.4), 8 unknown bytes (>= 4.2x),
+        # text length, text.
+        self.marker_dates = []
+        offset = self._marker_offset + hdr_len
+        for _ in range(num_extra - 1):
+            (text_len,) = self._unpack("h", offset + item_len - 2)
+            if self.revision >= _REV_440:
+                (date_ms,) = self._unpack("Q", offset + 14)
+                try:
+                    if date_ms:
+                        self.marker_dates.append(
+                            _REF_DATE + timedelta(milliseconds=date_ms)
+                        )
+                except OverflowError:
+                    pass
+            offset += item_len + text_len
+
+
+def read_acq_date(acq_path: Union[str, os.PathLike]) -> datetime:
+    """Return acquisition date of acq file.
+
+    The acquisition date is the earliest event marker creation time,
+    matching bioread's acq_info "Earliest marker" field. Results are
+    cached by path and mtime.
+
+    Parameters
+    ----------
+    acq_path : str, os.PathLike
+        Location of AcqKnowledge file
+
+    Returns
+    -------
+    datetime.datetime
+        Earliest marker creation date (UTC, naive) at midnight
+
+    Raises
+    ------
+    ValueError
+        File revision not supported or no dated markers found
+
+    """
+    acq_path = str(acq_path)
+    acq_stat = os.stat(acq_path)
+    cache_key = (acq_path, acq_stat.st_mtime_ns, acq_stat.st_size)
+    with _CACHE_LOCK:
+        if cache_key in _DATE_CACHE:
+            return _DATE_CACHE[cache_key]
+
+    with open(acq_path, "rb") as acq_file:
+        acq_hdr = _AcqHeader(acq_file)
+    if not acq_hdr.marker_dates:
+        raise ValueError(f"No dated event markers found in : {acq_path}")
+    acq_date = datetime.combine(
+        min(acq_hdr.marker_dates).date(), datetime.min.time()
+    )
+    with _CACHE_LOCK:
+        _DATE_CACHE[cache_key] = acq_date
+    return acq_date
+
+
+def acq_dates(acq_list: list, num_threads: int = 4) -> dict:
+    """Return acquisition dates of acq files.
+
+    Parameters
+    ----------
+    acq_list : list
+        Locations of AcqKnowledge files
+    num_threads : int, optional
+        Number of files read concurrently
+
+    Returns
+    -------
+    dict
+        {acq_path: datetime.datetime}
+
+    """
+    with ThreadPoolExecutor(max_workers=num_threads) as pool:
+        date_list = list(pool.map(read_acq_date, acq_list))
+    return dict(zip(acq_list, date_list))
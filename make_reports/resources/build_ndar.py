@@ -1,5 +1,7 @@
 """Build datsets and data hosts for NDAR uploads.
 
+DemoContext : cleaned demographic info shared by report builders
+DemoIndex : map participant ID to demographic record
 NdarAffim01 : build affim01 report
 NdarAls01 : build als01 report
 NdarBdi01 : build bdi01 report
@@ -15,13 +17,16 @@ NdarRest01 : build restsurv01 report
 NdarRrs01 : build rrs01 report
 NdarStai01 : build stai01 report
 NdarSubject01 : build ndar_subject01 report
+NdarSurvey : build survey report from reference_files spec
 NdarTas01 : build tas01 report
 
 Notes
 -----
-Classes are highly similar and a more generic class structure could have
-done the necessary work for several NDAR reports, but here each report
-is kept separate for ease of fulfilling idiosyncratic NDAR requirements.
+Survey reports (affim01, als01, bdi01, emrq01, panas01, pswq01,
+restsurv01, rrs01, stai01, tas01) are built by NdarSurvey from
+reference_files/<report>_spec.json, the report classes only name their
+spec. Other reports are kept separate for ease of fulfilling
+idiosyncratic NDAR requirements.
 
 Each class contains two attributes used for writing the NDAR dataset reports:
     -   df_report : pd.DataFrame, a NDAR-compliant report for the class'
@@ -37,15 +42,22 @@ structure allows for the dynamic instantiation and use of the classes.
 
 import os
 import re
-import glob
+import csv
 import json
-import subprocess
+import hashlib
 import pandas as pd
 import numpy as np
+from typing import Union
 from datetime import datetime
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dateutil.relativedelta import relativedelta
 import pydicom
 from make_reports.resources import report_helper
+from make_reports.resources import acq_header
+from make_reports.resources import file_catalog
+from make_reports.resources import host_staging
+from make_reports.resources import nda_validate
 
 
 class _CleanDemo:
@@ -67,6 +79,11 @@ class _CleanDemo:
     remap_race : bool, optional
         Replace NDA incompliant race responses
 
+    Notes
+    -----
+    When df_demo is a DemoContext, _df_demo is set to a view of its
+    cleaned dataframe rather than cleaning df_demo again.
+
     """
 
     def __init__(
@@ -78,6 +95,9 @@ class _CleanDemo:
         remap_race=False,
     ):
         """Set _df_demo attr, trigger cleaning methods."""
+        if isinstance(df_demo, DemoContext):
+            self._df_demo = df_demo.view(remap_race=remap_race)
+            return
         self._df_demo = df_demo
         if drop_subjectkey:
             self._drop_subjectkey()
@@ -110,6 +130,133 @@ class _CleanDemo:
         )
 
 
+class DemoContext:
+    """Cleaned demographic info shared by NDAR builders.
+
+    Built once per submission cycle from final_demo, cleaned as by
+    _CleanDemo defaults with NDA race labels held separately. Builders
+    receive shallow views, so adding or assigning columns of a view
+    does not alter the shared dataframe.
+
+    Parameters
+    ----------
+    df_demo : make_reports.build_reports.DemoAll.final_demo
+        pd.DataFrame, compiled demographic info
+
+    Methods
+    -------
+    view(remap_race=False)
+        Return view of cleaned demographic dataframe
+
+    Notes
+    -----
+    Views share column data with the context, builders should replace
+    columns rather than set values of existing columns in place.
+
+    Example
+    -------
+    demo_ctx = build_ndar.DemoContext(df_demo)
+    rep_obj = build_ndar.NdarDemoInfo01(demo_ctx)
+
+    """
+
+    def __init__(self, df_demo):
+        """Initialize."""
+        self._df_clean = _CleanDemo(df_demo.copy())._df_demo
+        self._race_nda = self._df_clean["race"].replace(
+            ["Black or African-American", "American Indian or Alaska Native"],
+            ["Black or African American", "American Indian/Alaska Native"],
+        )
+
+    def view(self, remap_race: bool = False) -> pd.DataFrame:
+        """Return view of cleaned demographic dataframe.
+
+        Parameters
+        ----------
+        remap_race : bool, optional
+            Use NDA compliant race labels, returns a copy so the
+            shared race column is not written
+
+        Returns
+        -------
+        pd.DataFrame
+
+        """
+        if remap_race:
+            return self._df_clean.assign(race=self._race_nda)
+        return self._df_clean.copy(deep=False)
+
+
+_DemoRecord = namedtuple(
+    "_DemoRecord", ["subjectkey", "src_subject_id", "sex", "dob"]
+)
+
+
+class DemoIndex:
+    """Map participant ID to demographic record.
+
+    Built once from final_demo and shared by the NDAR builders which
+    look up participant demographics for every scan or row, replacing
+    per-row dataframe masks with a dictionary lookup.
+
+    Parameters
+    ----------
+    df_demo : make_reports.build_reports.DemoAll.final_demo
+        pd.DataFrame, compiled demographic info
+
+    Methods
+    -------
+    get(subj)
+        Return (subjectkey, src_subject_id, sex, dob) record
+
+    Notes
+    -----
+    Values are cleaned as in _CleanDemo: "NaN" strings are replaced
+    with np.nan and sex is remapped to M, F, O. The first row of a
+    duplicated src_subject_id is kept.
+
+    Example
+    -------
+    demo_idx = build_ndar.DemoIndex(df_demo)
+    subj_rec = demo_idx.get("ER0009")
+    subj_rec.subjectkey
+
+    """
+
+    def __init__(self, df_demo):
+        """Initialize."""
+        df_demo = df_demo.replace("NaN", np.nan)
+        subj_sex = df_demo["sex"].replace(
+            ["Male", "Female", "Neither"], ["M", "F", "O"]
+        )
+        self._rec_dict = {}
+        for rec in zip(
+            df_demo["subjectkey"],
+            df_demo["src_subject_id"],
+            subj_sex,
+            df_demo["dob"],
+        ):
+            self._rec_dict.setdefault(rec[1], _DemoRecord(*rec))
+
+    def __contains__(self, subj):
+        """Check whether participant is indexed."""
+        return subj in self._rec_dict
+
+    def get(self, subj: str) -> tuple:
+        """Return (subjectkey, src_subject_id, sex, dob) record.
+
+        Raises
+        ------
+        KeyError
+            Participant not found in df_demo
+
+        """
+        try:
+            return self._rec_dict[subj]
+        except KeyError:
+            raise KeyError(f"Participant not found in df_demo : {subj}")
+
+
 def _local_path() -> str:
     """Return path to local files for ndar upload."""
     return (
@@ -124,216 +271,294 @@ def _task_id() -> dict:
     return {"old": 1683, "new": 2113}
 
 
-class NdarAffim01(_CleanDemo):
-    """Make affim01 report for NDAR submission.
+def _write_host_csv(df: pd.DataFrame, out_path: str) -> bool:
+    """Write df to host csv unless content is unchanged, return written.
+
+    Existing host files are compared by size then sha256 digest. New
+    content is written to a temporary name so interrupted writes are
+    not mistaken for complete host files.
+
+    """
+    csv_data = df.to_csv(index=False, na_rep="").encode()
+    if (
+        os.path.exists(out_path)
+        and os.path.getsize(out_path) == len(csv_data)
+        and host_staging.sha256_file(out_path)
+        == hashlib.sha256(csv_data).hexdigest()
+    ):
+        return False
+    with open(f"{out_path}.part", "wb") as hf:
+        hf.write(csv_data)
+    os.replace(f"{out_path}.part", out_path)
+    return True
+
+
+class NdarSurvey(_CleanDemo):
+    """Make survey report for NDAR submission from a report spec.
 
     Inherits _CleanDemo.
 
+    Survey reports are declared by make_reports.reference_files
+    <report>_spec.json, which maps cleaned survey columns to NDA
+    columns. Each session is mapped in turn, then all sessions are
+    merged with demographic info and survey ages in a single pass.
+
     Parameters
     ----------
     df_demo : make_reports.build_reports.DemoAll.final_demo
         pd.DataFrame, compiled demographic info
-    df_pilot : pd.DataFrame
-        Pilot AIM data
-    df_study : pd.DataFrame
-        Study AIM data
+    *df_list : pd.DataFrame
+        Survey data, ordered as supplied by
+        workflows.required_reports._BuildArgs.build_args
+    report : str, optional
+        NDA report name, defaults to the subclass report
+    proj_dir : str, os.PathLike, optional
+        Project's experiment directory, required by specs
+        with pilot_dataset
 
     Attributes
     ----------
     df_report : pd.DataFrame
-        Report of AIM data that complies with NDAR data definitions
+        Report of survey data that complies with NDAR data definitions
     nda_label : list
         NDA report template label
 
-    Methods
+    Notes
+    -----
+    Spec keys:
+        -   source : str, survey name in data_dict
+        -   sessions : list of {frames, visit, require}, df_list
+                indices concatenated for session, visit value, and
+                column which must have a response
+        -   drop_rows : dict, {column: value} of rows to drop
+        -   rename : dict, {survey column: NDA column} of items
+        -   rename_sub : list, [pattern, replacement] regex
+                substitution of survey column names for items
+        -   values : list, [survey values, NDA values] of items
+        -   constants : dict, {NDA column: value}
+        -   scores : list of {name, func, cols, round}, item sum,
+                mean, or std of columns matching regex cols
+        -   pilot_comment : str, column noting pilot participants
+        -   pilot_dataset : dict, {visit, items}, pilot rows are read
+                from a previous submission in data_pilot/ndar_resources
+
+    Item columns are converted to Int64 before values are remapped.
+
+    Example
     -------
-    make_aim()
-        Generate affim01 dataset, builds df_report
+    rep_obj = build_ndar.NdarSurvey(df_demo, df_pilot, df_study,
+                                    report="affim01")
+    rep_obj.df_report
 
     """
 
-    def __init__(self, df_demo, df_pilot, df_study):
-        """Read in survey data and make report.
-
-        Attributes
-        ----------
-        nda_label : list
-            NDA report template label
+    _report = None
 
-        """
-        print("Buiding NDA report : affim01 ...")
-        # Read in template, concat dfs
+    def __init__(self, df_demo, *df_list, report=None, proj_dir=None):
+        """Read in spec and survey data, make report."""
+        self._report_name = report if report else self._report
+        print(f"Buiding NDA report : {self._report_name} ...")
         super().__init__(df_demo)
+        self._proj_dir = proj_dir
+        self._spec = report_helper.load_spec(self._report_name)
         self.nda_label, self._nda_cols = report_helper.mine_template(
-            "affim01_template.csv"
+            f"{self._report_name}_template.csv"
         )
-        df_aim = pd.concat([df_pilot, df_study], ignore_index=True)
 
-        # Rename columns, drop NaN rows
-        df_aim = df_aim.rename(columns={"study_id": "src_subject_id"})
-        df_aim.columns = df_aim.columns.str.lower()
-        df_aim = df_aim.replace("NaN", np.nan)
-        self._df_aim = df_aim[df_aim["aim_1"].notna()]
+        # Map each session, combine with demo and get ages once. Keep
+        # integer columns that are missing from some sessions as Int64.
+        sess_list = [
+            self._map_session(x, df_list) for x in self._spec["sessions"]
+        ]
+        int_cols = {
+            x for df in sess_list for x in df.select_dtypes("Int64").columns
+        }
+        df_survey = pd.concat(sess_list, ignore_index=True)
+        df_survey[list(int_cols)] = df_survey[list(int_cols)].astype("Int64")
+        df_nda = self._df_demo[["subjectkey", "src_subject_id", "sex"]]
+        df_survey = pd.merge(df_survey, df_nda, on="src_subject_id")
+        df_survey = report_helper.get_survey_age(
+            df_survey, self._df_demo, "src_subject_id"
+        )
+
+        # Build dataframe from nda columns, reindex keeps Int64 items
+        df_report = df_survey.reindex(columns=self._nda_cols)
+        miss_cols = [x for x in self._nda_cols if x not in df_survey.columns]
+        df_report[miss_cols] = df_report[miss_cols].astype(object)
+        if "pilot_comment" in self._spec:
+            idx_pilot = df_report["src_subject_id"].isin(
+                report_helper.pilot_list()
+            )
+            df_report.loc[idx_pilot, self._spec["pilot_comment"]] = (
+                "PILOT PARTICIPANT"
+            )
 
-        # Make report
-        self.make_aim()
+        # Add pilot data of previous submission, order by visit
+        if "pilot_dataset" in self._spec:
+            df_report = pd.concat(
+                [self._get_pilot(), df_report], ignore_index=True
+            )
+        sort_cols = [
+            x for x in ["src_subject_id", "visit"] if x in df_report.columns
+        ]
+        df_report = df_report.sort_values(by=sort_cols)
+        self.df_report = df_report[df_report["interview_date"].notna()]
 
-    def make_aim(self):
-        """Combine dataframes to generate requested report.
+    def _map_session(self, sess: dict, df_list: tuple) -> pd.DataFrame:
+        """Return session survey data with NDA item columns and scores."""
+        df = pd.concat([df_list[x] for x in sess["frames"]], ignore_index=True)
+        for col, val in self._spec.get("drop_rows", {}).items():
+            df = df[df[col] != val].reset_index(drop=True)
+        df = df.rename(columns={"study_id": "src_subject_id"})
+        if sess.get("require"):
+            df = df.replace("NaN", np.nan)
+            df = df[df[sess["require"]].notna()].copy()
+
+        # Convert and remap item responses, rename item columns
+        item_map = self._item_map(df.columns)
+        item_cols = list(item_map.keys())
+        df[item_cols] = df[item_cols].astype("Int64")
+        if "values" in self._spec:
+            df[item_cols] = df[item_cols].replace(*self._spec["values"])
+        df = df.rename(columns=item_map)
+
+        # Set constant values, visit
+        for col, val in self._spec.get("constants", {}).items():
+            df[col] = val
+        if sess.get("visit"):
+            df["visit"] = sess["visit"]
+        return self._calc_scores(df)
+
+    def _item_map(self, col_list: list) -> dict:
+        """Return {survey column: NDA column} of item columns."""
+        item_map = {
+            x: self._spec["rename"][x]
+            for x in col_list
+            if x in self._spec.get("rename", {})
+        }
+        if "rename_sub" in self._spec:
+            pat, repl = self._spec["rename_sub"]
+            item_map.update(
+                {
+                    x: re.sub(pat, repl, x)
+                    for x in col_list
+                    if re.search(pat, x)
+                }
+            )
+        return item_map
 
-        Attributes
-        ----------
-        df_report : pd.DataFrame
-            Report of AIM data that complies with NDAR data definitions
+    def _calc_scores(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add spec scores of item columns found in df."""
+        for score in self._spec.get("scores", []):
+            score_cols = [x for x in df.columns if re.search(score["cols"], x)]
+            if not score_cols:
+                continue
+            if score["func"] == "sum":
+                df[score["name"]] = (
+                    df[score_cols].sum(axis=1).astype("Int64")
+                )
+            else:
+                df[score["name"]] = getattr(df[score_cols], score["func"])(
+                    axis=1, skipna=True
+                )
+            if "round" in score:
+                df[score["name"]] = df[score["name"]].round(score["round"])
+        return df
 
-        """
-        # Get needed demographic info, combine with survey data
-        df_nda = self._df_demo[["subjectkey", "src_subject_id", "sex"]].copy()
-        df_aim_nda = pd.merge(self._df_aim, df_nda, on="src_subject_id")
+    def _get_pilot(self) -> pd.DataFrame:
+        """Get report data of pilot participants.
 
-        # Find survey age-in-months
-        df_aim_nda = report_helper.get_survey_age(
-            df_aim_nda, self._df_demo, "src_subject_id"
-        )
+        Import data from previous NDAR submission.
 
-        # Sum aim responses
-        aim_list = [x for x in df_aim_nda.columns if "aim" in x]
-        df_aim_nda[aim_list] = df_aim_nda[aim_list].astype("Int64")
-        df_aim_nda["aimtot"] = df_aim_nda[aim_list].sum(axis=1)
+        Raises
+        ------
+        FileNotFoundError
+            Missing dataframe of pilot data
 
-        # Make an empty dataframe from the report column names, fill
-        self.df_report = pd.DataFrame(
-            columns=self._nda_cols, index=df_aim_nda.index
+        """
+        pilot_report = os.path.join(
+            self._proj_dir,
+            "data_pilot/ndar_resources",
+            f"{self._report_name}_dataset.csv",
         )
-        self.df_report.update(df_aim_nda)
+        if not os.path.exists(pilot_report):
+            raise FileNotFoundError(
+                f"Expected to find pilot {self._report_name} at "
+                + f"{pilot_report}"
+            )
+        df_pilot = pd.read_csv(pilot_report)
+        df_pilot = df_pilot[1:]
+        df_pilot.columns = self._nda_cols
 
+        # Add visit, get scores
+        pilot_spec = self._spec["pilot_dataset"]
+        if pilot_spec.get("visit"):
+            df_pilot["visit"] = pilot_spec["visit"]
+        p_cols = [
+            x for x in df_pilot.columns if re.search(pilot_spec["items"], x)
+        ]
+        df_pilot[p_cols] = df_pilot[p_cols].astype("Int64")
+        df_pilot = self._calc_scores(df_pilot)
+        df_pilot["comments_misc"] = "PILOT PARTICIPANT"
+        return df_pilot
 
-class NdarAls01(_CleanDemo):
-    """Make als01 report for NDAR submission.
 
-    Inherits _CleanDemo.
+class NdarAffim01(NdarSurvey):
+    """Make affim01 report for NDAR submission.
+
+    Inherits NdarSurvey, see make_reports.reference_files.affim01_spec.json.
 
     Parameters
     ----------
     df_demo : make_reports.build_reports.DemoAll.final_demo
         pd.DataFrame, compiled demographic info
     df_pilot : pd.DataFrame
-        Pilot ALS data
+        Pilot AIM data
     df_study : pd.DataFrame
-        Study ALS data
+        Study AIM data
 
     Attributes
     ----------
     df_report : pd.DataFrame
-        Report of ALS data that complies with NDAR data definitions
+        Report of AIM data that complies with NDAR data definitions
     nda_label : list
         NDA report template label
 
-    Methods
-    -------
-    make_als()
-        Generate als01 dataset, builds df_report
-
     """
 
-    def __init__(self, df_demo, df_pilot, df_study):
-        """Read in survey data and make report.
-
-        Attributes
-        ----------
-        nda_label : list
-            NDA report template label
-
-        """
-        print("Buiding NDA report : als01 ...")
-        # Read in template, concat dfs
-        super().__init__(df_demo)
-        self.nda_label, self._nda_cols = report_helper.mine_template(
-            "als01_template.csv"
-        )
-        df_als = pd.concat([df_pilot, df_study], ignore_index=True)
-
-        # Rename columns, drop NaN rows
-        df_als = df_als.rename(columns={"study_id": "src_subject_id"})
-        df_als = df_als.replace("NaN", np.nan)
-        self._df_als = df_als[df_als["ALS_1"].notna()]
-
-        # Make report
-        self.make_als()
+    _report = "affim01"
 
-    def make_als(self):
-        """Combine dataframes to generate requested report.
 
-        Remap values and calculate totals.
+class NdarAls01(NdarSurvey):
+    """Make als01 report for NDAR submission.
 
-        Attributes
-        ----------
-        df_report : pd.DataFrame
-            Report of ALS data that complies with NDAR data definitions
+    Inherits NdarSurvey, see make_reports.reference_files.als01_spec.json.
 
-        """
-        # Remap response values (reverse code) and column names
-        resp_qual = [1, 2, 3, 4]
-        resp_ndar = [3, 2, 1, 0]
-        map_item = {
-            "ALS_1": "als5",
-            "ALS_2": "als8",
-            "ALS_3": "als12",
-            "ALS_4": "als14",
-            "ALS_5": "als16",
-            "ALS_6": "als17",
-            "ALS_7": "als20",
-            "ALS_8": "als21",
-            "ALS_9": "als23",
-            "ALS_10": "als25",
-            "ALS_11": "als33",
-            "ALS_12": "als34",
-            "ALS_13": "als36",
-            "ALS_14": "als41",
-            "ALS_15": "als42",
-            "ALS_16": "als43",
-            "ALS_17": "als45",
-            "ALS_18": "als46",
-        }
-        self._df_als = self._df_als.rename(columns=map_item)
-        als_cols = [x for x in self._df_als.columns if "als" in x]
-        self._df_als[als_cols] = self._df_als[als_cols].astype("Int64")
-        self._df_als[als_cols] = self._df_als[als_cols].replace(
-            resp_qual, resp_ndar
-        )
+    Parameters
+    ----------
+    df_demo : make_reports.build_reports.DemoAll.final_demo
+        pd.DataFrame, compiled demographic info
+    df_pilot : pd.DataFrame
+        Pilot ALS data
+    df_study : pd.DataFrame
+        Study ALS data
 
-        # Calculate totals
-        self._df_als["als_glob"] = self._df_als[als_cols].sum(axis=1)
-        self._df_als["als_sf_total"] = self._df_als[als_cols].sum(axis=1)
-        self._df_als["als_sf_total"] = self._df_als["als_sf_total"].astype(
-            "Int64"
-        )
+    Attributes
+    ----------
+    df_report : pd.DataFrame
+        Report of ALS data that complies with NDAR data definitions
+    nda_label : list
+        NDA report template label
 
-        # Add pilot notes for certain subjects
-        pilot_list = report_helper.pilot_list()
-        idx_pilot = self._df_als[
-            self._df_als["src_subject_id"].isin(pilot_list)
-        ].index.tolist()
-        self._df_als.loc[idx_pilot, "comments"] = "PILOT PARTICIPANT"
-
-        # Combine demographic and als dataframes
-        df_nda = self._df_demo[["subjectkey", "src_subject_id", "sex"]].copy()
-        df_als_nda = pd.merge(self._df_als, df_nda, on="src_subject_id")
-        df_als_nda = report_helper.get_survey_age(
-            df_als_nda, self._df_demo, "src_subject_id"
-        )
+    """
 
-        # Build dataframe from nda columns, update with demo and als data
-        self.df_report = pd.DataFrame(
-            columns=self._nda_cols, index=df_als_nda.index
-        )
-        self.df_report.update(df_als_nda)
+    _report = "als01"
 
 
-class NdarBdi01(_CleanDemo):
+class NdarBdi01(NdarSurvey):
     """Make bdi01 report for NDAR submission.
 
-    Inherits _CleanDemo.
+    Inherits NdarSurvey, see make_reports.reference_files.bdi01_spec.json.
 
     Parameters
     ----------
@@ -355,153 +580,9 @@ class NdarBdi01(_CleanDemo):
     nda_label : list
         NDA report template label
 
-    Methods
-    -------
-    make_bdi()
-        Generate bdi01 dataset, builds df_report for one session
-
     """
 
-    def __init__(
-        self,
-        df_demo,
-        df_pilot_day2,
-        df_study_day2,
-        df_pilot_day3,
-        df_study_day3,
-    ):
-        """Read in survey data and make report.
-
-        Attributes
-        ----------
-        df_report : pd.DataFrame
-            Report of BDI data that complies with NDAR data definitions
-        nda_label : list
-            NDA report template label
-
-        """
-        # Get needed column values from report template
-        print("Buiding NDA report : bdi01 ...")
-        super().__init__(df_demo)
-        self.nda_label, self._nda_cols = report_helper.mine_template(
-            "bdi01_template.csv"
-        )
-
-        # Combine pilot and study data, updated subj id column, set attribute
-        self._df_bdi_day2 = self._make_df(df_pilot_day2, df_study_day2)
-        self._df_bdi_day3 = self._make_df(df_pilot_day3, df_study_day3)
-
-        # Make nda reports for each session
-        df_nda_day2 = self.make_bdi("day2")
-        df_nda_day3 = self.make_bdi("day3")
-
-        # Combine into final report
-        df_report = pd.concat([df_nda_day2, df_nda_day3], ignore_index=True)
-        df_report = df_report.sort_values(by=["src_subject_id", "visit"])
-
-        # Add pilot notes for certain subjects
-        pilot_list = report_helper.pilot_list()
-        idx_pilot = df_report[
-            df_report["src_subject_id"].isin(pilot_list)
-        ].index.tolist()
-        df_report.loc[idx_pilot, "comments_misc"] = "PILOT PARTICIPANT"
-        self.df_report = df_report[df_report["interview_date"].notna()]
-
-    def _make_df(
-        self, df_pilot: pd.DataFrame, df_study: pd.DataFrame
-    ) -> pd.DataFrame:
-        """Return df of concatenated pilot, study data."""
-        # Combine pilot and study data, updated subj id column, set attribute
-        df = pd.concat([df_pilot, df_study], ignore_index=True)
-        df = df.rename(columns={"study_id": "src_subject_id"})
-        return df
-
-    def make_bdi(self, sess):
-        """Make an NDAR compliant report for visit.
-
-        Remap column names, add demographic info, get session
-        age, and generate report.
-
-        Parameters
-        ----------
-        sess : str
-            {"day2", "day3"}
-            visit/session name
-
-        Returns
-        -------
-        pd.DataFrame
-
-        Raises
-        ------
-        ValueError
-            If sess is not day2 or day3
-
-        """
-        # Check sess value
-        if sess not in ["day2", "day3"]:
-            raise ValueError(f"Incorrect visit day : {sess}")
-
-        # Get session data, convert response values to int
-        df_bdi = getattr(self, f"_df_bdi_{sess}")
-        q_cols = [x for x in df_bdi.columns if "BDI_" in x]
-        df_bdi[q_cols] = df_bdi[q_cols].astype("Int64")
-
-        # Remap column names
-        map_item = {
-            "BDI_1": "bdi1",
-            "BDI_2": "bdi2",
-            "BDI_3": "bdi3",
-            "BDI_4": "bdi4",
-            "BDI_5": "bdi5",
-            "BDI_6": "bdi6",
-            "BDI_7": "beck07",
-            "BDI_8": "beck08",
-            "BDI_9": "bdi9",
-            "BDI_10": "bdi10",
-            "BDI_11": "bdi_irritated",
-            "BDI_12": "bdi_loss",
-            "BDI_13": "bdi_indecision",
-            "BDI_14": "beck14",
-            "BDI_15": "beck15",
-            "BDI_16": "beck16",
-            "BDI_17": "beck17",
-            "BDI_18": "bd_017",
-            "BDI_19": "beck19",
-            "BDI_19b": "beck20",
-            "BDI_20": "beck21",
-            "BDI_21": "beck22",
-        }
-        df_bdi_remap = df_bdi.rename(columns=map_item)
-
-        # Drop non-ndar columns
-        df_bdi_remap = df_bdi_remap.drop(
-            ["record_id"],
-            axis=1,
-        )
-
-        # Sum BDI responses, exclude bdi_[irritated|lost|indecision],
-        # convert type to int.
-        bdi_cols = [
-            x for x in df_bdi_remap.columns if "b" in x and len(x) <= 6
-        ]
-        df_bdi_remap["bdi_tot"] = df_bdi_remap[bdi_cols].sum(axis=1)
-        df_bdi_remap["bdi_tot"] = df_bdi_remap["bdi_tot"].astype("Int64")
-
-        # Combine demo and bdi dataframes
-        df_nda = self._df_demo[["subjectkey", "src_subject_id", "sex"]]
-        df_bdi_demo = pd.merge(df_bdi_remap, df_nda, on="src_subject_id")
-
-        # Calculate age in months of visit
-        df_bdi_demo = report_helper.get_survey_age(
-            df_bdi_demo, self._df_demo, "src_subject_id"
-        )
-        df_bdi_demo["visit"] = sess
-
-        # Build dataframe from nda columns, update with df_bdi_demo data
-        df_nda = pd.DataFrame(columns=self._nda_cols, index=df_bdi_demo.index)
-        df_nda.update(df_bdi_demo)
-        return df_nda
+    _report = "bdi01"
 
 
 class NdarBrd01(_CleanDemo):
@@ -522,6 +603,10 @@ class NdarBrd01(_CleanDemo):
         Study post-scan ratings data from ses-day2
     df_study_day3 : pd.DataFrame
         Study post-scan ratings data from ses-day3
+    demo_idx : DemoIndex, optional
+        Shared demographic index, built from df_demo when None
+    num_threads : int, optional
+        Number of host files written concurrently
 
     Attributes
     ----------
@@ -543,6 +628,8 @@ class NdarBrd01(_CleanDemo):
         proj_dir,
         df_study_day2,
         df_study_day3,
+        demo_idx=None,
+        num_threads=4,
     ):
         """Read in survey data and make report.
 
@@ -561,25 +648,40 @@ class NdarBrd01(_CleanDemo):
         # Get needed column values from report template, start output df
         print("Buiding NDA report : brd01 ...")
         super().__init__(df_demo)
+        self._demo_idx = demo_idx if demo_idx else DemoIndex(self._df_demo)
         self._proj_dir = proj_dir
+        self._num_threads = num_threads
         self.nda_label, self._nda_cols = report_helper.mine_template(
             "brd01_template.csv"
         )
         self.df_report = pd.DataFrame(columns=self._nda_cols)
+        self._rep_acc = report_helper.ReportAccumulator(self._nda_cols)
+        self._host_list = []
 
         # Fill df_report for each session
         self._get_pilot()
         self.make_brd("day2", df_study_day2)
         self.make_brd("day3", df_study_day3)
+        self.df_report = pd.concat(
+            [self.df_report, self._rep_acc.to_df()], ignore_index=True
+        )
         self.df_report = self.df_report.sort_values(
             by=["src_subject_id", "visit"]
         )
 
+        # Validate report before writing host files
+        nda_validate.check_reports({"brd01": (self.df_report, self.nda_label)})
+        self._write_hosts()
+
     def make_brd(self, sess, df_study):
         """Make brd01 report for session.
 
-        Get Qualtrics survey data for post scan ratings,
-        make a host file, and generate NDAR dataframe.
+        Get Qualtrics survey data for post scan ratings, plan a host
+        file, and generate NDAR dataframe.
+
+        Participant data are split in a single groupby pass. Host files
+        are only planned here, and written by _write_hosts once the
+        report is validated.
 
         Parameters
         ----------
@@ -604,33 +706,30 @@ class NdarBrd01(_CleanDemo):
         df_brd = df_brd.rename(columns={"study_id": "src_subject_id"})
         df_brd["datetime"] = pd.to_datetime(df_brd["datetime"])
 
-        # Setup hosting directory
         host_dir = os.path.join(self._proj_dir, "ndar_upload/data_beh")
-        if not os.path.exists(host_dir):
-            os.makedirs(host_dir)
 
         # Get task ids
         id_dict = _task_id()
 
-        # Mine each participant's data
-        sub_list = df_brd["src_subject_id"].unique().tolist()
-        sub_demo = self._df_demo["src_subject_id"].tolist()
-        for sub in sub_list:
-            # Skip participants not in df_demo (cycle date or withdrawn)
-            if sub not in sub_demo:
-                continue
-
-            # Extract participant info
-            df_sub = df_brd[df_brd["src_subject_id"] == sub]
-            df_sub = df_sub.reset_index(drop=True)
+        # Split participant data, skip participants not in df_demo
+        # (cycle date or withdrawn)
+        sub_list = [
+            (sub, df_sub)
+            for sub, df_sub in df_brd.groupby("src_subject_id", sort=False)
+            if sub in self._demo_idx
+        ]
 
-            # Make host file
-            task = df_sub.loc[0, "type"].lower()
+        # Plan host files
+        host_list = []
+        for sub, df_sub in sub_list:
+            task = df_sub["type"].iloc[0].lower()
             out_file = f"sub-{sub}_ses-{sess}_task-{task}_ratings.csv"
-            out_path = os.path.join(host_dir, out_file)
-            if not os.path.exists(out_path):
-                print(f"\tMaking host file : {out_path}")
-                df_sub.to_csv(out_path, index=False, na_rep="")
+            host_list.append((df_sub, os.path.join(host_dir, out_file)))
+        self._host_list += host_list
+
+        # Mine each participant's data
+        for (sub, df_sub), (_, out_path) in zip(sub_list, host_list):
+            out_file = os.path.basename(out_path)
 
             # Set values required by brd01
             brd01_info = {
@@ -643,21 +742,37 @@ class NdarBrd01(_CleanDemo):
                 ),
                 # "experiment_id": id_dict["new"],
             }
-            survey_date = df_sub.loc[0, "datetime"]
+            survey_date = df_sub["datetime"].iloc[0]
             brd01_info.update(self._get_subj_demo(survey_date, sub))
 
-            # Add brd info to report
-            new_row = pd.DataFrame(brd01_info, index=[0])
-            self.df_report = pd.concat(
-                [self.df_report.loc[:], new_row]
-            ).reset_index(drop=True)
-            del new_row
+            # Add brd info to report records
+            self._rep_acc.add(brd01_info)
 
-    def _get_pilot(self):
-        """Get pilot data from previous NDAR submission."""
-        # Read-in dataframe of pilot participants
-        pilot_report = os.path.join(
-            self._proj_dir,
+    def _write_hosts(self):
+        """Write planned host files in a thread pool.
+
+        Files with unchanged content are skipped.
+
+        """
+        if not self._host_list:
+            return
+        os.makedirs(
+            os.path.join(self._proj_dir, "ndar_upload/data_beh"),
+            exist_ok=True,
+        )
+        with ThreadPoolExecutor(max_workers=self._num_threads) as pool:
+            write_list = list(
+                pool.map(lambda x: _write_host_csv(*x), self._host_list)
+            )
+        for (_, out_path), written in zip(self._host_list, write_list):
+            if written:
+                print(f"\tMaking host file : {out_path}")
+
+    def _get_pilot(self):
+        """Get pilot data from previous NDAR submission."""
+        # Read-in dataframe of pilot participants
+        pilot_report = os.path.join(
+            self._proj_dir,
             "data_pilot/ndar_resources",
             "brd01_dataset.csv",
         )
@@ -702,13 +817,7 @@ class NdarBrd01(_CleanDemo):
 
         """
         # Identify participant date of birth, sex, and GUID
-        idx_subj = self._df_demo.index[
-            self._df_demo["src_subject_id"] == sub
-        ].tolist()[0]
-        subj_guid = self._df_demo.iloc[idx_subj]["subjectkey"]
-        subj_id = self._df_demo.iloc[idx_subj]["src_subject_id"]
-        subj_sex = self._df_demo.iloc[idx_subj]["sex"]
-        subj_dob = self._df_demo.iloc[idx_subj]["dob"]
+        subj_guid, subj_id, subj_sex, subj_dob = self._demo_idx.get(sub)
 
         # Calculate age in months
         interview_age = report_helper.calc_age_mo([subj_dob], [survey_date])[0]
@@ -807,19 +916,19 @@ class NdarDemoInfo01(_CleanDemo):
             self.df_report[h_col] = h_value
 
 
-class NdarEmrq01(_CleanDemo):
+class NdarEmrq01(NdarSurvey):
     """Make emrq01 report for NDAR submission.
 
-    Inherits _CleanDemo.
+    Inherits NdarSurvey, see make_reports.reference_files.emrq01_spec.json.
 
     Parameters
     ----------
     df_demo : make_reports.build_reports.DemoAll.final_demo
         pd.DataFrame, compiled demographic info
     df_pilot : pd.DataFrame
-        Pilot ALS data
+        Pilot ERQ data
     df_study : pd.DataFrame
-        Study ALS data
+        Study ERQ data
 
     Attributes
     ----------
@@ -828,88 +937,9 @@ class NdarEmrq01(_CleanDemo):
     nda_label : list
         NDA report template label
 
-    Methods
-    -------
-    make_emrq()
-        Generate emrq01 dataset, builds df_report
-
     """
 
-    def __init__(self, df_demo, df_pilot, df_study):
-        """Read in survey data and make report.
-
-        Get cleaned ERQ Qualtrics survey from visit_day1, and
-        finalized demographic information.
-
-        Attributes
-        ----------
-        nda_label : list
-            NDA report template label
-
-        """
-        print("Buiding NDA report : emrq01 ...")
-        # Read in template
-        super().__init__(df_demo)
-        self.nda_label, self._nda_cols = report_helper.mine_template(
-            "emrq01_template.csv"
-        )
-        df_emrq = pd.concat([df_pilot, df_study], ignore_index=True)
-
-        # Rename columns, drop NaN rows
-        df_emrq = df_emrq.rename(columns={"study_id": "src_subject_id"})
-        df_emrq = df_emrq.replace("NaN", np.nan)
-        self._df_emrq = df_emrq[df_emrq["ERQ_1"].notna()]
-
-        # Make report
-        self.make_emrq()
-
-    def make_emrq(self):
-        """Generate ERMQ report for NDAR submission.
-
-        Remap values and calculate totals.
-
-        Attributes
-        ----------
-        df_report : pd.DataFrame
-            Report of EMRQ data that complies with NDAR data definitions
-
-        """
-        # Update column names, make data integer
-        df_emrq = self._df_emrq.rename(columns=str.lower)
-        emrq_cols = [x for x in df_emrq.columns if "erq" in x]
-        df_emrq[emrq_cols] = df_emrq[emrq_cols].astype("Int64")
-
-        # Calculate reappraisal, suppression scores:
-        #   Reappraisal = sum of items 1, 3, 5, 7, 8, 10
-        #   Suppression = sum of items 2, 4, 6, 9
-        cols_reap = ["erq_1", "erq_3", "erq_5", "erq_7", "erq_8", "erq_10"]
-        cols_supp = ["erq_2", "erq_4", "erq_6", "erq_9"]
-        df_emrq["erq_reappraisal"] = df_emrq[cols_reap].sum(axis=1)
-        df_emrq["erq_suppression"] = df_emrq[cols_supp].sum(axis=1)
-        df_emrq[["erq_reappraisal", "erq_suppression"]] = df_emrq[
-            ["erq_reappraisal", "erq_suppression"]
-        ].astype("Int64")
-
-        # Combine demographic and erq dataframes
-        df_nda = self._df_demo[["subjectkey", "src_subject_id", "sex"]].copy()
-        df_emrq_nda = pd.merge(df_emrq, df_nda, on="src_subject_id")
-        df_emrq_nda = report_helper.get_survey_age(
-            df_emrq_nda, self._df_demo, "src_subject_id"
-        )
-
-        # Build dataframe from nda columns, update with df_final_emrq data
-        df_report = pd.DataFrame(
-            columns=self._nda_cols, index=df_emrq_nda.index
-        )
-        df_report.update(df_emrq_nda)
-
-        # Add pilot comments
-        pilot_list = report_helper.pilot_list()
-        idx_pilot = df_report[
-            df_report["src_subject_id"].isin(pilot_list)
-        ].index.tolist()
-        df_report.loc[idx_pilot, "comments_misc"] = "PILOT PARTICIPANT"
-        self.df_report = df_report
+    _report = "emrq01"
 
 
 class NdarImage03(_CleanDemo):
@@ -937,6 +967,13 @@ class NdarImage03(_CleanDemo):
         submission cycle.
     test_subj : str, optional
         BIDS subject identifier, for testing class
+    jobs : int, optional
+        Number of worker processes for mining sessions
+    demo_idx : DemoIndex, optional
+        Shared demographic index, built from df_demo when None
+    skip_sess : set, optional
+        (src_subject_id, visit) tuples of sessions already reported,
+        e.g. {("ER0009", "2")}, which are not mined
 
     Attributes
     ----------
@@ -962,7 +999,15 @@ class NdarImage03(_CleanDemo):
     """
 
     def __init__(
-        self, df_demo, proj_dir, close_date, all_data=False, test_subj=None
+        self,
+        df_demo,
+        proj_dir,
+        close_date,
+        all_data=False,
+        test_subj=None,
+        jobs=1,
+        demo_idx=None,
+        skip_sess=None,
     ):
         """Coordinate report generation for MRI data.
 
@@ -984,6 +1029,7 @@ class NdarImage03(_CleanDemo):
 
         # Read in template, start empty dataframe
         super().__init__(df_demo)
+        self._demo_idx = demo_idx if demo_idx else DemoIndex(self._df_demo)
         self.nda_label, self._nda_cols = report_helper.mine_template(
             "image03_template.csv"
         )
@@ -993,9 +1039,16 @@ class NdarImage03(_CleanDemo):
         self._proj_dir = proj_dir
         self._close_date = datetime.combine(close_date, datetime.min.time())
         self._all_data = all_data
+        self._jobs = jobs
+        self._skip_sess = skip_sess if skip_sess else set()
         self._source_dir = os.path.join(
             proj_dir, "data_scanner_BIDS/sourcedata"
         )
+        self._bids_cat = file_catalog.get_catalog(
+            os.path.join(proj_dir, "data_scanner_BIDS")
+        )
+        self._dicom_memo = {}
+        self._dicom_index = self._index_dicoms()
 
         # Calc start date
         if not all_data:
@@ -1005,11 +1058,11 @@ class NdarImage03(_CleanDemo):
         rawdata_dir = os.path.join(proj_dir, "data_scanner_BIDS/rawdata")
         if test_subj:
             self._subj_sess_list = sorted(
-                glob.glob(f"{rawdata_dir}/{test_subj}/ses-day*")
+                self._bids_cat.glob(f"{rawdata_dir}/{test_subj}/ses-day*")
             )
         else:
             self._subj_sess_list = sorted(
-                glob.glob(f"{rawdata_dir}/sub-ER*/ses-day*")
+                self._bids_cat.glob(f"{rawdata_dir}/sub-ER*/ses-day*")
             )
         if not self._subj_sess_list:
             raise ValueError(
@@ -1058,68 +1111,173 @@ class NdarImage03(_CleanDemo):
 
         Iterate through subj_sess_list, identify the data types of
         the session, and for each data type trigger appropriate method.
-        Each iteration resets the attributes of sess, subj, subj_nda, and
-        subj_sess so they are available for private methods.
+        Sessions are independent, and are mined in a process pool when
+        jobs > 1.
 
         Raises
         ------
         AttributeError
             An issue with the value of subj, subj_nda, or sess
 
+        """
+        # Drop sessions outside of submission window before mining
+        if not self._all_data:
+            self._prune_sessions()
+
+        # Set attributes shared by all sessions, mine sessions serially
+        # or in worker processes. The instance is given to each worker
+        # once by the pool initializer (inherited when forked), so only
+        # session paths and the plain record and host file lists are
+        # pickled per task, results are merged in subj_sess_list order.
+        if self._jobs > 1:
+            with ProcessPoolExecutor(
+                max_workers=self._jobs,
+                initializer=_init_image03,
+                initargs=(self,),
+            ) as pool:
+                sess_out = list(
+                    pool.map(
+                        _mine_shared,
+                        self._subj_sess_list,
+                        chunksize=max(
+                            1, len(self._subj_sess_list) // (self._jobs * 4)
+                        ),
+                    )
+                )
+        else:
+            sess_out = [self._mine_session(x) for x in self._subj_sess_list]
+        rep_acc = report_helper.ReportAccumulator(self._nda_cols)
+        for rec_list, _ in sess_out:
+            rep_acc.extend(rec_list)
+        self._df_report_study = rep_acc.to_df()
+
+        # Validate records before copying host files
+        nda_validate.check_reports(
+            {"image03": (self._df_report_study, self.nda_label)}
+        )
+        stager = host_staging.HostStager(
+            os.path.join(self._proj_dir, "ndar_upload")
+        )
+        for _, host_list in sess_out:
+            for share_file, host_rel in host_list:
+                stager.stage(share_file, host_rel)
+        stager.close()
+
+    def _prune_sessions(self):
+        """Remove sessions acquired outside of the submission window.
+
+        Session dates are found from BIDS files (see _sess_date) rather
+        than DICOM headers. Sessions without a BIDS date are kept, and
+        scans are still checked by _include_scan while mining.
+
+        """
+        keep_list = []
+        for subj_sess in self._subj_sess_list:
+            sess_date = self._sess_date(subj_sess)
+            if sess_date and (
+                sess_date < self._start_date or sess_date > self._close_date
+            ):
+                continue
+            keep_list.append(subj_sess)
+        print(
+            f"\tPruned {len(self._subj_sess_list) - len(keep_list)} of "
+            + f"{len(self._subj_sess_list)} sessions outside of "
+            + "submission window"
+        )
+        self._subj_sess_list = keep_list
+
+    def _sess_date(self, subj_sess: Union[str, os.PathLike]) -> datetime:
+        """Return session acquisition date from BIDS files, or None.
+
+        Use the acq_time column of the session scans.tsv, falling back
+        to AcquisitionDateTime of the first JSON sidecar.
+
+        """
+        subj = os.path.basename(os.path.dirname(subj_sess))
+        sess = os.path.basename(subj_sess)
+        scans_tsv = f"{subj_sess}/{subj}_{sess}_scans.tsv"
+        acq_time = None
+        if self._bids_cat.exists(scans_tsv):
+            with open(scans_tsv, "r") as tf:
+                for row in csv.DictReader(tf, delimiter="\t"):
+                    if row.get("acq_time", "n/a") not in ["n/a", ""]:
+                        acq_time = row["acq_time"]
+                        break
+        if not acq_time:
+            json_list = self._bids_cat.glob(f"{subj_sess}/*/*.json")
+            if json_list:
+                with open(json_list[0], "r") as jf:
+                    acq_time = json.load(jf).get("AcquisitionDateTime")
+        try:
+            return datetime.strptime(acq_time[:10], "%Y-%m-%d")
+        except (TypeError, ValueError):
+            return None
+
+    def _mine_session(self, subj_sess: Union[str, os.PathLike]) -> tuple:
+        """Return image03 records and host files of a subject's session.
+
+        Sets the attributes sess, subj, subj_nda, and subj_sess so they
+        are available for private methods, then triggers the info method
+        of each data type found in the session.
+
         """
         # Specify MRI data types - these are used to match
         # and use private class methods to the data of the
         # participant's session.
         type_list = ["anat", "func", "fmap"]
-        cons_list = self._df_demo["src_subject_id"].tolist()
+        self._sess_records = []
+        self._sess_hosts = []
+
+        # Set attributes for subject's session
+        self._subj_sess = subj_sess
+        self._subj = os.path.basename(os.path.dirname(subj_sess))
+        self._subj_nda = self._subj.split("-")[1]
+        self._sess = os.path.basename(subj_sess)
+
+        # Check attributes
+        chk_subj = True if len(self._subj) == 10 else False
+        chk_subj_nda = True if len(self._subj_nda) == 6 else False
+        chk_sess = True if len(self._sess) == 7 else False
+        if not chk_subj and not chk_subj_nda and not chk_sess:
+            raise AttributeError(
+                f"""\
+            Unexpected value of one of the following:
+                self._subj : {self._subj}
+                self._subj_nda : {self._subj_nda}
+                self._sess : {self._sess}
+
+            Possible cause is non-BIDS organization of rawdata,
+            Check build_reports.NdarImage03.__init__ for rawdata_dir.
+            """
+            )
 
-        # Set attributes for each subject's session
-        for subj_sess in self._subj_sess_list:
-            self._subj_sess = subj_sess
-            self._subj = os.path.basename(os.path.dirname(subj_sess))
-            self._subj_nda = self._subj.split("-")[1]
-            self._sess = os.path.basename(subj_sess)
-
-            # Check attributes
-            chk_subj = True if len(self._subj) == 10 else False
-            chk_subj_nda = True if len(self._subj_nda) == 6 else False
-            chk_sess = True if len(self._sess) == 7 else False
-            if not chk_subj and not chk_subj_nda and not chk_sess:
-                raise AttributeError(
-                    f"""\
-                Unexpected value of one of the following:
-                    self._subj : {self._subj}
-                    self._subj_nda : {self._subj_nda}
-                    self._sess : {self._sess}
-
-                Possible cause is non-BIDS organization of rawdata,
-                Check build_reports.NdarImage03.__init__ for rawdata_dir.
+        # Only use participants found in df_demo, reflecting
+        # current consent and available demo info.
+        if self._subj_nda not in self._demo_idx:
+            print(
+                f"""
+                {self._subj_nda} not found in self._df_demo,
+                    continuing ...
                 """
-                )
-
-            # Only use participants found in df_demo, reflecting
-            # current consent and available demo info.
-            if self._subj_nda not in cons_list:
-                print(
-                    f"""
-                    {self._subj_nda} not found in self._df_demo,
-                        continuing ...
-                    """
-                )
-                continue
-
-            # Identify types of data in subject's session, use appropriate
-            # method for data type.
-            print(f"\tMining data for {self._subj}, {self._sess}")
-            scan_type_list = [
-                x for x in os.listdir(subj_sess) if x in type_list
-            ]
-            if not scan_type_list:
-                print(f"No data types found at {subj_sess}\n\tContinuing ...")
-                continue
-            for scan_type in scan_type_list:
-                info_meth = getattr(self, f"info_{scan_type}")
-                info_meth()
+            )
+            return (self._sess_records, self._sess_hosts)
+
+        # Skip sessions reported in a previous cycle
+        if (self._subj_nda, self._sess[-1]) in self._skip_sess:
+            print(f"\tPreviously reported {self._subj}, {self._sess}")
+            return (self._sess_records, self._sess_hosts)
+
+        # Identify types of data in subject's session, use appropriate
+        # method for data type.
+        print(f"\tMining data for {self._subj}, {self._sess}")
+        scan_type_list = [x for x in os.listdir(subj_sess) if x in type_list]
+        if not scan_type_list:
+            print(f"No data types found at {subj_sess}\n\tContinuing ...")
+            return (self._sess_records, self._sess_hosts)
+        for scan_type in scan_type_list:
+            info_meth = getattr(self, f"info_{scan_type}")
+            info_meth()
+        return (self._sess_records, self._sess_hosts)
 
     def _get_subj_demo(self, scan_date):
         """Gather required participant demographic information.
@@ -1140,13 +1298,9 @@ class NdarImage03(_CleanDemo):
 
         """
         # Identify participant date of birth, sex, and GUID
-        idx_subj = self._df_demo.index[
-            self._df_demo["src_subject_id"] == self._subj_nda
-        ].tolist()[0]
-        subj_guid = self._df_demo.iloc[idx_subj]["subjectkey"]
-        subj_id = self._df_demo.iloc[idx_subj]["src_subject_id"]
-        subj_sex = self._df_demo.iloc[idx_subj]["sex"]
-        subj_dob = self._df_demo.iloc[idx_subj]["dob"]
+        subj_guid, subj_id, subj_sex, subj_dob = self._demo_idx.get(
+            self._subj_nda
+        )
 
         # Calculate age in months
         interview_age = report_helper.calc_age_mo([subj_dob], [scan_date])[0]
@@ -1160,6 +1314,104 @@ class NdarImage03(_CleanDemo):
             "sex": subj_sex,
         }
 
+    # DICOM tags used by image03 : scan date, manufacturer, model,
+    # pixel presentation, number of frames, rows, columns.
+    _dicom_tags = [
+        (0x08, 0x20),
+        (0x08, 0x70),
+        (0x08, 0x1090),
+        (0x08, 0x9205),
+        (0x28, 0x08),
+        (0x28, 0x10),
+        (0x28, 0x11),
+    ]
+
+    def _index_dicoms(self) -> dict:
+        """Index sourcedata DICOM series of each subject.
+
+        Built from a single query of the file catalog, which persists
+        and incrementally refreshes the sourcedata listing.
+
+        Returns
+        -------
+        dict
+            {subj_nda: [(session dir, series dir, number of DICOMs,
+            first DICOM path)]}
+
+        """
+        dicom_index = {}
+        dir_counts = self._bids_cat.dir_counts(
+            f"{self._source_dir}/*/*/DICOM/*/*.dcm"
+        )
+        for series_path, (num_dcm, first_dcm) in sorted(dir_counts.items()):
+            subj_nda, sess_dir, _, series_dir = series_path.split("/")[-4:]
+            if subj_nda not in dicom_index:
+                dicom_index[subj_nda] = []
+            dicom_index[subj_nda].append(
+                (sess_dir, series_dir, num_dcm, first_dcm)
+            )
+        return dicom_index
+
+    def _find_dicoms(self, series: str) -> tuple:
+        """Find DICOMs of session series from the sourcedata index.
+
+        Series directories named exactly series are preferred, otherwise
+        directories starting with series are used to account for
+        reconstruction issues showing in dir names.
+
+        Parameters
+        ----------
+        series : str
+            DICOM series directory name, e.g. EmoRep_anat
+
+        Returns
+        -------
+        tuple
+            (first DICOM path, number of DICOMs)
+
+        Raises
+        ------
+        FileNotFoundError
+            No DICOMs found for series
+
+        """
+        day = self._sess.split("-")[1]
+        sess_list = [
+            x
+            for x in self._dicom_index.get(self._subj_nda, [])
+            if x[0].startswith(day)
+        ]
+        for series_match in [
+            lambda x: x == series,
+            lambda x: x.startswith(series),
+        ]:
+            match_list = [x for x in sess_list if series_match(x[1])]
+            if match_list:
+                return (
+                    min(x[3] for x in match_list),
+                    sum(x[2] for x in match_list),
+                )
+        raise FileNotFoundError(
+            "Expected to find DICOMs in : "
+            + f"{self._source_dir}/{self._subj_nda}/{day}*/DICOM/{series}*"
+        )
+
+    def _dicom_header(self, dicom_path: str) -> pydicom.Dataset:
+        """Return header of DICOM, memoized by series directory.
+
+        Only the tags in _dicom_tags are parsed, and reading stops
+        before pixel data.
+
+        """
+        series_dir = os.path.dirname(dicom_path)
+        if series_dir not in self._dicom_memo:
+            self._dicom_memo[series_dir] = pydicom.dcmread(
+                dicom_path,
+                stop_before_pixels=True,
+                specific_tags=self._dicom_tags,
+            )
+        return self._dicom_memo[series_dir]
+
     def _get_std_info(self, nii_json, dicom_hdr):
         """Extract values reported for all scan types.
 
@@ -1170,8 +1422,8 @@ class NdarImage03(_CleanDemo):
         ----------
         nii_json : dict
             Sidecar JSON information
-        dicom_hdr : obj, pydicom.read_file()
-            DICOM header information
+        dicom_hdr : pydicom.Dataset
+            DICOM header information, from _dicom_header
 
         Returns
         -------
@@ -1222,9 +1474,10 @@ class NdarImage03(_CleanDemo):
         }
 
     def _make_host(self, share_file, out_name, out_dir="data_mri"):
-        """Copy a file for hosting with NDA package builder.
+        """Plan a file for hosting with NDA package builder.
 
-        Data will be copied to <proj_dir>/ndar_upload/<out_dir>.
+        Data will be staged at <proj_dir>/ndar_upload/<out_dir> by
+        make_image03 once all sessions are mined.
 
         Parameters
         ----------
@@ -1239,37 +1492,12 @@ class NdarImage03(_CleanDemo):
         ------
         FileNotFoundError
             share_file does not exist
-            output <host_path> does not exist
 
         """
         # Check for existing share_file
         if not os.path.exists(share_file):
             raise FileNotFoundError(f"Expected to find : {share_file}")
-
-        # Setup output path
-        host_dir = os.path.join(self._proj_dir, "ndar_upload", out_dir)
-        if not os.path.exists(host_dir):
-            os.makedirs(host_dir)
-        host_path = os.path.join(host_dir, out_name)
-
-        # Submit copy subprocess
-        if not os.path.exists(host_path):
-            print(f"\t\t\tMaking host file : {host_path}")
-            bash_cmd = f"cp {share_file} {host_path}"
-            h_sp = subprocess.Popen(
-                bash_cmd, shell=True, stdout=subprocess.PIPE
-            )
-            h_out, h_err = h_sp.communicate()
-            h_sp.wait()
-
-        # Check for output
-        if not os.path.exists(host_path):
-            raise FileNotFoundError(
-                f"""
-                Copy failed, expected to find : {host_path}
-                Check build_reports.NdarImage03._make_host().
-                """
-            )
+        self._sess_hosts.append((share_file, f"{out_dir}/{out_name}"))
 
     def info_anat(self):
         """Write image03 line for anat data.
@@ -1290,7 +1518,7 @@ class NdarImage03(_CleanDemo):
         print(f"\t\tWorking on {self._subj} {self._sess} : anat ...")
 
         # Get JSON info
-        json_list = sorted(glob.glob(f"{self._subj_sess}/anat/*.json"))
+        json_list = self._bids_cat.glob(f"{self._subj_sess}/anat/*.json")
         if not json_list:
             print(f"No files found at {self._subj_sess}/anat, continuing ...")
             return
@@ -1300,22 +1528,8 @@ class NdarImage03(_CleanDemo):
 
         # Get DICOM info
         day = self._sess.split("-")[1]
-        dicom_dir = (
-            f"{self._source_dir}/{self._subj_nda}/{day}*/"
-            + "DICOM/EmoRep_anat"
-        )
-        dicom_list = glob.glob(f"{dicom_dir}/*.dcm")
-        if not dicom_list:
-            # Account for reconstruction issues showing in dir names
-            dicom_dir = dicom_dir + "*"
-            dicom_list = glob.glob(f"{dicom_dir}/*.dcm")
-            if not dicom_list:
-                raise FileNotFoundError(
-                    f"""
-                    Expected to find a DICOM file at : {dicom_dir}
-                    """
-                )
-        dicom_hdr = pydicom.read_file(dicom_list[0])
+        dicom_path, _ = self._find_dicoms("EmoRep_anat")
+        dicom_hdr = self._dicom_header(dicom_path)
 
         # Get demographic info
         scan_date = datetime.strptime(dicom_hdr[0x08, 0x20].value, "%Y%m%d")
@@ -1360,12 +1574,8 @@ class NdarImage03(_CleanDemo):
         anat_image03.update(demo_dict)
         anat_image03.update(std_dict)
 
-        # Add scan info to report
-        new_row = pd.DataFrame(anat_image03, index=[0])
-        self._df_report_study = pd.concat(
-            [self._df_report_study.loc[:], new_row]
-        ).reset_index(drop=True)
-        del new_row
+        # Add scan info to session records
+        self._sess_records.append(anat_image03)
 
     def _include_scan(self, scan_date: datetime) -> bool:
         """Check if scan date is in submission window."""
@@ -1400,8 +1610,8 @@ class NdarImage03(_CleanDemo):
         print(f"\t\tWorking on {self._subj} {self._sess} : fmap ...")
 
         # Find nii, json files
-        nii_list = sorted(glob.glob(f"{self._subj_sess}/fmap/*.nii.gz"))
-        json_list = sorted(glob.glob(f"{self._subj_sess}/fmap/*.json"))
+        nii_list = self._bids_cat.glob(f"{self._subj_sess}/fmap/*.nii.gz")
+        json_list = self._bids_cat.glob(f"{self._subj_sess}/fmap/*.json")
         if not nii_list or not json_list:
             print(f"No files found at {self._subj_sess}/fmap, continuing ...")
             return
@@ -1417,33 +1627,17 @@ class NdarImage03(_CleanDemo):
             with open(json_path, "r") as jf:
                 nii_json = json.load(jf)
 
-            # Setup dcm path so glob finds the appropriate Field_Map_PA
-            # or Field_Map_PA_run[1|2] (new fmap protocol).
+            # Find the appropriate Field_Map_PA or Field_Map_PA_run[1|2]
+            # (new fmap protocol) series, get header.
             day = self._sess.split("-")[1]
-            h_path = os.path.join(
-                self._source_dir,
-                self._subj_nda,
-                f"{day}*",
-                "DICOM",
-            )
             nii_file = os.path.basename(nii_path)
             if "run" in nii_file:
                 fmap_num = nii_file.split("run-")[1].split("_")[0][1]
-                dicom_dir = os.path.join(h_path, f"Field_Map_PA_run{fmap_num}")
+                series = f"Field_Map_PA_run{fmap_num}"
             else:
-                dicom_dir = os.path.join(h_path, "Field_Map_PA")
-
-            # Find dcms, get header
-            dicom_list = sorted(glob.glob(f"{dicom_dir}/*.dcm"))
-            if not dicom_list:
-                # Account for reconstruction issues showing in dir names
-                dicom_dir = dicom_dir + "*"
-                dicom_list = sorted(glob.glob(f"{dicom_dir}/*.dcm"))
-                if not dicom_list:
-                    raise FileNotFoundError(
-                        f"Expected to find DICOMs in : {dicom_dir}"
-                    )
-            dicom_hdr = pydicom.read_file(dicom_list[0])
+                series = "Field_Map_PA"
+            dicom_path, num_dicom = self._find_dicoms(series)
+            dicom_hdr = self._dicom_header(dicom_path)
 
             # Get demographic info
             scan_date = datetime.strptime(
@@ -1474,7 +1668,7 @@ class NdarImage03(_CleanDemo):
                 "scan_type": "Field Map",
                 "image_history": "No modifications",
                 "image_num_dimensions": 4,
-                "image_extent4": len(dicom_list),
+                "image_extent4": num_dicom,
                 "extent4_type": "time",
                 "image_unit4": "number of Volumes (across time)",
                 "image_resolution1": 2.0,
@@ -1489,11 +1683,8 @@ class NdarImage03(_CleanDemo):
             fmap_image03.update(demo_dict)
             fmap_image03.update(std_dict)
 
-            # Add scan info to report
-            new_row = pd.DataFrame(fmap_image03, index=[0])
-            self._df_report_study = pd.concat(
-                [self._df_report_study.loc[:], new_row]
-            ).reset_index(drop=True)
+            # Add scan info to session records
+            self._sess_records.append(fmap_image03)
 
     def info_func(self):
         """Write image03 line for func data.
@@ -1523,7 +1714,7 @@ class NdarImage03(_CleanDemo):
         )
 
         # Find all func niftis
-        nii_list = sorted(glob.glob(f"{self._subj_sess}/func/*.nii.gz"))
+        nii_list = self._bids_cat.glob(f"{self._subj_sess}/func/*.nii.gz")
         if not nii_list:
             print(
                 f"No NIfTIs found for {self._subj_sess}/func, continuing ..."
@@ -1551,21 +1742,8 @@ class NdarImage03(_CleanDemo):
                 if task == "task-rest"
                 else f"EmoRep_run{run.split('-')[1]}"
             )
-            task_source = os.path.join(
-                self._source_dir, self._subj_nda, f"{day}*/DICOM", task_dir
-            )
-            dicom_list = glob.glob(f"{task_source}/*.dcm")
-            if not dicom_list:
-                # Account for reconstruction issues showing in dir names
-                task_source = task_source + "*"
-                dicom_list = glob.glob(f"{task_source}/*.dcm")
-                if not dicom_list:
-                    raise FileNotFoundError(
-                        f"Expected to find DICOMs at : {task_source}"
-                    )
-
-            dicom_file = dicom_list[0]
-            dicom_hdr = pydicom.read_file(dicom_file)
+            dicom_path, num_dicom = self._find_dicoms(task_dir)
+            dicom_hdr = self._dicom_header(dicom_path)
 
             # Get demographic info
             scan_date = datetime.strptime(
@@ -1605,7 +1783,7 @@ class NdarImage03(_CleanDemo):
                 "scan_type": "fMRI",
                 "image_history": "No modifications",
                 "image_num_dimensions": 4,
-                "image_extent4": len(dicom_list),
+                "image_extent4": num_dicom,
                 "extent4_type": "time",
                 "image_unit4": "number of Volumes (across time)",
                 "image_resolution1": 2.0,
@@ -1634,22 +1812,14 @@ class NdarImage03(_CleanDemo):
                 new_row, _ = self._info_phys(
                     task, run, day, subj_guid, func_image03
                 )
-                self._df_report_study = pd.concat(
-                    [self._df_report_study.loc[:], new_row]
-                ).reset_index(drop=True)
+                self._sess_records.append(new_row)
             else:
-                new_row = pd.DataFrame(func_image03, index=[0])
-                self._df_report_study = pd.concat(
-                    [self._df_report_study.loc[:], new_row]
-                ).reset_index(drop=True)
-
+                self._sess_records.append(dict(func_image03))
                 phys_row, phys_exists = self._info_phys(
                     task, run, day, subj_guid, func_image03
                 )
                 if phys_exists:
-                    self._df_report_study = pd.concat(
-                        [self._df_report_study.loc[:], phys_row]
-                    ).reset_index(drop=True)
+                    self._sess_records.append(phys_row)
 
     def _info_phys(self, task, run, day, subj_guid, func_image03):
         """Helper function of info_func.
@@ -1674,8 +1844,8 @@ class NdarImage03(_CleanDemo):
         Returns
         -------
         tuple
-            [0] = pd.DataFrame
-                func_image03 as a dataframe, contains data_file2 fields with
+            [0] = dict
+                Copy of func_image03, contains data_file2 fields with
                 physio info if physio files exist
             [1] = bool
                 Whether a physio file was detected
@@ -1701,8 +1871,21 @@ class NdarImage03(_CleanDemo):
             func_image03["data_file2"] = f"data_phys/{host_phys}"
             func_image03["data_file2_type"] = "psychophysiological recordings"
 
-        new_row = pd.DataFrame(func_image03, index=[0])
-        return (new_row, phys_exists)
+        return (dict(func_image03), phys_exists)
+
+
+_SHARED_IMAGE03 = None
+
+
+def _init_image03(image03: NdarImage03):
+    """Set NdarImage03 instance used by session worker process."""
+    global _SHARED_IMAGE03
+    _SHARED_IMAGE03 = image03
+
+
+def _mine_shared(subj_sess: Union[str, os.PathLike]) -> tuple:
+    """Mine session with NdarImage03 instance of worker process."""
+    return _SHARED_IMAGE03._mine_session(subj_sess)
 
 
 class NdarIec01(_CleanDemo):
@@ -1945,13 +2128,10 @@ class NdarIec01(_CleanDemo):
             self.df_report[h_col] = h_value
 
 
-class NdarPanas01(_CleanDemo):
+class NdarPanas01(NdarSurvey):
     """Make panas01 report for NDAR submission.
 
-    Inherits _CleanDemo.
-
-    Receives clean study data and finds pilot data in
-    proj_dir/data_pilot/ndar_resources.
+    Inherits NdarSurvey, see make_reports.reference_files.panas01_spec.json.
 
     Parameters
     ----------
@@ -1971,229 +2151,16 @@ class NdarPanas01(_CleanDemo):
     nda_label : list
         NDA report template label
 
-    Methods
-    -------
-    make_panas(sess: str)
-        Generate panas01 dataset, builds df_report for one session
-
     """
 
-    def __init__(
-        self,
-        df_demo,
-        proj_dir,
-        df_study_day2,
-        df_study_day3,
-    ):
-        """Read in survey data and make report.
-
-        Get cleaned PANAS Qualtrics survey from visit_day2 and
-        visit_day3, and finalized demographic information.
-        Generate PANAS report.
-
-        Attributes
-        ----------
-        df_report : pd.DataFrame
-            Report of PANAS data that complies with NDAR data definitions
-        nda_label : list
-            NDA report template label
-
-        """
-        # Get needed column values from report template
-        print("Buiding NDA report : panas01 ...")
-        super().__init__(df_demo)
-        self._proj_dir = proj_dir
-        self.nda_label, self._nda_cols = report_helper.mine_template(
-            "panas01_template.csv"
-        )
-
-        # Get pilot, organize study data for day2, day3
-        df_pilot = self._get_pilot()
-        self._df_study_day2 = df_study_day2.rename(
-            columns={"study_id": "src_subject_id"}
-        )
-        self._df_study_day3 = df_study_day3.rename(
-            columns={"study_id": "src_subject_id"}
-        )
-        self._df_study_day3.columns = self._df_study_day2.columns.values
-
-        # Make reports for each visit
-        df_nda_day2 = self.make_panas("day2")
-        df_nda_day3 = self.make_panas("day3")
-
-        # Combine into final report
-        df_report = pd.concat(
-            [df_pilot, df_nda_day2, df_nda_day3], ignore_index=True
-        )
-        df_report = df_report.sort_values(by=["src_subject_id", "visit"])
-        self.df_report = df_report[df_report["interview_date"].notna()]
-
-    def _calc_metrics(self, df):
-        """Calculate positive and negative metrics.
-
-        Parameters
-        ----------
-        df : pd.DataFrame
-            Uses NDAR column names
-
-        Returns
-        -------
-        pd.DataFrame
-
-        """
-        cols_pos = [
-            "interested_q1",
-            "excited_q3",
-            "strong_q5",
-            "enthusiastic_q9",
-            "proud_q10",
-            "alert_q12",
-            "determined_q16",
-            "attentive_q17",
-            "active_q19",
-        ]
-        cols_neg = [
-            "distressed_q2",
-            "upset1_q4",
-            "guilty_q6",
-            "scared_q7",
-            "hostile_q8",
-            "irritable_q11",
-            "ashamed_q13",
-            "nervous_q15",
-            "jittery_q18",
-            "afraid_q20",
-        ]
-
-        # Calculate positive metrics
-        df["sum_pos"] = df[cols_pos].sum(axis=1)
-        df["sum_pos"] = df["sum_pos"].astype("Int64")
-        df["mean_pos_moment"] = df[cols_pos].mean(axis=1, skipna=True).round(3)
-        df["mean_pos_moment_sd"] = (
-            df[cols_pos].std(axis=1, skipna=True).round(3)
-        )
-
-        # Calculate negative metrics
-        df["sum_neg"] = df[cols_neg].sum(axis=1)
-        df["sum_neg"] = df["sum_neg"].astype("Int64")
-        df["mean_neg_moment"] = df[cols_neg].mean(axis=1, skipna=True).round(3)
-        df["mean_neg_moment_sd"] = (
-            df[cols_neg].std(axis=1, skipna=True).round(3)
-        )
-        return df
-
-    def _get_pilot(self):
-        """Get PANAS data of pilot participants.
-
-        Import data from previous NDAR submission.
-
-        Returns
-        -------
-        pd.DataFrame
-
-        Raises
-        ------
-        FileNotFoundError
-            Missing dataframe of pilot data
-
-        """
-        # Read-in dataframe of pilot participants
-        pilot_report = os.path.join(
-            self._proj_dir,
-            "data_pilot/ndar_resources",
-            "panas01_dataset.csv",
-        )
-        if not os.path.exists(pilot_report):
-            raise FileNotFoundError(
-                f"Expected to find pilot panas01 at {pilot_report}"
-            )
-        df_pilot = pd.read_csv(pilot_report)
-        df_pilot = df_pilot[1:]
-        df_pilot.columns = self._nda_cols
-
-        # Add visit, get metrics
-        df_pilot["visit"] = "day1"
-        p_cols = [x for x in df_pilot.columns if "_q" in x]
-        df_pilot[p_cols] = df_pilot[p_cols].astype("Int64")
-        df_pilot = self._calc_metrics(df_pilot)
-        df_pilot["comments_misc"] = "PILOT PARTICIPANT"
-        return df_pilot
+    _report = "panas01"
 
-    def make_panas(self, sess):
-        """Make an NDAR compliant report for visit.
-
-        Remap column names, add demographic info, get session
-        age, and generate report.
-
-        Parameters
-        ----------
-        sess : str
-            [day2 | day3]
-            visit/session name
-
-        Returns
-        -------
-        pd.DataFrame
-
-        Raises
-        ------
-        ValueError
-            If sess is not day2 or day3
-
-        """
-        # Check sess value, get data
-        if sess not in ["day2", "day3"]:
-            raise ValueError(f"Incorrect visit day : {sess}")
-        df_panas = getattr(self, f"_df_study_{sess}")
-
-        # Convert response values to int, set answer_type
-        p_cols = [x for x in df_panas.columns if "PANAS_" in x]
-        df_panas[p_cols] = df_panas[p_cols].astype("Int64")
-        df_panas["answer_type"] = 1
-
-        # Remap column names, get metrics
-        map_item = {
-            "PANAS_1": "interested_q1",
-            "PANAS_2": "distressed_q2",
-            "PANAS_3": "excited_q3",
-            "PANAS_4": "strong_q5",
-            "PANAS_5": "scared_q7",
-            "PANAS_6": "enthusiastic_q9",
-            "PANAS_7": "ashamed_q13",
-            "PANAS_8": "nervous_q15",
-            "PANAS_9": "attentive_q17",
-            "PANAS_10": "active_q19",
-            "PANAS_11": "irritable_q11",
-            "PANAS_12": "alert_q12",
-            "PANAS_13": "upset1_q4",
-            "PANAS_14": "guilty_q6",
-            "PANAS_15": "hostile_q8",
-            "PANAS_16": "proud_q10",
-            "PANAS_17": "inspired_q14",
-            "PANAS_18": "determined_q16",
-            "PANAS_19": "jittery_q18",
-            "PANAS_20": "afraid_q20",
-        }
-        df_panas = df_panas.rename(columns=map_item)
-        df_panas = self._calc_metrics(df_panas)
-
-        # Add visit
-        df_panas["visit"] = sess
-
-        # Combine demo and panas dataframes, get survey age
-        df_nda = self._df_demo[["subjectkey", "src_subject_id", "sex"]].copy()
-        df_panas_demo = pd.merge(df_panas, df_nda, on="src_subject_id")
-        df_panas_demo = report_helper.get_survey_age(
-            df_panas_demo, self._df_demo, "src_subject_id"
+    def __init__(self, df_demo, proj_dir, df_study_day2, df_study_day3):
+        """Make report, pilot data are found in proj_dir."""
+        super().__init__(
+            df_demo, df_study_day2, df_study_day3, proj_dir=proj_dir
         )
 
-        # Build dataframe from nda columns, update with df_panas_demo data
-        df_nda = pd.DataFrame(
-            columns=self._nda_cols, index=df_panas_demo.index
-        )
-        df_nda.update(df_panas_demo)
-        return df_nda
-
 
 class NdarPhysio:
     """Make psychophys_subj_exp01 report line-by-line.
@@ -2217,7 +2184,7 @@ class NdarPhysio:
 
     """
 
-    def __init__(self, proj_dir, df_demo):
+    def __init__(self, proj_dir, df_demo, demo_idx=None):
         """Coordinate report generation for physio data.
 
         Assumes physio data exists within a BIDS-organized "phys"
@@ -2229,6 +2196,8 @@ class NdarPhysio:
             Project's experiment directory
         df_demo : make_reports.build_reports.DemoAll.final_demo
             pd.DataFrame, compiled demographic info
+        demo_idx : DemoIndex, optional
+            Shared demographic index, built from df_demo when None
 
         Attributes
         ----------
@@ -2257,12 +2226,12 @@ class NdarPhysio:
             proj_dir, "data_pilot/data_scanner_BIDS/rawdata"
         )
         rawdata_study = os.path.join(proj_dir, "data_scanner_BIDS/rawdata")
-        physio_pilot = sorted(
-            glob.glob(f"{rawdata_pilot}/sub-ER*/ses-day*/phys/*acq")
-        )
-        physio_study = sorted(
-            glob.glob(f"{rawdata_study}/sub-ER*/ses-day*/phys/*acq")
-        )
+        physio_pilot = file_catalog.get_catalog(
+            os.path.dirname(rawdata_pilot)
+        ).glob(f"{rawdata_pilot}/sub-ER*/ses-day*/phys/*acq")
+        physio_study = file_catalog.get_catalog(
+            os.path.dirname(rawdata_study)
+        ).glob(f"{rawdata_study}/sub-ER*/ses-day*/phys/*acq")
         self._physio_all = physio_pilot + physio_study
 
         # Get final demographics, make report
@@ -2271,6 +2240,7 @@ class NdarPhysio:
             ["Male", "Female", "Neither"], ["M", "F", "O"]
         )
         self._df_demo = df_demo.dropna(subset=["subjectkey"])
+        self._demo_idx = demo_idx if demo_idx else DemoIndex(self._df_demo)
         self._make_physio()
 
     def _get_subj_demo(self, subj_nda, acq_date):
@@ -2294,14 +2264,8 @@ class NdarPhysio:
 
         """
         # Identify participant date of birth, sex, and GUID
-        df_demo = self._df_demo
-        idx_subj = df_demo.index[
-            df_demo["src_subject_id"] == subj_nda
-        ].tolist()[0]
-        subj_guid = df_demo.iloc[idx_subj]["subjectkey"]
-        subj_id = df_demo.iloc[idx_subj]["src_subject_id"]
-        subj_sex = df_demo.iloc[idx_subj]["sex"]
-        subj_dob = datetime.strptime(df_demo.iloc[idx_subj]["dob"], "%Y-%m-%d")
+        subj_guid, subj_id, subj_sex, subj_dob = self._demo_idx.get(subj_nda)
+        subj_dob = datetime.strptime(subj_dob, "%Y-%m-%d")
 
         # Calculate age in months
         interview_age = report_helper.calc_age_mo([subj_dob], [acq_date])[0]
@@ -2361,8 +2325,14 @@ class NdarPhysio:
         # Set local path for upload building
         local_path = os.path.join(_local_path(), "data_phys")
 
-        # Start empty dataframe, fill with physio data
-        df_report = pd.DataFrame(columns=self._nda_cols)
+        # Read acquisition dates from acq headers
+        acq_date_dict = acq_header.acq_dates(self._physio_all)
+
+        # Collect physio records, stage host files
+        rep_acc = report_helper.ReportAccumulator(self._nda_cols)
+        stager = host_staging.HostStager(
+            os.path.join(self._proj_dir, "ndar_upload")
+        )
         for phys_path in self._physio_all:
             # Determine session info
             phys_file = os.path.basename(phys_path)
@@ -2370,41 +2340,11 @@ class NdarPhysio:
             subj, sess, task, run, _, _ = phys_file.split("_")
             subj_nda = subj.split("-")[1]
 
-            # # Extract datetime from acq file - I could not suppress
-            # # stdout print by air.run() for the life of me.
-            # air = acq_info.AcqInfoRunner(phys_path)
-            # air.run()
-            # acq_date_str = (
-            #     air.reader.datafile.earliest_marker_created_at.isoformat()
-            # ).split("T")[0]
-
-            bash_cmd = f"""
-                line=$(acq_info {phys_path} | grep "Earliest")
-                IFS=":" read -ra dt_arr <<< $line
-                echo ${{dt_arr[1]%T*}}
-            """
-            h_sp = subprocess.Popen(
-                bash_cmd,
-                shell=True,
-                executable="/bin/bash",
-                stdout=subprocess.PIPE,
-            )
-            h_out = h_sp.stdout.read()
-            h_acq_date_str = h_out.decode("utf-8").strip()
-            acq_date_str = h_acq_date_str.split("T")[0]
-            acq_date = datetime.strptime(acq_date_str, "%Y-%m-%d")
-
-            # Copy file for hosting
-            host_path = os.path.join(
-                self._proj_dir, "ndar_upload/data_phys", phys_file
-            )
-            if not os.path.exists(host_path):
-                bash_cmd = f"cp {phys_path} {host_path}"
-                h_sp = subprocess.Popen(
-                    bash_cmd, shell=True, stdout=subprocess.PIPE
-                )
-                h_out, h_err = h_sp.communicate()
-                h_sp.wait()
+            # Acquisition date from earliest acq event marker
+            acq_date = acq_date_dict[phys_path]
+
+            # Stage file for hosting
+            stager.stage(phys_path, f"data_phys/{phys_file}")
 
             # Identify participant-specific info
             local_file = os.path.join(local_path, phys_file)
@@ -2425,20 +2365,18 @@ class NdarPhysio:
             phys_dict.update(self._get_std_info())
             phys_dict.update(self._get_subj_demo(subj_nda, acq_date))
 
-            # Write new row with determined info
-            new_row = pd.DataFrame(phys_dict, index=[0])
-            df_report = pd.concat([df_report.loc[:], new_row]).reset_index(
-                drop=True
-            )
+            # Add record with determined info
+            rep_acc.add(phys_dict)
 
         # Set attribute
-        self.df_report = df_report
+        stager.close()
+        self.df_report = rep_acc.to_df()
 
 
-class NdarPswq01(_CleanDemo):
+class NdarPswq01(NdarSurvey):
     """Make pswq01 report for NDAR submission.
 
-    Inherits _CleanDemo.
+    Inherits NdarSurvey, see make_reports.reference_files.pswq01_spec.json.
 
     Parameters
     ----------
@@ -2456,100 +2394,20 @@ class NdarPswq01(_CleanDemo):
     nda_label : list
         NDA report template label
 
-    Methods
-    -------
-    make_pswq()
-        Generate pswq01 dataset, builds df_report
-
     """
 
-    def __init__(self, df_demo, df_pilot, df_study):
-        """Read in survey data and make report.
-
-        Get cleaned PSWQ Qualtrics survey from visit_day1, and
-        finalized demographic information.
-
-        Attributes
-        ----------
-        nda_label : list
-            NDA report template label
-
-        """
-        print("Buiding NDA report : pswq01 ...")
-        # Read in template, concatenate survey data
-        super().__init__(df_demo)
-        self.nda_label, self._nda_cols = report_helper.mine_template(
-            "pswq01_template.csv"
-        )
-        df_pswq = pd.concat([df_pilot, df_study], ignore_index=True)
-        df_pswq = df_pswq.replace("NaN", np.nan)
-        self._df_pswq = df_pswq[df_pswq["PSWQ_1"].notna()]
-
-        # Make report
-        self.make_pswq()
-
-    def make_pswq(self):
-        """Generate PSWQ report for NDAR submission.
+    _report = "pswq01"
 
-        Remap values and calculate totals.
 
-        Attributes
-        ----------
-        df_report : pd.DataFrame
-            Report of PSWQ data that complies with NDAR data definitions
-
-        """
-        # Update column names, make data integer
-        self._df_pswq = self._df_pswq.rename(columns=str.lower)
-        self._df_pswq.columns = self._df_pswq.columns.str.replace("_", "")
-        pswq_cols = [x for x in self._df_pswq.columns if "pswq" in x]
-        self._df_pswq[pswq_cols] = self._df_pswq[pswq_cols].astype("Int64")
-        self._df_pswq = self._df_pswq.rename(
-            columns={"studyid": "src_subject_id"}
-        )
-
-        # Calculate sum
-        self._df_pswq["pswq_total"] = self._df_pswq[pswq_cols].sum(axis=1)
-        self._df_pswq["pswq_total"] = self._df_pswq["pswq_total"].astype(
-            "Int64"
-        )
-
-        # Combine demographic and erq dataframes
-        df_nda = self._df_demo[["subjectkey", "src_subject_id", "sex"]]
-        df_pswq_nda = pd.merge(self._df_pswq, df_nda, on="src_subject_id")
-        df_pswq_nda = report_helper.get_survey_age(
-            df_pswq_nda, self._df_demo, "src_subject_id"
-        )
-
-        # Build dataframe from nda columns, update with df_final_emrq data
-        df_report = pd.DataFrame(
-            columns=self._nda_cols, index=df_pswq_nda.index
-        )
-        df_report.update(df_pswq_nda)
-        pilot_list = report_helper.pilot_list()
-        idx_pilot = df_report[
-            df_report["src_subject_id"].isin(pilot_list)
-        ].index.tolist()
-        df_report.loc[idx_pilot, "comments_misc"] = "PILOT PARTICIPANT"
-        self.df_report = df_report
-
-
-class NdarRest01(_CleanDemo):
+class NdarRest01(NdarSurvey):
     """Make restsurv01 report for NDAR submission.
 
-    Inherits _CleanDemo.
+    Inherits NdarSurvey, see make_reports.reference_files.restsurv01_spec.json.
 
     Parameters
     ----------
     df_demo : make_reports.build_reports.DemoAll.final_demo
         pd.DataFrame, compiled demographic info
-
-    Attributes
-    ----------
-    df_report : pd.DataFrame
-        Report of rest data that complies with NDAR data definitions
-    nda_label : list
-        NDA report template label
     df_pilot_day2 : pd.DataFrame
         Pilot rest ratings data from ses-day2
     df_study_day2 : pd.DataFrame
@@ -2559,182 +2417,22 @@ class NdarRest01(_CleanDemo):
     df_study_day3 : pd.DataFrame
         Study rest ratings data from ses-day3
 
-    Methods
-    -------
-    make_rest(sess: str)
-        Generate restsurv01 dataset, builds df_report for one session
+    Attributes
+    ----------
+    df_report : pd.DataFrame
+        Report of rest data that complies with NDAR data definitions
+    nda_label : list
+        NDA report template label
 
     """
 
-    def __init__(
-        self,
-        df_demo,
-        df_pilot_day2,
-        df_study_day2,
-        df_pilot_day3,
-        df_study_day3,
-    ):
-        """Read in survey data and make report.
-
-        Get cleaned rest rating surveys from visit_day2 and
-        visit_day3, and finalized demographic information.
-        Generate NDAR report.
-
-        Attributes
-        ----------
-        df_report : pd.DataFrame
-            Report of rest data that complies with NDAR data definitions
-        nda_label : list
-            NDA report template label
-
-        """
-        # Get needed column values from report template
-        print("Buiding NDA report : restsurv01 ...")
-        super().__init__(df_demo)
-        self.nda_label, self._nda_cols = report_helper.mine_template(
-            "restsurv01_template.csv"
-        )
-
-        # Get pilot, study data for both day2, day3
-        self._get_clean(
-            df_pilot_day2, df_study_day2, df_pilot_day3, df_study_day3
-        )
+    _report = "restsurv01"
 
-        # Make nda reports for each session
-        df_nda_day2 = self.make_rest("day2")
-        df_nda_day3 = self.make_rest("day3")
 
-        # Combine into final report
-        df_report = pd.concat([df_nda_day2, df_nda_day3], ignore_index=True)
-        df_report = df_report.sort_values(by=["src_subject_id", "visit"])
-
-        # Add pilot notes for certain subjects
-        pilot_list = report_helper.pilot_list()
-        idx_pilot = df_report[
-            df_report["src_subject_id"].isin(pilot_list)
-        ].index.tolist()
-        df_report.loc[idx_pilot, "comments_misc"] = "PILOT PARTICIPANT"
-        self.df_report = df_report[df_report["interview_date"].notna()]
-
-    def _get_clean(
-        self, df_pilot_day2, df_study_day2, df_pilot_day3, df_study_day3
-    ):
-        """Find and combine cleaned rest rating data.
-
-        Get pilot, study data for day2, day3.
-
-        """
-        # Combine pilot and study data, drop resp_alpha rows
-        df_rest_day2 = pd.concat(
-            [df_pilot_day2, df_study_day2], ignore_index=True
-        )
-        idx_alpha = df_rest_day2.index[
-            df_rest_day2["resp_type"] == "resp_alpha"
-        ].tolist()
-        df_rest_day2 = df_rest_day2.drop(
-            df_rest_day2.index[idx_alpha]
-        ).reset_index(drop=True)
-
-        # Update subj id column, set attribute
-        df_rest_day2 = df_rest_day2.rename(
-            columns={"study_id": "src_subject_id"}
-        )
-        self._df_rest_day2 = df_rest_day2
-
-        # Repeat for day3
-        df_rest_day3 = pd.concat(
-            [df_pilot_day3, df_study_day3], ignore_index=True
-        )
-        idx_alpha = df_rest_day3.index[
-            df_rest_day3["resp_type"] == "resp_alpha"
-        ].tolist()
-        df_rest_day3 = df_rest_day3.drop(
-            df_rest_day3.index[idx_alpha]
-        ).reset_index(drop=True)
-        df_rest_day3 = df_rest_day3.rename(
-            columns={"study_id": "src_subject_id"}
-        )
-        df_rest_day3.columns = df_rest_day2.columns.values
-        self._df_rest_day3 = df_rest_day3
-
-    def make_rest(self, sess):
-        """Make an NDAR compliant report for visit.
-
-        Remap column names, add demographic info, get session
-        age, and generate report.
-
-        Parameters
-        ----------
-        sess : str
-            [day2 | day3]
-            visit/session name
-
-        Returns
-        -------
-        pd.DataFrame
-
-        Raises
-        ------
-        ValueError
-            If sess is not day2 or day3
-
-        """
-        # Check sess value
-        if sess not in ["day2", "day3"]:
-            raise ValueError(f"Incorrect visit day : {sess}")
-
-        # Get session data
-        df_rest = getattr(self, f"_df_rest_{sess}")
-
-        # Convert response values to int and remap column names
-        map_item = {
-            "AMUSEMENT": "amusement_01",
-            "ANGER": "anger_02",
-            "ANXIETY": "anxiety_03",
-            "AWE": "awe_04",
-            "CALMNESS": "calmness_05",
-            "CRAVING": "craving_06",
-            "DISGUST": "disgust_07",
-            "EXCITEMENT": "excitement_08",
-            "FEAR": "fear_09",
-            "HORROR": "horror_10",
-            "JOY": "joy_12",
-            "NEUTRAL": "neutral_13",
-            "ROMANCE": "romantic_love_14",
-            "SADNESS": "sadness_15",
-            "SURPRISE": "surprise_16",
-            "INTEREST": "interest_11",
-        }
-        h_cols = [x for x in df_rest.columns if x in map_item.keys()]
-        df_rest[h_cols] = df_rest[h_cols].astype("Int64")
-        df_rest_remap = df_rest.rename(columns=map_item)
-
-        # Drop non-ndar columns
-        df_rest_remap = df_rest_remap.drop(
-            ["resp_type"],
-            axis=1,
-        )
-
-        # Combine demo and bdi dataframes
-        df_nda = self._df_demo[["subjectkey", "src_subject_id", "sex"]]
-        df_rest_demo = pd.merge(df_rest_remap, df_nda, on="src_subject_id")
-
-        # Calculate age in months of visit, update visit
-        df_rest_demo = report_helper.get_survey_age(
-            df_rest_demo, self._df_demo, "src_subject_id"
-        )
-        df_rest_demo["visit"] = sess
-
-        # Build dataframe from nda columns, update with df_bdi_demo data
-        df_nda = pd.DataFrame(columns=self._nda_cols, index=df_rest_demo.index)
-        df_nda.update(df_rest_demo)
-        return df_nda
-
-
-class NdarRrs01(_CleanDemo):
+class NdarRrs01(NdarSurvey):
     """Make rrs01 report for NDAR submission.
 
-    Inherits _CleanDemo.
+    Inherits NdarSurvey, see make_reports.reference_files.rrs01_spec.json.
 
     Parameters
     ----------
@@ -2752,129 +2450,19 @@ class NdarRrs01(_CleanDemo):
     nda_label : list
         NDA report template label
 
-    Methods
-    -------
-    make_rrs()
-        Generate rrs01 dataset, builds df_report
-
     """
 
-    def __init__(self, df_demo, proj_dir, df_study):
-        """Read in survey data and make report.
+    _report = "rrs01"
 
-        Get cleaned RRS Qualtrics survey from visit_day1, and
-        finalized demographic information.
-
-        Attributes
-        ----------
-        df_report : pd.DataFrame
-            Report of RRS data that complies with NDAR data definitions
-        nda_label : list
-            NDA report template label
-
-        """
-        print("Buiding NDA report : rrs01 ...")
-        # Read in template
-        super().__init__(df_demo)
-        self._proj_dir = proj_dir
-        self._df_study = df_study
-        self.nda_label, self._nda_cols = report_helper.mine_template(
-            "rrs01_template.csv"
-        )
-
-        # Make pilot, study dataframes
-        df_pilot = self._get_pilot()
-        df_rrs = self.make_rrs()
-
-        # Combine into final report
-        df_report = pd.concat([df_pilot, df_rrs], ignore_index=True)
-        self.df_report = df_report[df_report["interview_date"].notna()]
-
-    def _get_pilot(self):
-        """Get RRS data of pilot participants.
-
-        Import data from previous NDAR submission.
-
-        Returns
-        -------
-        pd.DataFrame
-
-        Raises
-        ------
-        FileNotFoundError
-            Missing dataframe of pilot data
-
-        """
-        # Read in pilot report
-        pilot_report = os.path.join(
-            self._proj_dir,
-            "data_pilot/ndar_resources",
-            "rrs01_dataset.csv",
-        )
-        if not os.path.exists(pilot_report):
-            raise FileNotFoundError(
-                f"Expected to find pilot rrs01 at {pilot_report}"
-            )
-        df_pilot = pd.read_csv(pilot_report)
-        df_pilot = df_pilot[1:]
-        df_pilot.columns = self._nda_cols
-        df_pilot["comments_misc"] = "PILOT PARTICIPANT"
-
-        # Calculate sum
-        p_cols = [x for x in df_pilot.columns if "rrs" in x]
-        df_pilot[p_cols] = df_pilot[p_cols].astype("Int64")
-        df_pilot["rrs_total"] = df_pilot[p_cols].sum(axis=1)
-        df_pilot["rrs_total"] = df_pilot["rrs_total"].astype("Int64")
-        return df_pilot
-
-    def make_rrs(self):
-        """Combine dataframes to generate requested report.
-
-        Calculate totals and determine survey age.
-
-        Returns
-        -------
-        pd.DataFrame
-            Report of study RRS data that complies with NDAR data definitions
-
-        """
-        # Rename columns, drop NaN rows
-        self._df_study = self._df_study.rename(
-            columns={"study_id": "src_subject_id"}
-        )
-        self._df_study = self._df_study.replace("NaN", np.nan)
-        self._df_study = self._df_study[self._df_study["RRS_1"].notna()]
-
-        # Update column names, make data integer
-        self._df_study = self._df_study.rename(columns=str.lower)
-        rrs_cols = [x for x in self._df_study.columns if "rrs" in x]
-        self._df_study[rrs_cols] = self._df_study[rrs_cols].astype("Int64")
-
-        # Calculate sum
-        self._df_study["rrs_total"] = self._df_study[rrs_cols].sum(axis=1)
-        self._df_study["rrs_total"] = self._df_study["rrs_total"].astype(
-            "Int64"
-        )
-
-        # Combine demographic and rrs dataframes
-        df_nda = self._df_demo[["subjectkey", "src_subject_id", "sex"]]
-        df_rrs_nda = pd.merge(self._df_study, df_nda, on="src_subject_id")
-        df_rrs_nda = report_helper.get_survey_age(
-            df_rrs_nda, self._df_demo, "src_subject_id"
-        )
-
-        # Build dataframe from nda columns, update with demo and rrs data
-        df_study_report = pd.DataFrame(
-            columns=self._nda_cols, index=df_rrs_nda.index
-        )
-        df_study_report.update(df_rrs_nda)
-        return df_study_report
+    def __init__(self, df_demo, proj_dir, df_study):
+        """Make report, pilot data are found in proj_dir."""
+        super().__init__(df_demo, df_study, proj_dir=proj_dir)
 
 
-class NdarStai01(_CleanDemo):
+class NdarStai01(NdarSurvey):
     """Make stai01 report for NDAR submission.
 
-    Inherits _CleanDemo.
+    Inherits NdarSurvey, see make_reports.reference_files.stai01_spec.json.
 
     Parameters
     ----------
@@ -2900,225 +2488,9 @@ class NdarStai01(_CleanDemo):
     nda_label : list
         NDA report template label
 
-    Methods
-    -------
-    mask_stai_state()
-        Generate stai01 dataset, builds df_report of state survey data
-    make_stai_trait(sess: str)
-        Generate stai01 dataset, builds df_report for one session
-        of trait survey data
-
     """
 
-    def __init__(
-        self,
-        df_demo,
-        df_pilot_day1,
-        df_study_day1,
-        df_pilot_day2,
-        df_study_day2,
-        df_pilot_day3,
-        df_study_day3,
-    ):
-        """Read in survey data and make report.
-
-        Get cleaned STAI Qualtrics survey from visits, and
-        finalized demographic information. Coordinate creation
-        of state, trait reports. Generate df_report.
-
-        Attributes
-        ----------
-        df_report : pd.DataFrame
-            Report of STAI data that complies with NDAR data definitions
-        nda_label : list
-            NDA report template label
-
-        """
-        print("Buiding NDA report : stai01 ...")
-        # Read in template
-        super().__init__(df_demo)
-        self.nda_label, self._nda_cols = report_helper.mine_template(
-            "stai01_template.csv"
-        )
-
-        # Generate trait report
-        self._df_pilot_day1 = df_pilot_day1
-        self._df_study_day1 = df_study_day1
-        df_trait = self.make_stai_trait()
-
-        # Generate state reports for day2, day3
-        self._df_pilot_day2 = df_pilot_day2
-        self._df_study_day2 = df_study_day2
-        self._df_pilot_day3 = df_pilot_day3
-        self._df_study_day3 = df_study_day3
-        df_nda_day2 = self.make_stai_state("day2")
-        df_nda_day3 = self.make_stai_state("day3")
-
-        # Combine into final report
-        df_report = pd.concat(
-            [df_trait, df_nda_day2, df_nda_day3], ignore_index=True
-        )
-        df_report = df_report.sort_values(by=["src_subject_id", "visit"])
-        self.df_report = df_report[df_report["interview_date"].notna()]
-
-    def _clean_df(self, df: pd.DataFrame, col_name: str) -> pd.DataFrame:
-        """Clean col names, NaNs, empty col_name rows, and col types."""
-        df = df.rename(columns={"study_id": "src_subject_id"})
-        df = df.replace("NaN", np.nan)
-        df = df[df[col_name].notna()]
-        stai_cols = [x for x in df.columns if "STAI" in x]
-        df[stai_cols] = df[stai_cols].astype("Int64")
-        return df
-
-    def make_stai_trait(self):
-        """Combine dataframes to generate trait report.
-
-        Remap columns, calculate totals, and determine survey age.
-
-        Returns
-        -------
-        pd.DataFrame
-            Report of STAI trait data that complies with
-            NDAR data definitions
-
-        """
-        # Concat dfs
-        df_stai_trait = pd.concat(
-            [self._df_pilot_day1, self._df_study_day1], ignore_index=True
-        )
-        df_stai_trait = self._clean_df(df_stai_trait, "STAI_Trait_1")
-
-        # Remap column names
-        map_item = {
-            "STAI_Trait_1": "stai21",
-            "STAI_Trait_2": "stai22",
-            "STAI_Trait_3": "stai23",
-            "STAI_Trait_4": "stai24",
-            "STAI_Trait_5": "stai25",
-            "STAI_Trait_6": "stai26",
-            "STAI_Trait_7": "stai27",
-            "STAI_Trait_8": "stai28",
-            "STAI_Trait_9": "stai29",
-            "STAI_Trait_10": "stai30",
-            "STAI_Trait_11": "stai31",
-            "STAI_Trait_12": "stai32",
-            "STAI_Trait_13": "stai33",
-            "STAI_Trait_14": "stai34",
-            "STAI_Trait_15": "stai35",
-            "STAI_Trait_16": "stai36",
-            "STAI_Trait_17": "stai37",
-            "STAI_Trait_18": "stai38",
-            "STAI_Trait_19": "stai39",
-            "STAI_Trait_20": "stai40",
-        }
-        df_stai_trait = df_stai_trait.rename(columns=map_item)
-
-        # Get trait sum
-        trait_cols = [x for x in df_stai_trait.columns if "stai" in x]
-        df_stai_trait["staiy_trait"] = df_stai_trait[trait_cols].sum(axis=1)
-        df_stai_trait["staiy_trait"] = df_stai_trait["staiy_trait"].astype(
-            "Int64"
-        )
-
-        # Combine demographic and stai dataframes
-        df_nda = self._df_demo[["subjectkey", "src_subject_id", "sex"]]
-        df_stai_trait_nda = pd.merge(
-            df_stai_trait, df_nda, on="src_subject_id"
-        )
-        df_stai_trait_nda = report_helper.get_survey_age(
-            df_stai_trait_nda, self._df_demo, "src_subject_id"
-        )
-
-        # Add visit info
-        df_stai_trait_nda["visit"] = "day1"
-
-        # Build dataframe from nda columns, update with demo and stai data
-        df_nda = pd.DataFrame(
-            columns=self._nda_cols, index=df_stai_trait_nda.index
-        )
-        df_nda.update(df_stai_trait_nda)
-        return df_nda
-
-    def make_stai_state(self, sess):
-        """Combine dataframes to generate state report.
-
-        Remap columns, calculate totals, and determine survey age.
-
-        Parameters
-        ----------
-        sess : str
-            [day2 | day3]
-            visit/session name
-
-        Returns
-        -------
-        pd.DataFrame
-            Report of STAI state data that complies with
-            NDAR data definitions
-
-        """
-        # Check sess value
-        if sess not in ["day2", "day3"]:
-            raise ValueError(f"Incorrect visit day : {sess}")
-
-        # Get session data
-        df_pilot = getattr(self, f"_df_pilot_{sess}")
-        df_study = getattr(self, f"_df_study_{sess}")
-        df_stai_state = pd.concat([df_pilot, df_study], ignore_index=True)
-        df_stai_state = self._clean_df(df_stai_state, "STAI_State_1")
-
-        # Remap column names
-        map_item = {
-            "STAI_State_1": "stai1",
-            "STAI_State_2": "stai2",
-            "STAI_State_3": "stai3",
-            "STAI_State_4": "stai_state4_i",
-            "STAI_State_5": "stai5",
-            "STAI_State_6": "stai6",
-            "STAI_State_7": "stai7",
-            "STAI_State_8": "stai_state8_i",
-            "STAI_State_9": "stai_state9_i",
-            "STAI_State_10": "stai10",
-            "STAI_State_11": "stai11",
-            "STAI_State_12": "stai12",
-            "STAI_State_13": "stai13",
-            "STAI_State_14": "stai_state14_i",
-            "STAI_State_15": "stai15",
-            "STAI_State_16": "stai16",
-            "STAI_State_17": "stai17",
-            "STAI_State_18": "stai_state18_i",
-            "STAI_State_19": "stai_state19_i",
-            "STAI_State_20": "stai20",
-        }
-        df_stai_state_remap = df_stai_state.rename(columns=map_item)
-
-        # Get state sum
-        state_cols = [x for x in df_stai_state_remap.columns if "stai" in x]
-        df_stai_state_remap["staiy_state"] = df_stai_state_remap[
-            state_cols
-        ].sum(axis=1)
-        df_stai_state_remap["staiy_state"] = df_stai_state_remap[
-            "staiy_state"
-        ].astype("Int64")
-
-        # Combine demographic and stai dataframes
-        df_nda = self._df_demo[["subjectkey", "src_subject_id", "sex"]]
-        df_stai_state_nda = pd.merge(
-            df_stai_state_remap, df_nda, on="src_subject_id"
-        )
-        df_stai_state_nda = report_helper.get_survey_age(
-            df_stai_state_nda, self._df_demo, "src_subject_id"
-        )
-
-        # Add visit info
-        df_stai_state_nda["visit"] = sess
-
-        # Build dataframe from nda columns, update with demo and stai data
-        df_nda = pd.DataFrame(
-            columns=self._nda_cols, index=df_stai_state_nda.index
-        )
-        df_nda.update(df_stai_state_nda)
-        return df_nda
+    _report = "stai01"
 
 
 class NdarSubject01(_CleanDemo):
@@ -3202,10 +2574,10 @@ class NdarSubject01(_CleanDemo):
             self.df_report[h_col] = h_value
 
 
-class NdarTas01(_CleanDemo):
+class NdarTas01(NdarSurvey):
     """Make tas01 report for NDAR submission.
 
-    Inherits _CleanDemo.
+    Inherits NdarSurvey, see make_reports.reference_files.tas01_spec.json.
 
     Parameters
     ----------
@@ -3223,71 +2595,6 @@ class NdarTas01(_CleanDemo):
     nda_label : list
         NDA report template label
 
-    Methods
-    -------
-    make_tas
-        Generate tas01 dataset, builds df_report
-
     """
 
-    def __init__(self, df_demo, df_pilot, df_study):
-        """Read in survey data and make report.
-
-        Get cleaned TAS Qualtrics survey from visit_day1, and
-        finalized demographic information.
-
-        Attributes
-        ----------
-        nda_label : list
-            NDA report template label
-
-        """
-        print("Buiding NDA report : tas01 ...")
-        # Read in template, concat dfs
-        super().__init__(df_demo)
-        self.nda_label, self._nda_cols = report_helper.mine_template(
-            "tas01_template.csv"
-        )
-        df_tas = pd.concat([df_pilot, df_study], ignore_index=True)
-
-        # Rename columns, drop NaN rows
-        df_tas = df_tas.rename(columns={"study_id": "src_subject_id"})
-        df_tas = df_tas.replace("NaN", np.nan)
-        self._df_tas = df_tas[df_tas["TAS_1"].notna()]
-
-        # Make report
-        self.make_tas()
-
-    def make_tas(self):
-        """Combine dataframes to generate requested report.
-
-        Rename columns, calculate totals, and determine survey age.
-
-        Attributes
-        ----------
-        df_report : pd.DataFrame
-            Report of TAS data that complies with NDAR data definitions
-
-        """
-        # Make data integer, calculate sum, and rename columns
-        self._df_tas = self._df_tas
-        tas_cols = [x for x in self._df_tas.columns if "TAS" in x]
-        self._df_tas[tas_cols] = self._df_tas[tas_cols].astype("Int64")
-        self._df_tas["tas_totalscore"] = self._df_tas[tas_cols].sum(axis=1)
-        self._df_tas["tas_totalscore"] = self._df_tas["tas_totalscore"].astype(
-            "Int64"
-        )
-        self._df_tas.columns = self._df_tas.columns.str.replace("TAS", "tas20")
-
-        # Combine demographic and stai dataframes
-        df_nda = self._df_demo[["subjectkey", "src_subject_id", "sex"]]
-        df_tas_nda = pd.merge(self._df_tas, df_nda, on="src_subject_id")
-        df_tas_nda = report_helper.get_survey_age(
-            df_tas_nda, self._df_demo, "src_subject_id"
-        )
-
-        # Build dataframe from nda columns, update with demo and stai data
-        self.df_report = pd.DataFrame(
-            columns=self._nda_cols, index=df_tas_nda.index
-        )
-        self.df_report.update(df_tas_nda)
+    _report = "tas01"
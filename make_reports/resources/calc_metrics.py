@@ -10,7 +10,6 @@ ParticipantFlow : generate PRISMA flowchart of participants in experiment
 # %%
 import os
 import json
-import glob
 import datetime
 import math
 import pandas as pd
@@ -22,6 +21,7 @@ from make_reports.resources import survey_download
 from make_reports.resources import build_reports
 from make_reports.resources import report_helper
 from make_reports.resources import manage_data
+from make_reports.resources import file_catalog
 
 
 # %%
@@ -318,24 +318,24 @@ def demographics(proj_dir, plot_var="Count", ref_num=170):
     ]
 
     # Make a two factor dataframe
-    df_plot_sex = pd.DataFrame(columns=["Sex", "Group", "Type", "Proportion"])
+    rep_acc = report_helper.ReportAccumulator(
+        ["Sex", "Group", "Type", "Proportion"]
+    )
     for h_col, h_val in plot_plan_sex:
         calc_props.get_demo_props(h_col, h_val)
         for h_prop, h_type in zip(
             [calc_props.prop_plan, calc_props.prop_actual],
             ["Planned", "Actual"],
         ):
-            h_dict = {
-                "Sex": h_val[0],
-                "Group": h_val[1],
-                "Type": h_type,
-                "Proportion": h_prop,
-            }
-            h_row = pd.DataFrame(h_dict, index=[0])
-            df_plot_sex = pd.concat([df_plot_sex.loc[:], h_row]).reset_index(
-                drop=True
+            rep_acc.add(
+                {
+                    "Sex": h_val[0],
+                    "Group": h_val[1],
+                    "Type": h_type,
+                    "Proportion": h_prop,
+                }
             )
-            del h_dict, h_row
+    df_plot_sex = rep_acc.to_df()
     df_plot_sex["Count"] = [
         math.ceil(ref_num * x) for x in df_plot_sex["Proportion"]
     ]
@@ -542,7 +542,12 @@ def censored_volumes(proj_dir):
     deriv_dir = os.path.join(
         proj_dir, "data_scanner_BIDS/derivatives/model_fsl"
     )
-    subj_list = [os.path.basename(x) for x in glob.glob(f"{deriv_dir}/sub-*")]
+    bids_cat = file_catalog.get_catalog(
+        os.path.join(proj_dir, "data_scanner_BIDS")
+    )
+    subj_list = [
+        os.path.basename(x) for x in bids_cat.glob(f"{deriv_dir}/sub-*")
+    ]
 
     # Capture all proportion data, organized by subject * session * run
     data_dict = {}
@@ -554,7 +559,7 @@ def censored_volumes(proj_dir):
             )
             run_list = [
                 x
-                for x in sorted(glob.glob(f"{search_path}/*proportion.json"))
+                for x in bids_cat.glob(f"{search_path}/*proportion.json")
                 if "task-rest" not in x
             ]
             if not run_list:
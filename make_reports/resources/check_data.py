@@ -1,5 +1,6 @@
 """Resources for checking data completeness.
 
+BidsInventory : index rawdata, derivatives files via a single walk
 CheckMri : check for expected rawdata and derivatives
 CheckEmorepComplete : determine which EmoRep participants
     are missing data
@@ -7,14 +8,241 @@ CheckEmorepComplete : determine which EmoRep participants
 """
 
 import os
-import glob
 import time
 import pandas as pd
 import numpy as np
 from typing import Union, Tuple
-from multiprocessing import Pool
+from concurrent.futures import ThreadPoolExecutor
 from make_reports.resources import build_reports
 from make_reports.resources import report_helper
+from make_reports.resources import file_catalog
+
+
+class BidsInventory:
+    """Index BIDS rawdata and derivatives files via a single walk.
+
+    Walk each subject directory of the requested search roots once,
+    using os.scandir and a thread pool across subject directories, and
+    build an in-memory index of (root, subject, session, relative path,
+    mtime). Pipeline checks are then evaluated as queries against the
+    index instead of per-subject globs.
+
+    Parameters
+    ----------
+    subj_list : list
+        Subject identifiers without BIDS prefix
+    root_depth : dict
+        {search_root: int|None}, where int is the maximum number of
+        path components to index within a session directory and None
+        indexes the full session tree
+    num_proc : int, optional
+        Number of subject directories walked concurrently
+    catalog : file_catalog.FileCatalog, optional
+        Read entries from persistent catalog instead of walking the
+        subject directories
+
+    Attributes
+    ----------
+    df_index : pd.DataFrame
+        Index of all entries, columns root, subj, sess, rel_path,
+        mtime, and is_dir
+
+    Methods
+    -------
+    build_index()
+        Walk search roots, build df_index
+    query(search_root, sess, search_str)
+        Return file count, mtime of last matching file per subject
+    stat_mtime(search_root, subj, sess, rel_path, mtime)
+        Return current mtime of an indexed entry
+    top_level(search_dir)
+        Return {name: mtime} for entries of a single directory
+
+    Example
+    -------
+    bids_inv = check_data.BidsInventory(
+        ["ER0009"], {"/path/rawdata": None}
+    )
+    bids_inv.build_index()
+    df_match = bids_inv.query("/path/rawdata", "day2", "func/*events.tsv")
+
+    """
+
+    def __init__(self, subj_list, root_depth, num_proc=10, catalog=None):
+        """Initialize."""
+        self._subj_list = subj_list
+        self._root_depth = root_depth
+        self._num_proc = num_proc
+        self._catalog = catalog
+
+    def build_index(self):
+        """Walk all subject directories of search roots once.
+
+        Attributes
+        ----------
+        df_index : pd.DataFrame
+            Index of all entries, columns root, subj, sess, rel_path,
+            mtime, and is_dir
+
+        """
+        print("\tBuilding BIDS inventory ...")
+        walk_list = [
+            (root, subj, depth)
+            for root, depth in self._root_depth.items()
+            for subj in self._subj_list
+        ]
+        with ThreadPoolExecutor(max_workers=self._num_proc) as pool:
+            rec_lists = pool.map(lambda x: self._walk_subj(*x), walk_list)
+            rec_all = [rec for rec_list in rec_lists for rec in rec_list]
+        self.df_index = pd.DataFrame(
+            rec_all,
+            columns=["root", "subj", "sess", "rel_path", "mtime", "is_dir"],
+        )
+        self.df_index = self.df_index.sort_values(
+            by=["root", "subj", "sess", "rel_path"], ignore_index=True
+        )
+        self._root_df = {
+            root: df for root, df in self.df_index.groupby("root", sort=False)
+        }
+        print(f"\t\tIndexed {len(self.df_index)} entries")
+
+    def _walk_subj(
+        self, root: Union[str, os.PathLike], subj: str, max_depth: int
+    ) -> list:
+        """Return index records for all session entries of subject."""
+        subj_dir = os.path.join(root, f"sub-{subj}")
+        if self._catalog:
+            return self._catalog_subj(root, subj, max_depth)
+        rec_list = []
+        if not os.path.isdir(subj_dir):
+            return rec_list
+
+        # Depth-first walk, track path components relative to subj_dir.
+        # Session dirs are component 1, so max_depth is offset by one.
+        max_comp = None if max_depth is None else max_depth + 1
+        dir_stack = [(subj_dir, "", 0)]
+        while dir_stack:
+            cur_dir, rel_dir, num_comp = dir_stack.pop()
+            try:
+                with os.scandir(cur_dir) as dir_iter:
+                    ent_list = list(dir_iter)
+            except (FileNotFoundError, PermissionError, NotADirectoryError):
+                continue
+            for ent in ent_list:
+                rel_path = f"{rel_dir}/{ent.name}" if rel_dir else ent.name
+                try:
+                    is_dir = ent.is_dir()
+                    ent_mtime = ent.stat().st_mtime
+                except (FileNotFoundError, PermissionError):
+                    continue
+
+                # Only record, descend into session directories
+                if num_comp == 0:
+                    if is_dir and ent.name.startswith("ses-"):
+                        dir_stack.append((ent.path, rel_path, 1))
+                    continue
+                sess, sess_path = rel_path.split("/", 1)
+                rec_list.append(
+                    (root, subj, sess, sess_path, ent_mtime, is_dir)
+                )
+                if is_dir and (max_comp is None or num_comp + 1 < max_comp):
+                    dir_stack.append((ent.path, rel_path, num_comp + 1))
+        return rec_list
+
+    def _catalog_subj(
+        self, root: Union[str, os.PathLike], subj: str, max_depth: int
+    ) -> list:
+        """Return index records for all session entries from catalog."""
+        subj_dir = os.path.join(root, f"sub-{subj}")
+        rec_list = []
+        rel_start = len(subj_dir) + 1
+        for ent_path, ent_mtime, is_dir in self._catalog.entries(subj_dir):
+            rel_path = ent_path[rel_start:]
+            if "/" not in rel_path or not rel_path.startswith("ses-"):
+                continue
+            sess, sess_path = rel_path.split("/", 1)
+            if max_depth is not None and sess_path.count("/") >= max_depth:
+                continue
+            rec_list.append((root, subj, sess, sess_path, ent_mtime, is_dir))
+        return rec_list
+
+    def _sess_df(
+        self, search_root: Union[str, os.PathLike], sess: str
+    ) -> pd.DataFrame:
+        """Return index entries of search_root for session."""
+        df = self._root_df.get(search_root)
+        if df is None:
+            return self.df_index.iloc[0:0]
+        return df.loc[df["sess"] == f"ses-{sess}"]
+
+    def query(
+        self,
+        search_root: Union[str, os.PathLike],
+        sess: str,
+        search_str: str,
+    ) -> pd.DataFrame:
+        """Return matching file count and last mtime per subject.
+
+        Parameters
+        ----------
+        search_root : str, os.PathLike
+            Parent directory of subject directories, a key of root_depth
+        sess : str
+            Session identifier without BIDS formatting
+        search_str : str
+            Glob-style pattern relative to session directory
+
+        Returns
+        -------
+        pd.DataFrame
+            Indexed by subject, columns num_files, rel_path, and mtime,
+            where rel_path and mtime are of the last matching file in
+            sorted order
+
+        """
+        df = self._sess_df(search_root, sess)
+        df = df.loc[
+            df["rel_path"].str.match(report_helper.glob_regex(search_str))
+        ]
+        return df.groupby("subj").agg(
+            num_files=("rel_path", "size"),
+            rel_path=("rel_path", "last"),
+            mtime=("mtime", "last"),
+        )
+
+    def stat_mtime(
+        self,
+        search_root: Union[str, os.PathLike],
+        subj: str,
+        sess: str,
+        rel_path: str,
+        mtime: float,
+    ) -> float:
+        """Return current mtime of indexed entry, mtime if not found.
+
+        Catalogued mtimes of files rewritten in place are stale until a
+        full catalog refresh, so reported entries are stat'd directly.
+
+        """
+        try:
+            return os.stat(
+                os.path.join(search_root, f"sub-{subj}", sess, rel_path)
+            ).st_mtime
+        except OSError:
+            return mtime
+
+    def sess_entries(
+        self, search_root: Union[str, os.PathLike], sess: str
+    ) -> pd.DataFrame:
+        """Return all index entries of search_root for session."""
+        return self._sess_df(search_root, sess)
+
+    def top_level(self, search_dir: Union[str, os.PathLike]) -> dict:
+        """Return {name: mtime} of entries in search_dir."""
+        if not os.path.isdir(search_dir):
+            return {}
+        with os.scandir(search_dir) as dir_iter:
+            return {x.name: x.stat().st_mtime for x in dir_iter}
 
 
 class _ChkRsc:
@@ -27,68 +255,76 @@ class _ChkRsc:
         self.df_mri = self.df_mri.sort_values(by=["subid"], ignore_index=True)
         self.df_mri["sess"] = sess_list * len(subj_list)
 
-    def get_time(self, mri_path: Union[str, os.PathLike]) -> str:
+    def fmt_time(self, mtime: float) -> str:
         """Return datetime string of file maketime."""
-        return time.strftime(
-            "%Y-%m-%d",
-            time.strptime(time.ctime(os.path.getmtime(mri_path))),
-        )
-
-    def _compare_count(self, subj: str):
-        """Compare encountered files to desired number.
+        return time.strftime("%Y-%m-%d", time.localtime(mtime))
 
-        Search through directories to make a list of files. Compare length
-        of list against desired quantity, then make cell value according
-        to (a) whether all are found (datetime), (b) only some are found (int),
-        or (c) no files are found (np.nan).
+    def start_inventory(self, chk_dict: dict):
+        """Build BidsInventory of rawdata and chk_dict search paths.
 
-        Returns
-        -------
-        str (datetime.date), int, or np.NaN
+        Rawdata is indexed fully (for recursive dcm2niix checks), while
+        derivatives are only indexed as deep as their search strings.
+        Entries are read from the persistent file catalog of the BIDS
+        directory.
 
         """
-        search_file_str = (
-            f"{self._search_path}/sub-{subj}/"
-            + f"ses-{self._sess}/{self._search_str}"
+        root_depth = {self._raw_dir: None}
+        for search_path, search_str, _ in chk_dict.values():
+            if search_path == self._raw_dir:
+                continue
+            root_depth[search_path] = max(
+                len(search_str.split("/")), root_depth.get(search_path, 0)
+            )
+        bids_cat = file_catalog.get_catalog(os.path.dirname(self._raw_dir))
+        self._inventory = BidsInventory(
+            self._subj_list, root_depth, catalog=bids_cat
         )
-        file_list = sorted(glob.glob(search_file_str))
-        file_num = len(file_list)
-
-        if file_num == self._num_exp:
-            return self.get_time(file_list[-1])
-        elif file_num > 0:
-            return file_num
-        else:
-            return np.nan
+        self._inventory.build_index()
 
-    def multi_chk(
+    def inventory_chk(
         self,
         sess: str,
         step: str,
         search_path: Union[str, os.PathLike],
         search_str: Union[str, os.PathLike],
-        subj_list: list,
         num_exp: int,
-        num_proc: int = 10,
     ):
-        """Multiprocess compare_count, write df column."""
+        """Compare indexed files to desired number, write df column.
+
+        Query the inventory for files matching search_str, then make
+        cell value according to (a) whether all are found (datetime),
+        (b) only some are found (int), or (c) no files are found (np.nan).
+
+        """
         print(f"\t\tChecking {step}")
         self._sess = sess
-        self._search_path = search_path
-        self._search_str = search_str
-        self._num_exp = num_exp
-        col_out = Pool(num_proc).starmap(
-            self._compare_count,
-            [(subj,) for subj in subj_list],
-        )
-        self.update_df(col_out, step)
-
-    def update_df(self, in_val: list, col_name: str):
-        """Update column of df_mri."""
-        idx_sess = self.df_mri.index[
-            self.df_mri["sess"] == self._sess
-        ].tolist()
-        self.df_mri.loc[idx_sess, col_name] = in_val
+        df_match = self._inventory.query(search_path, sess, search_str)
+        val_dict = {
+            subj: (
+                self.fmt_time(
+                    self._inventory.stat_mtime(
+                        search_path, subj, f"ses-{sess}", rel_path, mtime
+                    )
+                )
+                if num == num_exp
+                else num
+            )
+            for subj, num, rel_path, mtime in zip(
+                df_match.index,
+                df_match["num_files"],
+                df_match["rel_path"],
+                df_match["mtime"],
+            )
+        }
+        self.update_df(val_dict, step)
+
+    def update_df(self, val_dict: dict, col_name: str):
+        """Update column of df_mri with {subj: value} for session."""
+        idx_sess = self.df_mri.index[self.df_mri["sess"] == self._sess]
+        self.df_mri.loc[idx_sess, col_name] = [
+            val_dict.get(subj, np.nan)
+            for subj in self.df_mri.loc[idx_sess, "subid"]
+        ]
 
 
 class _CheckEmorep(_ChkRsc):
@@ -115,69 +351,82 @@ class _CheckEmorep(_ChkRsc):
     def check_bids(self):
         """Check for BIDS organization, update dataframe."""
         print("\t\tChecking bidsification ...")
-        is_bids = []
-        for subj in self._subj_list:
-            # Find contents of session dir, get names
-            sess_dirs = glob.glob(
-                f"{self._raw_dir}/sub-{subj}/ses-{self._sess}/*"
-            )
-            sess_names = [os.path.basename(x) for x in sess_dirs]
-
-            # Set value according to whether anat is found, update is_bids
-            h_val = (
-                self.get_time(sess_dirs[0]) if "anat" in sess_names else np.nan
-            )
-            is_bids.append(h_val)
+        df_sess = self._inventory.sess_entries(self._raw_dir, self._sess)
+        df_top = df_sess.loc[~df_sess["rel_path"].str.contains("/")]
+
+        # Set value according to whether anat is found
+        df_anat = df_top.loc[df_top["rel_path"] == "anat"]
+        df_first = df_top.groupby("subj")["mtime"].first()
+        is_bids = {
+            subj: self.fmt_time(df_first[subj])
+            for subj in df_anat["subj"].unique()
+        }
         self.update_df(is_bids, "bidsify")
 
     def check_mriqc(self):
         """Check for MRIQC output, update dataframe."""
         print("\t\tChecking MRIQC ...")
-        mriqc_found = []
-        for subj in self._subj_list:
-            # Set path str
-            mriqc_file = os.path.join(
-                self._deriv_dir,
-                "mriqc",
-                f"sub-{subj}_ses-{self._sess}_T1w.html",
+        if not hasattr(self, "_mriqc_dict"):
+            self._mriqc_dict = self._inventory.top_level(
+                os.path.join(self._deriv_dir, "mriqc")
             )
 
-            # Set value, update mriqc_found according to whether file exists.
-            h_val = (
-                self.get_time(mriqc_file)
-                if os.path.exists(mriqc_file)
-                else np.nan
-            )
-            mriqc_found.append(h_val)
+        # Set value according to whether file exists
+        mriqc_found = {}
+        for subj in self._subj_list:
+            mriqc_file = f"sub-{subj}_ses-{self._sess}_T1w.html"
+            if mriqc_file in self._mriqc_dict:
+                mriqc_found[subj] = self.fmt_time(self._mriqc_dict[mriqc_file])
         self.update_df(mriqc_found, "mriqc")
 
     def check_dcmnii(self):
         """Check for dcm2niix output."""
-        nii_found = []
-        for subj in self._subj_list:
-            # Find files, get counts
-            search_path = os.path.join(
-                self._raw_dir, f"sub-{subj}", f"ses-{self._sess}"
+        # Get counts of all, anat, fmap, func NIfTIs
+        df_sess = self._inventory.sess_entries(self._raw_dir, self._sess)
+        df_nii = df_sess.loc[df_sess["rel_path"].str.endswith(".nii.gz")]
+        df_nii = df_nii.assign(
+            **{
+                x: df_nii["rel_path"].str.contains(f"{x}/")
+                for x in ["anat", "fmap", "func"]
+            }
+        )
+        df_count = df_nii.groupby("subj").agg(
+            num_nii=("rel_path", "size"),
+            num_anat=("anat", "sum"),
+            num_fmap=("fmap", "sum"),
+            num_func=("func", "sum"),
+            rel_path=("rel_path", "last"),
+            mtime=("mtime", "last"),
+        )
+
+        # Compare to anticipated totals
+        is_comp = (
+            (df_count["num_anat"] == 1)
+            & (df_count["num_fmap"].isin([1, 2]))
+            & (df_count["num_func"] == 9)
+        )
+        nii_found = {
+            subj: (
+                self.fmt_time(
+                    self._inventory.stat_mtime(
+                        self._raw_dir,
+                        subj,
+                        f"ses-{self._sess}",
+                        rel_path,
+                        mtime,
+                    )
+                )
+                if comp
+                else num
             )
-            nii_list = sorted(
-                glob.glob(f"{search_path}/**/*.nii.gz", recursive=True)
+            for subj, comp, num, rel_path, mtime in zip(
+                df_count.index,
+                is_comp,
+                df_count["num_nii"],
+                df_count["rel_path"],
+                df_count["mtime"],
             )
-            num_nii = len(nii_list)
-            num_anat = len([x for x in nii_list if "anat/" in x])
-            num_fmap = len([x for x in nii_list if "fmap/" in x])
-            num_func = len([x for x in nii_list if "func/" in x])
-
-            # Compare to anticipated totals
-            if (
-                num_anat == 1
-                and (num_fmap == 1 or num_fmap == 2)
-                and num_func == 9
-            ):
-                nii_found.append(self.get_time(nii_list[-1]))
-            elif num_nii == 0:
-                nii_found.append(np.nan)
-            elif num_nii > 0:
-                nii_found.append(num_nii)
+        }
         self.update_df(nii_found, "dcm-nii")
 
     def info_emorep(self) -> Tuple[list, dict]:
@@ -354,9 +603,10 @@ class CheckMri(_CheckEmorep):
             Dataframe of subj, MRI encountered
 
         """
-        # Get info for checking, start df_mri attr
+        # Get info for checking, start df_mri attr and inventory
         col_names, check_info = self.info_emorep()
         self.start_df(col_names, self._sess_list, self._subj_list)
+        self.start_inventory(check_info)
 
         # Check for each scan session
         for self._sess in self._sess_list:
@@ -370,13 +620,8 @@ class CheckMri(_CheckEmorep):
             # Check steps in check_info, add session to search string
             for step, trip in check_info.items():
                 search_path, search_str, num_exp = trip
-                self.multi_chk(
-                    self._sess,
-                    step,
-                    search_path,
-                    search_str,
-                    self._subj_list,
-                    num_exp,
+                self.inventory_chk(
+                    self._sess, step, search_path, search_str, num_exp
                 )
 
     def check_archival(self):
@@ -394,22 +639,18 @@ class CheckMri(_CheckEmorep):
             Dataframe of subj, MRI encountered
 
         """
-        # Get info for checking, start df
+        # Get info for checking, start df and inventory
         col_names, check_info = self._info_archival()
         self.start_df(col_names, self._sess_list, self._subj_list)
+        self.start_inventory(check_info)
 
         # Check for each scan session
         for sess in self._sess_list:
             print(f"\tChecking session : {sess}")
             for step, trip in check_info.items():
                 search_path, search_str, num_exp = trip
-                self.multi_chk(
-                    sess,
-                    step,
-                    search_path,
-                    search_str,
-                    self._subj_list,
-                    num_exp,
+                self.inventory_chk(
+                    sess, step, search_path, search_str, num_exp
                 )
 
     def _info_archival(self) -> Tuple[list, dict]:
@@ -597,17 +838,14 @@ class CheckEmorepComplete(build_reports.DemoAll, report_helper.AddStatus):
         # Get surveys, check for subj in each survey
         self._load_surveys()
         for col_name, df in self._df_dict.items():
-            for subj in self._subj_list:
-                cell_value = (
-                    "comp" if subj in df["study_id"].to_list() else np.NaN
-                )
+            cell_values = pd.Series(
+                "comp", index=self.df_check.index, dtype=object
+            ).where(self.df_check["subid"].isin(set(df["study_id"])))
 
-                # Account for subj status change, update df
-                cell_value = self._status_check(
-                    subj, col_name.split("_")[0], cell_value
-                )
-                idx_subj_check = self._idx_check(subj)
-                self.df_check.loc[idx_subj_check, col_name] = cell_value
+            # Account for subj status change, update df
+            self.df_check[col_name] = self._status_override(
+                cell_values, col_name.split("_")[0]
+            )
 
     def _load_surveys(self):
         """Load cleaned surveys as chunks in a dict."""
@@ -630,74 +868,73 @@ class CheckEmorepComplete(build_reports.DemoAll, report_helper.AddStatus):
                     file_path
                 )
 
-    def _idx_check(self, subj) -> int:
-        """Return index of participant in df_check."""
-        return self.df_check.index[self.df_check["subid"] == subj].to_list()[0]
+    def _status_override(
+        self, cell_values: pd.Series, visit: str
+    ) -> pd.Series:
+        """Replace cell values of participants not enrolled for visit.
+
+        Visit status is aligned to df_check via a single merge with
+        _df_demo, excluded/lost/withdrew statuses replace the cell value
+        with their abbreviation, and pilot participants are marked.
 
-    def _status_check(
-        self, subj: str, visit: str, cell_value: Union[str, int, float]
-    ) -> Union[str, int, float]:
-        """Check if participant does not have enrolled status for visit."""
-        # Get status
-        idx_subj_demo = self._idx_demo(subj)
-        visit_status = self._df_demo.loc[idx_subj_demo, f"{visit}_status"]
+        """
+        if not hasattr(self, "_df_status"):
+            stat_cols = [x for x in self._df_demo.columns if "_status" in x]
+            self._df_status = self.df_check[["subid"]].merge(
+                self._df_demo[["src_subject_id"] + stat_cols],
+                how="left",
+                left_on="subid",
+                right_on="src_subject_id",
+            )
+            self._df_status.index = self.df_check.index
 
         # Update cell value if needed
-        cell_value = (
-            visit_status[:4]
-            if visit_status in ["excluded", "lost", "withdrew"]
-            else cell_value
+        visit_status = self._df_status[f"{visit}_status"]
+        cell_values = cell_values.where(
+            ~visit_status.isin(["excluded", "lost", "withdrew"]),
+            visit_status.str[:4],
         )
 
         # Account for pilot participants
-        cell_value = self._pilot_check(subj, cell_value)
-        return cell_value
-
-    def _pilot_check(
-        self, subj: str, cell_value: Union[str, int, float]
-    ) -> Union[str, int, float]:
-        """Determine which participants were pilots."""
-        cell_value = (
-            "pilot"
-            if subj in ["ER0001", "ER0002", "ER0003", "ER0004", "ER0005"]
-            else cell_value
+        return cell_values.where(
+            ~self.df_check["subid"].isin(
+                ["ER0001", "ER0002", "ER0003", "ER0004", "ER0005"]
+            ),
+            "pilot",
         )
-        return cell_value
-
-    def _idx_demo(self, subj) -> int:
-        """Return index of participant in df_demo."""
-        return self._df_demo.index[
-            self._df_demo["src_subject_id"] == subj
-        ].to_list()[0]
 
     def _compare_scanner(self, visit: str):
         """Compare encountered data from scanner to expected."""
         if visit not in ["visit2", "visit3"]:
             raise ValueError("Unexpected visit value.")
 
-        # Find existing scanner files
+        # Find existing scanner files, count per participant
         print(f"\tChecking scanner files for visit : {visit}")
-        scan_dict = self._find_scanner(visit)
+        df_scan = self._find_scanner(visit)
+        df_count = df_scan.groupby(["data_type", "subj"]).size()
         for data_type, ref_count in self._ref_dict[visit]["scanner"].items():
             key_name = f"{visit}_scanner_{data_type}"
 
             # Check that each participant has expected files
-            for subj in self._subj_list:
-                idx_subj_check = self._idx_check(subj)
-                subj_count = sum(subj in x for x in scan_dict[key_name])
-                if subj_count:
-                    cell_value = (
-                        "comp" if subj_count in ref_count else subj_count
-                    )
-                else:
-                    cell_value = np.NaN
+            count_dict = (
+                df_count[data_type].to_dict() if data_type in df_count else {}
+            )
+            subj_count = pd.Series(
+                [count_dict.get(x, np.NaN) for x in self.df_check["subid"]],
+                index=self.df_check.index,
+                dtype=object,
+            )
+            cell_values = subj_count.where(
+                ~subj_count.isin(ref_count), "comp"
+            )
 
-                # Account for enrollment status
-                cell_value = self._status_check(subj, visit, cell_value)
-                self.df_check.loc[idx_subj_check, key_name] = cell_value
+            # Account for enrollment status
+            self.df_check[key_name] = self._status_override(
+                cell_values, visit
+            )
 
-    def _find_scanner(self, visit: str) -> dict:
-        """Return dict of paths to scanner files."""
+    def _find_scanner(self, visit: str) -> pd.DataFrame:
+        """Return dataframe of subj, data_type for scanner files."""
         if visit not in ["visit2", "visit3"]:
             raise ValueError("Unexpected visit value.")
 
@@ -709,18 +946,18 @@ class CheckEmorepComplete(build_reports.DemoAll, report_helper.AddStatus):
             "phys": "phys/*physio.txt",
             "task": "func/*task*_events.tsv",
         }
-        raw_dir = os.path.join(self._proj_dir, "data_scanner_BIDS/rawdata")
+        bids_dir = os.path.join(self._proj_dir, "data_scanner_BIDS")
+        raw_dir = os.path.join(bids_dir, "rawdata")
+        bids_cat = file_catalog.get_catalog(bids_dir)
 
-        # Find all scanner files, populate dict
-        scan_dict = {}
+        # Find all scanner files, parse participant from file name
+        rec_list = []
         for data_type in self._ref_dict[visit]["scanner"]:
             search_file = dt_switch[data_type]
-            scan_dict[f"{visit}_scanner_{data_type}"] = [
-                os.path.basename(x)
-                for x in sorted(
-                    glob.glob(
-                        f"{raw_dir}/sub-*/ses-day{visit[-1]}/{search_file}"
-                    )
+            rec_list += [
+                (data_type, os.path.basename(x).split("_")[0][4:])
+                for x in bids_cat.glob(
+                    f"{raw_dir}/sub-*/ses-day{visit[-1]}/{search_file}"
                 )
             ]
-        return scan_dict
+        return pd.DataFrame(rec_list, columns=["data_type", "subj"])
@@ -0,0 +1,438 @@
+"""Persistent on-disk catalog of BIDS project files.
+
+FileCatalog : sqlite-backed index of rawdata, sourcedata, derivatives
+get_catalog : return shared FileCatalog instance for BIDS directory
+
+"""
+
+import os
+import re
+import glob
+import sqlite3
+import hashlib
+import threading
+from typing import Union
+from contextlib import contextmanager
+from make_reports.resources import report_helper
+
+
+class FileCatalog:
+    """Maintain a persistent catalog of BIDS project files.
+
+    Index the rawdata, sourcedata, and derivatives trees of a BIDS
+    directory in a local sqlite database, keyed by path and storing
+    size and mtime. Refreshes are incremental: a directory is only
+    re-listed when its mtime has changed since the last refresh, so
+    subsequent runs avoid re-walking the (network-mounted) tree and
+    glob-style lookups become indexed queries.
+
+    Parameters
+    ----------
+    bids_dir : str, os.PathLike
+        Location of BIDS directory, parent of rawdata, sourcedata,
+        and derivatives
+    catalog_dir : str, os.PathLike, optional
+        Location for catalog database, defaults to
+        $MAKE_REPORTS_CATALOG or ~/.cache/make_reports
+
+    Attributes
+    ----------
+    db_path : str
+        Location of catalog sqlite database
+    changed_paths : list
+        Paths added, removed, or modified during the last refresh
+
+    Methods
+    -------
+    refresh(full=False, root=None)
+        Update catalog with directories changed since last refresh
+    glob(search_str)
+        Return sorted catalog paths matching glob pattern
+    dir_counts(search_str)
+        Return number and first of files matching pattern, by directory
+    exists(file_path)
+        Return whether path is in catalog
+    getmtime(file_path)
+        Return catalogued mtime of path
+    entries(search_dir)
+        Return (path, mtime, is_dir) of all entries below directory
+
+    Notes
+    -----
+    Directory mtimes only change when direct entries are added,
+    removed, or renamed. Files modified in place keep their catalogued
+    size and mtime until a refresh with full=True. Callers reporting
+    file dates (e.g. check_data.CheckMri) therefore stat the reported
+    files directly.
+
+    Lookups refresh only the subtree below the literal (wildcard-free)
+    directory prefix of their pattern, once per instance, so small
+    lookups do not walk the whole project.
+
+    Example
+    -------
+    bids_cat = file_catalog.FileCatalog("/path/to/data_scanner_BIDS")
+    bids_cat.refresh()
+    nii_list = bids_cat.glob(
+        "/path/to/data_scanner_BIDS/rawdata/sub-*/ses-*/func/*.nii.gz"
+    )
+
+    """
+
+    _sub_dirs = ["rawdata", "sourcedata", "derivatives"]
+
+    def __init__(self, bids_dir, catalog_dir=None):
+        """Initialize."""
+        self._bids_dir = os.path.abspath(bids_dir)
+        if not catalog_dir:
+            catalog_dir = os.environ.get(
+                "MAKE_REPORTS_CATALOG",
+                os.path.join(os.path.expanduser("~"), ".cache/make_reports"),
+            )
+        os.makedirs(catalog_dir, exist_ok=True)
+        bids_hash = hashlib.md5(self._bids_dir.encode()).hexdigest()[:12]
+        self.db_path = os.path.join(
+            catalog_dir, f"file_catalog_{bids_hash}.db"
+        )
+        self._refreshed = set()
+        self._lock = threading.Lock()
+        self._make_tables()
+
+    def __getstate__(self):
+        """Drop lock when pickling for worker processes."""
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        """Restore lock after unpickling."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _connect(self):
+        """Yield connection, commit on success."""
+        conn = sqlite3.connect(self.db_path, timeout=60)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _make_tables(self):
+        """Create catalog tables if needed."""
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                create table if not exists dirs (
+                    path text primary key,
+                    parent text,
+                    mtime real,
+                    mtime_ns integer
+                );
+                create table if not exists files (
+                    path text primary key,
+                    dir text,
+                    size integer,
+                    mtime real
+                );
+                create index if not exists idx_dirs_parent on dirs(parent);
+                create index if not exists idx_files_dir on files(dir);
+                """
+            )
+
+    def refresh(
+        self, full: bool = False, root: Union[str, os.PathLike] = None
+    ) -> int:
+        """Update catalog with directories changed since last refresh.
+
+        Parameters
+        ----------
+        full : bool, optional
+            Re-list every directory regardless of mtime
+        root : str, os.PathLike, optional
+            Refresh only this directory and its subdirectories,
+            defaults to rawdata, sourcedata, and derivatives
+
+        Returns
+        -------
+        int
+            Number of directories re-listed
+
+        Attributes
+        ----------
+        changed_paths : list
+            Paths added, removed, or modified during the refresh
+
+        """
+        if root:
+            root_list = [os.path.normpath(str(root))]
+        else:
+            root_list = [
+                os.path.join(self._bids_dir, x) for x in self._sub_dirs
+            ]
+        print(f"\tRefreshing file catalog : {', '.join(root_list)}")
+        num_changed = 0
+        seen_set = set()
+        self.changed_paths = []
+        with self._connect() as conn:
+            cur = conn.cursor()
+            dir_stack = [(x, os.path.dirname(x)) for x in root_list]
+            while dir_stack:
+                cur_dir, parent = dir_stack.pop()
+                try:
+                    dir_stat = os.stat(cur_dir)
+                except (FileNotFoundError, PermissionError):
+                    continue
+                seen_set.add(cur_dir)
+
+                # Descend via known children when directory is unchanged
+                row = cur.execute(
+                    "select mtime_ns from dirs where path = ?", (cur_dir,)
+                ).fetchone()
+                if not full and row and row[0] == dir_stat.st_mtime_ns:
+                    dir_stack.extend(
+                        (x[0], cur_dir)
+                        for x in cur.execute(
+                            "select path from dirs where parent = ?",
+                            (cur_dir,),
+                        )
+                    )
+                    continue
+
+                # Re-list changed directory, record changed entries
+                num_changed += 1
+                file_list, sub_list = self._list_dir(cur_dir)
+                old_dict = {
+                    x[0]: x[1:]
+                    for x in cur.execute(
+                        "select path, size, mtime from files where dir = ?",
+                        (cur_dir,),
+                    )
+                }
+                new_dict = {x[0]: x[2:] for x in file_list}
+                old_subs = {
+                    x[0]
+                    for x in cur.execute(
+                        "select path from dirs where parent = ?", (cur_dir,)
+                    )
+                }
+                self.changed_paths += [
+                    x
+                    for x in old_dict.keys() | new_dict.keys()
+                    if old_dict.get(x) != new_dict.get(x)
+                ]
+                self.changed_paths += list(old_subs ^ set(sub_list))
+                cur.execute("delete from files where dir = ?", (cur_dir,))
+                cur.executemany(
+                    "insert or replace into files values (?, ?, ?, ?)",
+                    file_list,
+                )
+                cur.execute(
+                    "insert or replace into dirs values (?, ?, ?, ?)",
+                    (
+                        cur_dir,
+                        parent,
+                        dir_stat.st_mtime,
+                        dir_stat.st_mtime_ns,
+                    ),
+                )
+                dir_stack.extend((x, cur_dir) for x in sub_list)
+
+            # Remove directories (and their files) of refreshed trees
+            # no longer on disk
+            gone_list = [
+                (x[0],)
+                for x in cur.execute("select path from dirs").fetchall()
+                if x[0] not in seen_set and self._under(x[0], root_list)
+            ]
+            cur.executemany("delete from files where dir = ?", gone_list)
+            cur.executemany("delete from dirs where path = ?", gone_list)
+            self.changed_paths += [x[0] for x in gone_list]
+        print(f"\t\tRe-listed {num_changed} directories")
+        self._refreshed.update(root_list)
+        return num_changed
+
+    @staticmethod
+    def _under(path: str, root_list: list) -> bool:
+        """Check whether path is, or is below, a directory of root_list."""
+        return any(path == x or path.startswith(x + "/") for x in root_list)
+
+    def _list_dir(self, cur_dir: Union[str, os.PathLike]) -> tuple:
+        """Return file records and subdirectory paths of cur_dir."""
+        file_list = []
+        sub_list = []
+        try:
+            with os.scandir(cur_dir) as dir_iter:
+                ent_list = list(dir_iter)
+        except (FileNotFoundError, PermissionError, NotADirectoryError):
+            return file_list, sub_list
+        for ent in ent_list:
+            try:
+                if ent.is_dir():
+                    sub_list.append(ent.path)
+                    continue
+                ent_stat = ent.stat()
+            except (FileNotFoundError, PermissionError):
+                continue
+            file_list.append(
+                (ent.path, cur_dir, ent_stat.st_size, ent_stat.st_mtime)
+            )
+        return file_list, sub_list
+
+    def _auto_refresh(self, search_str: str):
+        """Refresh subtree of search_str once per instance before lookup.
+
+        The subtree is rooted at the deepest directory of search_str
+        without wildcards, e.g. <bids_dir>/rawdata for
+        <bids_dir>/rawdata/sub-*/ses-*/phys/*acq.
+
+        """
+        lit_str = re.split(r"[*?\[]", str(search_str), maxsplit=1)[0]
+        root = os.path.normpath(lit_str.rsplit("/", 1)[0] or "/")
+        sub_list = [os.path.join(self._bids_dir, x) for x in self._sub_dirs]
+        if not self._under(root, sub_list):
+            if not self._under(self._bids_dir, [root]):
+                return
+            root = None
+        with self._lock:
+            if root and self._under(root, list(self._refreshed)):
+                return
+            if not root and set(sub_list) <= self._refreshed:
+                return
+            self.refresh(root=root)
+
+    def _in_catalog(self, search_str: str) -> bool:
+        """Check whether search_str falls within catalogued trees."""
+        return any(
+            search_str.startswith(os.path.join(self._bids_dir, x) + "/")
+            for x in self._sub_dirs
+        )
+
+    def glob(self, search_str: Union[str, os.PathLike]) -> list:
+        """Return sorted catalog paths matching glob pattern.
+
+        Supports "*", "?", and recursive "**" components. Patterns
+        outside of the catalogued trees fall back to glob.glob.
+
+        Parameters
+        ----------
+        search_str : str, os.PathLike
+            Absolute glob pattern
+
+        Returns
+        -------
+        list
+
+        """
+        search_str = str(search_str)
+        if not self._in_catalog(search_str):
+            return sorted(glob.glob(search_str, recursive=True))
+        self._auto_refresh(search_str)
+
+        # Prefilter with sqlite GLOB (wildcards also match "/"),
+        # then apply exact glob semantics.
+        sql_glob = search_str.replace("**", "*")
+        with self._connect() as conn:
+            path_list = [
+                x[0]
+                for x in conn.execute(
+                    "select path from files where path glob ? "
+                    + "union select path from dirs where path glob ?",
+                    (sql_glob, sql_glob),
+                )
+            ]
+        path_re = re.compile(report_helper.glob_regex(search_str))
+        return sorted(x for x in path_list if path_re.match(x))
+
+    def dir_counts(self, search_str: Union[str, os.PathLike]) -> dict:
+        """Return number and first of files matching pattern, by directory.
+
+        Parameters
+        ----------
+        search_str : str, os.PathLike
+            Absolute glob pattern of files
+
+        Returns
+        -------
+        dict
+            {parent directory: (number of files, first sorted path)}
+
+        """
+        cnt_dict = {}
+        for file_path in self.glob(search_str):
+            file_dir = os.path.dirname(file_path)
+            if file_dir not in cnt_dict:
+                cnt_dict[file_dir] = [0, file_path]
+            cnt_dict[file_dir][0] += 1
+        return {x: tuple(y) for x, y in cnt_dict.items()}
+
+    def exists(self, file_path: Union[str, os.PathLike]) -> bool:
+        """Return whether file or directory path is in catalog."""
+        return self.getmtime(file_path) is not None
+
+    def getmtime(self, file_path: Union[str, os.PathLike]) -> float:
+        """Return catalogued mtime of path, None if not found."""
+        self._auto_refresh(os.path.dirname(str(file_path)) + "/")
+        with self._connect() as conn:
+            row = conn.execute(
+                "select mtime from files where path = ? "
+                + "union all select mtime from dirs where path = ?",
+                (str(file_path), str(file_path)),
+            ).fetchone()
+        return row[0] if row else None
+
+    def entries(self, search_dir: Union[str, os.PathLike]) -> list:
+        """Return (path, mtime, is_dir) of all entries below search_dir.
+
+        Parameters
+        ----------
+        search_dir : str, os.PathLike
+            Catalogued directory
+
+        Returns
+        -------
+        list
+            Tuples of (path, mtime, is_dir), unsorted
+
+        """
+        search_dir = str(search_dir).rstrip("/")
+        self._auto_refresh(search_dir + "/")
+        with self._connect() as conn:
+            ent_list = [
+                (x[0], x[1], False)
+                for x in conn.execute(
+                    "select path, mtime from files where path glob ?",
+                    (f"{search_dir}/*",),
+                )
+            ]
+            ent_list += [
+                (x[0], x[1], True)
+                for x in conn.execute(
+                    "select path, mtime from dirs where path glob ?",
+                    (f"{search_dir}/*",),
+                )
+            ]
+        return ent_list
+
+
+_CATALOGS = {}
+
+
+def get_catalog(bids_dir: Union[str, os.PathLike]) -> FileCatalog:
+    """Return shared FileCatalog instance for BIDS directory.
+
+    Parameters
+    ----------
+    bids_dir : str, os.PathLike
+        Location of BIDS directory
+
+    Returns
+    -------
+    FileCatalog
+
+    """
+    bids_dir = os.path.abspath(bids_dir)
+    if bids_dir not in _CATALOGS:
+        _CATALOGS[bids_dir] = FileCatalog(bids_dir)
+    return _CATALOGS[bids_dir]
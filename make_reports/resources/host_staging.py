@@ -0,0 +1,348 @@
+"""Stage host files for NDAR upload.
+
+HostStager : link or copy files into ndar_upload, keep a manifest
+    and write-ahead journal
+load_host_manifest : return host manifest of ndar_upload
+save_host_manifest : atomically write host manifest of ndar_upload
+sha256_file : return sha256 hex digest of file
+
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ioctl request number of FICLONE, from linux/fs.h
+_FICLONE = 0x40049409
+
+
+class HostStager:
+    """Stage files into ndar_upload without duplicating data.
+
+    Each file is staged by the first method that succeeds: hardlink,
+    reflink (FICLONE ioctl), os.copy_file_range, or shutil.copyfile.
+    Staging is conducted in a bounded thread pool, and the size,
+    sha256 checksum, and source stats of each staged file are kept in
+    <upload_dir>/host_manifest.json. Files whose manifest entry still
+    matches the source and destination are skipped on re-runs.
+
+    Files are staged to a temporary <host>.part name and renamed into
+    place once complete. Planned, in-progress, and done states are
+    appended to <upload_dir>/host_journal.jsonl, so a run which is
+    interrupted before close() resumes from the journal: done files
+    are kept without re-copying, and partial copies are discarded.
+
+    Parameters
+    ----------
+    upload_dir : str, os.PathLike
+        Location of ndar_upload directory
+    num_threads : int, optional
+        Maximum number of files staged concurrently
+
+    Attributes
+    ----------
+    manifest : dict
+        {relative host path: {src, size, mtime_ns, src_size,
+        src_mtime_ns, sha256, method}}
+
+    Methods
+    -------
+    stage(src_path, host_rel)
+        Submit file for staging at <upload_dir>/<host_rel>
+    close()
+        Wait for submitted files, write manifest, clear journal
+
+    Notes
+    -----
+    Hardlinked host files share an inode with their source, so edits
+    made in place to a source file are also seen in ndar_upload.
+
+    Example
+    -------
+    stager = host_staging.HostStager("/path/to/ndar_upload")
+    stager.stage("/path/to/sub-1_T1w.nii.gz", "data_mri/guid_T1.nii.gz")
+    stager.close()
+
+    """
+
+    def __init__(self, upload_dir, num_threads=4):
+        """Initialize."""
+        self._upload_dir = upload_dir
+        self._journal_path = os.path.join(upload_dir, "host_journal.jsonl")
+        self.manifest = load_host_manifest(upload_dir)
+        self._lock = threading.Lock()
+        self._resume_journal()
+        self._pool = ThreadPoolExecutor(max_workers=num_threads)
+        self._futures = []
+
+    def _resume_journal(self):
+        """Recover state of an interrupted run from the journal.
+
+        Manifest entries of done files are restored, and temporary
+        files of planned or in-progress files are removed.
+
+        """
+        if not os.path.exists(self._journal_path):
+            return
+        state_dict = {}
+        with open(self._journal_path, "r") as jf:
+            for line in jf:
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    # Last line may be truncated by the interruption
+                    continue
+                state_dict[rec["host"]] = rec
+        num_done = 0
+        for host_rel, rec in state_dict.items():
+            if rec["state"] == "done":
+                self.manifest[host_rel] = rec["entry"]
+                num_done += 1
+                continue
+            part_path = os.path.join(self._upload_dir, f"{host_rel}.part")
+            if os.path.exists(part_path):
+                os.remove(part_path)
+        print(
+            f"\tResuming staging journal : {num_done} done, "
+            + f"{len(state_dict) - num_done} incomplete"
+        )
+
+    def _journal(self, host_rel: str, state: str, **kwargs):
+        """Append state record to journal, flush to disk."""
+        rec = {"host": host_rel, "state": state}
+        rec.update(kwargs)
+        with self._lock:
+            os.makedirs(self._upload_dir, exist_ok=True)
+            with open(self._journal_path, "a") as jf:
+                jf.write(json.dumps(rec) + "\n")
+                jf.flush()
+                os.fsync(jf.fileno())
+
+    def stage(self, src_path: Union[str, os.PathLike], host_rel: str):
+        """Submit file for staging.
+
+        Parameters
+        ----------
+        src_path : str, os.PathLike
+            Location of file to host
+        host_rel : str
+            Destination path relative to upload_dir, e.g.
+            data_mri/<guid>_day2_T1_anat.nii.gz
+
+        """
+        self._journal(host_rel, "planned", src=str(src_path))
+        self._futures.append(
+            self._pool.submit(self._stage_file, str(src_path), host_rel)
+        )
+
+    def close(self) -> dict:
+        """Wait for staging to finish, write manifest, clear journal.
+
+        Returns
+        -------
+        dict
+            {method: number of files}
+
+        Raises
+        ------
+        OSError
+            First error encountered while staging, after the
+            manifest of successfully staged files is written. The
+            journal is kept for resuming.
+
+        """
+        self._pool.shutdown(wait=True)
+        stage_err = None
+        meth_count = {}
+        for fut in self._futures:
+            try:
+                meth = fut.result()
+            except OSError as e:
+                stage_err = stage_err or e
+                continue
+            meth_count[meth] = meth_count.get(meth, 0) + 1
+        self._futures = []
+        self._write_manifest()
+        print(f"\tStaged host files : {meth_count}")
+        if stage_err:
+            raise stage_err
+        if os.path.exists(self._journal_path):
+            os.remove(self._journal_path)
+        return meth_count
+
+    def _write_manifest(self):
+        """Atomically write manifest json."""
+        save_host_manifest(self._upload_dir, self.manifest)
+
+    def _is_current(self, host_rel: str, src_stat: os.stat_result) -> bool:
+        """Check whether manifest entry matches source and host file."""
+        with self._lock:
+            entry = self.manifest.get(host_rel)
+        if not entry:
+            return False
+        host_path = os.path.join(self._upload_dir, host_rel)
+        try:
+            host_size = os.stat(host_path).st_size
+        except FileNotFoundError:
+            return False
+        return (
+            entry.get("src_size") == src_stat.st_size
+            and entry.get("src_mtime_ns") == src_stat.st_mtime_ns
+            and entry["size"] == host_size
+        )
+
+    def _stage_file(self, src_path: str, host_rel: str) -> str:
+        """Stage a single file, return staging method."""
+        src_stat = os.stat(src_path)
+        if self._is_current(host_rel, src_stat):
+            with self._lock:
+                entry = self.manifest[host_rel]
+            self._journal(host_rel, "done", entry=entry)
+            return "skip"
+
+        # Adopt host files staged before the manifest existed when they
+        # are the source (hardlink) or have its digest, otherwise
+        # replace stale host file.
+        host_path = os.path.join(self._upload_dir, host_rel)
+        os.makedirs(os.path.dirname(host_path), exist_ok=True)
+        with self._lock:
+            has_entry = host_rel in self.manifest
+        host_sha = None
+        if (
+            not has_entry
+            and os.path.exists(host_path)
+            and os.stat(host_path).st_size == src_stat.st_size
+        ):
+            host_sha = sha256_file(host_path)
+            if not os.path.samefile(src_path, host_path) and (
+                sha256_file(src_path) != host_sha
+            ):
+                host_sha = None
+        if host_sha:
+            meth = "adopt"
+        else:
+            # Stage to temporary name, rename into place when complete
+            self._journal(host_rel, "in_progress", src=src_path)
+            print(f"\t\t\tMaking host file : {host_path}")
+            part_path = f"{host_path}.part"
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            meth = self._link_or_copy(src_path, part_path)
+            os.replace(part_path, host_path)
+
+        # Record manifest entry
+        host_stat = os.stat(host_path)
+        entry = {
+            "src": src_path,
+            "size": host_stat.st_size,
+            "mtime_ns": host_stat.st_mtime_ns,
+            "src_size": src_stat.st_size,
+            "src_mtime_ns": src_stat.st_mtime_ns,
+            "sha256": host_sha if host_sha else sha256_file(host_path),
+            "method": meth,
+        }
+        with self._lock:
+            self.manifest[host_rel] = entry
+        self._journal(host_rel, "done", entry=entry)
+        return meth
+
+    def _link_or_copy(self, src_path: str, host_path: str) -> str:
+        """Hardlink, reflink, or copy src_path, return method used."""
+        try:
+            os.link(src_path, host_path)
+            return "hardlink"
+        except OSError:
+            pass
+
+        with open(src_path, "rb") as src_f, open(host_path, "wb") as dst_f:
+            if fcntl:
+                try:
+                    fcntl.ioctl(dst_f.fileno(), _FICLONE, src_f.fileno())
+                    return "reflink"
+                except OSError:
+                    pass
+            if hasattr(os, "copy_file_range"):
+                try:
+                    num_left = os.fstat(src_f.fileno()).st_size
+                    while num_left > 0:
+                        num_cp = os.copy_file_range(
+                            src_f.fileno(), dst_f.fileno(), num_left
+                        )
+                        if num_cp == 0:
+                            break
+                        num_left -= num_cp
+                    if num_left == 0:
+                        return "copy_file_range"
+                except OSError:
+                    pass
+        shutil.copyfile(src_path, host_path)
+        return "copyfile"
+
+
+def load_host_manifest(upload_dir: Union[str, os.PathLike]) -> dict:
+    """Return <upload_dir>/host_manifest.json, empty when not found.
+
+    Parameters
+    ----------
+    upload_dir : str, os.PathLike
+        Location of ndar_upload directory
+
+    Returns
+    -------
+    dict
+        {relative host path: manifest entry}, see HostStager.manifest
+
+    """
+    manifest_path = os.path.join(upload_dir, "host_manifest.json")
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r") as mf:
+        return json.load(mf)
+
+
+def save_host_manifest(upload_dir: Union[str, os.PathLike], manifest: dict):
+    """Atomically write <upload_dir>/host_manifest.json.
+
+    Parameters
+    ----------
+    upload_dir : str, os.PathLike
+        Location of ndar_upload directory
+    manifest : dict
+        {relative host path: manifest entry}, see HostStager.manifest
+
+    """
+    os.makedirs(upload_dir, exist_ok=True)
+    manifest_path = os.path.join(upload_dir, "host_manifest.json")
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w") as mf:
+        json.dump(manifest, mf, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def sha256_file(file_path: Union[str, os.PathLike]) -> str:
+    """Return sha256 hex digest of file, read in 1 MiB blocks.
+
+    Parameters
+    ----------
+    file_path : str, os.PathLike
+        Location of file
+
+    Returns
+    -------
+    str
+
+    """
+    h_sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for blk in iter(lambda: f.read(1 << 20), b""):
+            h_sha.update(blk)
+    return h_sha.hexdigest()
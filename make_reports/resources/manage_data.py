@@ -16,7 +16,6 @@ GetTask : aggregate and write emorep task responses (in_scan_ratings)
 
 # %%
 import os
-import glob
 from typing import Union, Tuple
 import pandas as pd
 import numpy as np
@@ -25,6 +24,7 @@ from make_reports.resources import survey_download
 from make_reports.resources import survey_clean
 from make_reports.resources import report_helper
 from make_reports.resources import sql_database
+from make_reports.resources import file_catalog
 
 
 # %%
@@ -556,8 +556,9 @@ class GetTask:
         mri_rawdata = os.path.join(
             self._proj_dir, "data_scanner_BIDS", "rawdata"
         )
-        events_all = sorted(
-            glob.glob(f"{mri_rawdata}/sub-*/ses-*/func/*_events.tsv")
+        bids_cat = file_catalog.get_catalog(os.path.dirname(mri_rawdata))
+        events_all = bids_cat.glob(
+            f"{mri_rawdata}/sub-*/ses-*/func/*_events.tsv"
         )
         if not events_all:
             raise ValueError(
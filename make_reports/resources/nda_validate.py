@@ -0,0 +1,167 @@
+"""Validate NDAR reports against NDA definitions before writing.
+
+check_reports : validate reports, raise with all violations
+validate_report : return violations of NDA definitions in a report
+
+Definitions are read from reference_files/nda_definitions.json, where
+"common" elements apply to every report that contains them and
+"<short_name>" elements apply to that report only. Each element may set:
+    -   type : str, [String | Integer | Float | Date]
+    -   required : bool, element must have a value in every row
+    -   size : int, maximum length of String values
+    -   range : list, [minimum, maximum] of Integer or Float values
+    -   values : list, allowed values, or with range additional codes
+            outside of range (e.g. NDA 1::9;88)
+
+"""
+
+import json
+import importlib.resources as pkg_resources
+import pandas as pd
+from make_reports import reference_files
+from make_reports.resources import report_helper
+
+# Example rows listed per violation
+_NUM_EXAMPLE = 3
+
+
+def _load_defs(short_name: str) -> dict:
+    """Return {element: definition} of common and report elements."""
+    with pkg_resources.open_text(
+        reference_files, "nda_definitions.json"
+    ) as jf:
+        defs_all = json.load(jf)
+    defs = dict(defs_all["common"])
+    defs.update(defs_all.get(short_name, {}))
+    return defs
+
+
+def _describe(col: pd.Series, idx_bad: pd.Series, problem: str) -> str:
+    """Return violation message with row count and example values."""
+    df_bad = col[idx_bad.to_numpy()]
+    examples = [
+        f"row {x}: {y}"
+        for x, y in df_bad.head(_NUM_EXAMPLE).items()
+    ]
+    return f"{col.name} : {len(df_bad)} rows {problem} ({', '.join(examples)})"
+
+
+def _check_col(col: pd.Series, col_def: dict) -> list:
+    """Return violations of element definition by report column."""
+    col_str = col.astype(str).str.strip()
+    has_val = col.notna() & ~col_str.isin(["", "nan", "NaN", "<NA>"])
+    msg_list = []
+    if col_def.get("required"):
+        if (~has_val).any():
+            msg_list.append(_describe(col, ~has_val, "missing value"))
+
+    # Check type and size of values that are present
+    col_type = col_def.get("type", "String")
+    val_list = col_def.get("values", [])
+    if col_type in ["Integer", "Float"]:
+        col_num = pd.to_numeric(col.where(has_val), errors="coerce")
+        idx_bad = has_val & col_num.isna()
+        if col_type == "Integer":
+            idx_bad |= has_val & col_num.notna() & (col_num % 1 != 0)
+        if idx_bad.any():
+            msg_list.append(_describe(col, idx_bad, f"not {col_type}"))
+    elif col_type == "Date":
+        col_date = pd.to_datetime(
+            col_str.where(has_val), format="%m/%d/%Y", errors="coerce"
+        )
+        idx_bad = has_val & col_date.isna()
+        if idx_bad.any():
+            msg_list.append(_describe(col, idx_bad, "not Date MM/DD/YYYY"))
+    elif "size" in col_def:
+        idx_long = has_val & (col_str.str.len() > col_def["size"])
+        if idx_long.any():
+            msg_list.append(
+                _describe(col, idx_long, f"longer than {col_def['size']}")
+            )
+
+    # Check range and allowed values, a value is valid when within
+    # range or listed in values (NDA notation 1::9;88)
+    if "range" not in col_def and not val_list:
+        return msg_list
+    if col_type in ["Integer", "Float"]:
+        idx_ok = col_num.isin([float(x) for x in val_list])
+        if "range" in col_def:
+            low, high = col_def["range"]
+            idx_ok |= (col_num >= low) & (col_num <= high)
+        idx_out = col_num.notna() & ~idx_ok
+    else:
+        idx_out = has_val & ~col_str.isin([str(x) for x in val_list])
+    if idx_out.any():
+        range_list = [str(x) for x in val_list]
+        if "range" in col_def:
+            low, high = col_def["range"]
+            range_list.insert(0, f"{low}::{high}")
+        msg_list.append(
+            _describe(col, idx_out, f"not in {';'.join(range_list)}")
+        )
+    return msg_list
+
+
+def validate_report(df_report: pd.DataFrame, nda_label: list) -> list:
+    """Return violations of NDA definitions in a report.
+
+    Report columns are checked against the reference_files template
+    of nda_label, then each column with a definition is checked with
+    vectorized comparisons. All violations are returned rather than
+    stopping at the first.
+
+    Parameters
+    ----------
+    df_report : pd.DataFrame
+        Report built by a build_ndar class
+    nda_label : list
+        NDA report template label, e.g. ["image", "03"]
+
+    Returns
+    -------
+    list
+        Violation messages, empty when the report is valid
+
+    """
+    short_name = "".join(nda_label)
+    _, nda_cols = report_helper.mine_template(f"{short_name}_template.csv")
+    msg_list = []
+    miss_cols = [x for x in nda_cols if x not in df_report.columns]
+    if miss_cols:
+        msg_list.append(f"missing template columns : {miss_cols}")
+    extra_cols = [x for x in df_report.columns if x not in nda_cols]
+    if extra_cols:
+        msg_list.append(f"unexpected columns : {extra_cols}")
+
+    df_check = df_report.reset_index(drop=True)
+    for col_name, col_def in _load_defs(short_name).items():
+        if col_name in df_check.columns:
+            msg_list += _check_col(df_check[col_name], col_def)
+    return msg_list
+
+
+def check_reports(rep_dict: dict):
+    """Validate reports, raise with all violations.
+
+    Parameters
+    ----------
+    rep_dict : dict
+        {report name: (df_report, nda_label)}
+
+    Raises
+    ------
+    ValueError
+        Reports violate NDA definitions
+
+    """
+    msg_list = []
+    for report, (df_report, nda_label) in rep_dict.items():
+        print(f"\tValidating report : {report}")
+        msg_list += [
+            f"{report}.{x}" for x in validate_report(df_report, nda_label)
+        ]
+    if msg_list:
+        raise ValueError(
+            f"Found {len(msg_list)} NDA definition violations :\n\t"
+            + "\n\t".join(msg_list)
+        )
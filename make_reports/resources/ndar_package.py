@@ -0,0 +1,200 @@
+"""Package NDAR submission cycles.
+
+write_package : stream cycle datasets and referenced host files into
+    a compressed tar archive
+
+"""
+
+import os
+import re
+import glob
+import shutil
+import tarfile
+import subprocess
+from typing import Union
+import pandas as pd
+
+# Report columns holding host file references
+_REF_COLS = ["data_file1", "data_file2", "image_file"]
+
+# External compressors, run with all cores and writing to stdout
+_COMPRESS_CMD = {
+    "zstd": ["zstd", "-T0", "-q", "-c"],
+    "gz": ["pigz", "-c"],
+}
+_COMPRESS_EXT = {"zstd": "zst", "gz": "gz"}
+
+_COPY_BUF = 1 << 20
+
+# Report files of a cycle, in order of preference for upload
+_REPORT_RE = re.compile(r"^(.+)_(delta|dataset)\.csv(\.gz)?$")
+_REPORT_PREF = [
+    ("delta", None),
+    ("delta", ".gz"),
+    ("dataset", None),
+    ("dataset", ".gz"),
+]
+
+
+def _host_rel(ref_path: str) -> str:
+    """Return reference path relative to ndar_upload.
+
+    References are either relative (data_mri/<file>) or local paths
+    of the mounted ndar_upload directory.
+
+    """
+    if "ndar_upload/" in ref_path:
+        return ref_path.split("ndar_upload/")[-1]
+    return ref_path.lstrip("/")
+
+
+def _find_refs(data_list: list) -> list:
+    """Return sorted host files referenced by NDA datasets."""
+    ref_set = set()
+    for data_path in data_list:
+        df = pd.read_csv(
+            data_path, skiprows=1, dtype=str, keep_default_na=False
+        )
+        for col in [x for x in _REF_COLS if x in df.columns]:
+            ref_set.update(_host_rel(x) for x in df[col] if x)
+    return sorted(ref_set)
+
+
+def _upload_files(cycle_list: list) -> tuple:
+    """Return cycle files to upload and the report datasets among them.
+
+    Each report is uploaded once: <report>_delta.csv when written in
+    incremental mode, otherwise <report>_dataset.csv, preferring plain
+    over gzip archive copies. Other cycle files are kept.
+
+    """
+    rep_dict = {}
+    keep_list = []
+    for cycle_path in cycle_list:
+        rep_match = _REPORT_RE.match(os.path.basename(cycle_path))
+        if not rep_match:
+            keep_list.append(cycle_path)
+            continue
+        report, kind, gz_ext = rep_match.groups()
+        rep_dict.setdefault(report, {})[(kind, gz_ext)] = cycle_path
+    data_list = [
+        next(y[x] for x in _REPORT_PREF if x in y)
+        for _, y in sorted(rep_dict.items())
+    ]
+    return sorted(keep_list + data_list), data_list
+
+
+def _write_tar(out_f, mode: str, add_list: list):
+    """Stream (source path, archive name) files to tar in out_f."""
+    with tarfile.open(
+        fileobj=out_f, mode=mode, bufsize=_COPY_BUF, copybufsize=_COPY_BUF
+    ) as tar:
+        for src_path, arc_name in add_list:
+            tar.add(src_path, arcname=arc_name, recursive=False)
+
+
+def write_package(
+    upload_dir: Union[str, os.PathLike],
+    cycle_dir: Union[str, os.PathLike],
+    out_file: Union[str, os.PathLike] = None,
+    compress: str = None,
+) -> str:
+    """Stream cycle datasets and referenced host files into an archive.
+
+    Files of cycle_dir and the host files referenced in the data_file1,
+    data_file2, and image_file columns of its datasets are written in a
+    single pass to a tar stream, keeping their ndar_upload layout.
+    Unreferenced host files are not included.
+
+    When a report has <report>_delta.csv (rep_ndar --incremental), the
+    delta is packaged in place of the cumulative dataset, so rows and
+    host files of previous cycles are not uploaded again. Gzip archive
+    copies of reports are packaged only when the plain csv is missing.
+
+    Parameters
+    ----------
+    upload_dir : str, os.PathLike
+        Location of ndar_upload directory
+    cycle_dir : str, os.PathLike
+        Location of ndar_upload/cycle_<close_date>
+    out_file : str, os.PathLike, optional
+        Location of archive, defaults to <cycle_dir>.tar.[zst|gz]
+    compress : str, optional
+        [zstd | gz], defaults to zstd when installed otherwise gz
+
+    Returns
+    -------
+    str
+        Location of archive
+
+    Raises
+    ------
+    FileNotFoundError
+        Datasets not found in cycle_dir, or referenced host files missing
+    ValueError
+        Unexpected compress value, or zstd not installed
+
+    Notes
+    -----
+    Compression with zstd or pigz runs in a separate process using all
+    cores, falling back to in-process gzip when pigz is not installed.
+
+    """
+    # Check compression
+    if not compress:
+        compress = "zstd" if shutil.which("zstd") else "gz"
+    if compress not in _COMPRESS_CMD:
+        raise ValueError(f"Unexpected compress value : {compress}")
+    if compress == "zstd" and not shutil.which("zstd"):
+        raise ValueError("Compression with zstd requires zstd on PATH")
+    cycle_dir = os.path.normpath(cycle_dir)
+    if not out_file:
+        out_file = f"{cycle_dir}.tar.{_COMPRESS_EXT[compress]}"
+
+    # Find cycle files and references
+    cycle_list, data_list = _upload_files(
+        [x for x in glob.glob(f"{cycle_dir}/*") if os.path.isfile(x)]
+    )
+    if not data_list:
+        raise FileNotFoundError(f"Expected to find datasets in : {cycle_dir}")
+    ref_list = _find_refs(data_list)
+    miss_list = [
+        x for x in ref_list if not os.path.isfile(os.path.join(upload_dir, x))
+    ]
+    if miss_list:
+        raise FileNotFoundError(
+            f"Missing {len(miss_list)} referenced host files : {miss_list}"
+        )
+    print(
+        f"\tPackaging {len(cycle_list)} cycle files and "
+        + f"{len(ref_list)} host files : {out_file}"
+    )
+
+    # Stream tar into compressor, rename archive into place when complete
+    add_list = [
+        (x, os.path.join(os.path.basename(cycle_dir), os.path.basename(x)))
+        for x in cycle_list
+    ] + [(os.path.join(upload_dir, x), x) for x in ref_list]
+    part_file = f"{out_file}.part"
+    cmd = _COMPRESS_CMD[compress]
+    try:
+        with open(part_file, "wb") as out_f:
+            if shutil.which(cmd[0]):
+                proc = subprocess.Popen(
+                    cmd, stdin=subprocess.PIPE, stdout=out_f
+                )
+                try:
+                    _write_tar(proc.stdin, "w|", add_list)
+                finally:
+                    proc.stdin.close()
+                    proc.wait()
+                if proc.returncode:
+                    raise subprocess.CalledProcessError(proc.returncode, cmd)
+            else:
+                _write_tar(out_f, "w|gz", add_list)
+    except BaseException:
+        os.remove(part_file)
+        raise
+    os.replace(part_file, out_file)
+    print(f"\tWrote : {out_file}")
+    return out_file
@@ -0,0 +1,251 @@
+"""Append-only history of pipeline progress snapshots.
+
+ProgressHistory : record df_mri, df_check snapshots, query trends
+
+"""
+
+import sqlite3
+import pandas as pd
+from datetime import date, timedelta
+from typing import Union
+from contextlib import contextmanager
+
+
+class ProgressHistory:
+    """Record pipeline progress snapshots and query trends.
+
+    Snapshots of CheckMri.df_mri or CheckEmorepComplete.df_check are
+    stored in long format as (project, subid, sess, step, value,
+    run_date) rows in a sqlite database. Only cells whose value differs
+    from the latest recorded value are appended, so the store grows
+    with changes rather than with runs, and past states can be queried
+    without re-scanning the project directories.
+
+    Parameters
+    ----------
+    db_path : str, os.PathLike
+        Location of history sqlite database
+
+    Methods
+    -------
+    record(df, project, run_date=None)
+        Append changed cells of progress snapshot
+    history(project)
+        Return all recorded changes of project
+    latest(project)
+        Return most recent value of each cell
+    throughput(project, freq="W")
+        Return number of cells reaching completion per period and step
+    stalls(project, days=14, as_of=None)
+        Return partially complete cells unchanged for days
+
+    Example
+    -------
+    prog_hist = progress_history.ProgressHistory(
+        "/path/to/track_data/progress_history.db"
+    )
+    prog_hist.record(chk_data.df_mri, "emorep")
+    df_week = prog_hist.throughput("emorep")
+
+    """
+
+    _id_cols = ["subid", "sess"]
+
+    def __init__(self, db_path):
+        """Initialize."""
+        self._db_path = db_path
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                create table if not exists progress (
+                    project text,
+                    subid text,
+                    sess text,
+                    step text,
+                    value text,
+                    run_date text
+                );
+                create index if not exists idx_progress_project
+                    on progress(project);
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        """Yield connection, commit on success."""
+        conn = sqlite3.connect(self._db_path, timeout=60)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def record(
+        self,
+        df: pd.DataFrame,
+        project: str,
+        run_date: Union[str, date, None] = None,
+    ) -> int:
+        """Append changed cells of a progress snapshot.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Wide progress dataframe with column subid and optionally
+            sess, all other columns are treated as steps
+        project : str
+            Project or check name, e.g. emorep, archival
+        run_date : str, datetime.date, optional
+            Snapshot date, defaults to today
+
+        Returns
+        -------
+        int
+            Number of changed cells appended
+
+        """
+        if "subid" not in df.columns:
+            raise KeyError("Expected dataframe to contain column : subid")
+        run_date = str(run_date) if run_date else date.today().isoformat()
+
+        # Make long snapshot, empty string for missing values
+        df_snap = df.copy()
+        if "sess" not in df_snap.columns:
+            df_snap["sess"] = ""
+        df_snap = df_snap.melt(
+            id_vars=self._id_cols, var_name="step", value_name="value"
+        )
+        df_snap["value"] = df_snap["value"].map(
+            lambda x: "" if pd.isna(x) else str(x)
+        )
+
+        # Keep cells which differ from latest value
+        key_cols = self._id_cols + ["step"]
+        df_prev = self.latest(project)
+        df_snap = df_snap.merge(
+            df_prev[key_cols + ["value"]],
+            how="left",
+            on=key_cols,
+            suffixes=("", "_prev"),
+        )
+        df_new = df_snap.loc[
+            df_snap["value"] != df_snap["value_prev"].fillna("")
+        ]
+        df_new = df_new.loc[
+            df_new["value_prev"].notna() | (df_new["value"] != "")
+        ]
+
+        # Append changed cells
+        with self._connect() as conn:
+            conn.executemany(
+                "insert into progress values (?, ?, ?, ?, ?, ?)",
+                [
+                    (project, subid, sess, step, value, run_date)
+                    for subid, sess, step, value in zip(
+                        df_new["subid"],
+                        df_new["sess"],
+                        df_new["step"],
+                        df_new["value"],
+                    )
+                ],
+            )
+        print(f"\tRecorded {len(df_new)} changed cells for {project}")
+        return len(df_new)
+
+    def history(self, project: str) -> pd.DataFrame:
+        """Return all recorded changes of project, in recorded order.
+
+        Rows are ordered by run_date, then insertion (rowid), so cells
+        recorded several times on one run_date end with the latest.
+
+        """
+        with self._connect() as conn:
+            df_hist = pd.read_sql_query(
+                "select * from progress where project = ? "
+                + "order by run_date, rowid",
+                conn,
+                params=(project,),
+            )
+        df_hist["run_date"] = pd.to_datetime(df_hist["run_date"])
+        return df_hist
+
+    def latest(self, project: str) -> pd.DataFrame:
+        """Return most recent value and run_date of each cell."""
+        return (
+            self.history(project)
+            .groupby(self._id_cols + ["step"], as_index=False)
+            .last()
+        )
+
+    def _is_complete(self, values: pd.Series) -> pd.Series:
+        """Flag datetime (df_mri) and comp (df_check) values."""
+        return values.str.match(r"^\d{4}-\d{2}-\d{2}$") | (values == "comp")
+
+    def throughput(self, project: str, freq: str = "W") -> pd.DataFrame:
+        """Return number of cells reaching completion per period, step.
+
+        Parameters
+        ----------
+        project : str
+            Project or check name
+        freq : str, optional
+            Pandas period alias, e.g. W, M
+
+        Returns
+        -------
+        pd.DataFrame
+            Period as index, steps as columns, counts of
+            subject * session cells reaching completion, dated by
+            the cell value (df_mri) or the first complete run_date
+
+        """
+        df_hist = self.history(project)
+        df_comp = df_hist.loc[self._is_complete(df_hist["value"])]
+        df_comp = df_comp.groupby(
+            self._id_cols + ["step"], as_index=False
+        ).first()
+        comp_date = pd.to_datetime(df_comp["value"], errors="coerce")
+        df_comp["period"] = comp_date.fillna(df_comp["run_date"]).dt.to_period(
+            freq
+        )
+        return (
+            df_comp.groupby(["period", "step"])
+            .size()
+            .unstack(fill_value=0)
+            .sort_index()
+        )
+
+    def stalls(
+        self,
+        project: str,
+        days: int = 14,
+        as_of: Union[str, date, None] = None,
+    ) -> pd.DataFrame:
+        """Return partially complete cells unchanged for days.
+
+        Parameters
+        ----------
+        project : str
+            Project or check name
+        days : int, optional
+            Minimum days since the cell last changed
+        as_of : str, datetime.date, optional
+            Reference date, defaults to today
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns subid, sess, step, value, run_date, days_stalled
+
+        """
+        as_of = pd.Timestamp(as_of if as_of else date.today())
+        df_last = self.latest(project)
+        df_stall = df_last.loc[
+            (df_last["value"] != "")
+            & ~self._is_complete(df_last["value"])
+            & (df_last["run_date"] <= as_of - timedelta(days=days))
+        ].copy()
+        df_stall["days_stalled"] = (as_of - df_stall["run_date"]).dt.days
+        return df_stall[
+            self._id_cols + ["step", "value", "run_date", "days_stalled"]
+        ].reset_index(drop=True)
@@ -7,12 +7,17 @@ check_sql_pass : check for mysql db_emorep password
 pull_redcap_data : download survey data from REDCAP
 pull_qualtrics_data : download survey data from Qualtrics
 mine_template : extract values from NDA templates
+survey_specs : list NDA survey report specs
+load_spec : load NDA survey report spec
+write_nda_report : write NDA label and dataset in a single pass
 load_dataframes : load resources dataframes/track_foo.csv
 calc_age_mo : calculate age-in-months
 get_survey_age : add survey age to dataframe
+glob_regex : convert glob pattern to regex
 pilot_list : pilot participants
 redcap_dict : REDCAP survey mappings
 qualtrics_dict : Qualtrics survey mappings
+ReportAccumulator : collect report records, build dataframe once
 CheckIncomplete : TODO
 CheckStatus : Make participant status change available for use
 ParticipantComplete : deprecated, track participant, data completion status
@@ -21,15 +26,19 @@ AddStatus : deprecated, add participant complete status to dataframe
 """
 
 import os
+import re
 import sys
 import io
 import requests
 import json
 import csv
+import gzip
+import shutil
 import zipfile
 import pandas as pd
 import numpy as np
 import importlib.resources as pkg_resources
+from typing import Union
 from make_reports.resources import survey_download
 from make_reports import reference_files, dataframes
 
@@ -252,6 +261,90 @@ def mine_template(template_file):
     return (row_info[0], row_info[1])
 
 
+def survey_specs() -> list:
+    """Return names of NDA reports with a reference_files spec.
+
+    Specs are named <report>_spec.json, e.g. affim01_spec.json.
+
+    """
+    return sorted(
+        x[: -len("_spec.json")]
+        for x in pkg_resources.contents(reference_files)
+        if x.endswith("_spec.json")
+    )
+
+
+def load_spec(report: str) -> dict:
+    """Return NDA survey report spec from reference_files.
+
+    Parameters
+    ----------
+    report : str
+        NDA report name, e.g. affim01
+
+    Returns
+    -------
+    dict
+
+    Raises
+    ------
+    FileNotFoundError
+        Missing <report>_spec.json
+
+    """
+    spec_file = f"{report}_spec.json"
+    if not pkg_resources.is_resource(reference_files, spec_file):
+        raise FileNotFoundError(f"Expected to find spec : {spec_file}")
+    with pkg_resources.open_text(reference_files, spec_file) as sf:
+        return json.load(sf)
+
+
+def write_nda_report(
+    df: pd.DataFrame,
+    nda_label: list,
+    out_file: Union[str, os.PathLike],
+    compress: bool = False,
+) -> str:
+    """Write NDA label and dataset in a single pass.
+
+    The label row and dataframe are streamed to a temporary file
+    which is renamed to out_file once complete. The plain csv is
+    always written, as required by the NDA validation tool.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        NDA report
+    nda_label : list
+        NDA report template label, e.g. [image, 03]
+    out_file : str, os.PathLike
+        Location of output csv
+    compress : bool, optional
+        Also write a gzip-compressed archive copy, appending ".gz"
+        to out_file
+
+    Returns
+    -------
+    str
+        Location of written csv
+
+    """
+    out_file = str(out_file)
+    tmp_file = f"{out_file}.tmp"
+    with open(tmp_file, "w", newline="") as wf:
+        wf.write(f"{','.join(nda_label)}\n")
+        df.to_csv(wf, index=False, na_rep="")
+    os.replace(tmp_file, out_file)
+    if compress:
+        gz_file = f"{out_file}.gz"
+        with open(out_file, "rb") as rf, gzip.open(
+            f"{gz_file}.tmp", "wb"
+        ) as wf:
+            shutil.copyfileobj(rf, wf, 1 << 20)
+        os.replace(f"{gz_file}.tmp", gz_file)
+    return out_file
+
+
 def load_dataframes(name: str) -> pd.DataFrame:
     """Return df from resources."""
     if name not in ["status", "incomplete"]:
@@ -268,49 +361,70 @@ def calc_age_mo(subj_dob, subj_dos):
 
     Convert each participant's age at consent into
     age in months. Account for partial years and months.
+    Calculated over whole arrays of dates rather than
+    per participant.
 
     Parameters
     ----------
-    subj_dob : list
+    subj_dob : list, pd.Series
         Subjects' date-of-birth datetimes
-    subj_dos : list
+    subj_dos : list, pd.Series
         Subjects' date-of-survey datetimes
 
     Returns
     -------
     list
-        Participant ages in months (int)
+        Participant ages in months (int), np.NaN for
+        missing dates
 
     """
-    subj_age_mo = []
-    for dob, dos in zip(subj_dob, subj_dos):
-        # Calculate years, months, and days
-        num_years = dos.year - dob.year
-        num_months = dos.month - dob.month
-        num_days = dos.day - dob.day
-
-        # Adjust for day-month wrap around
-        if num_days < 0:
-            num_days += 30
-
-        # Avoid including current partial month
-        if dos.day < dob.day:
-            num_months -= 1
-
-        # Adjust including current partial year
-        while num_months < 0:
-            num_months += 12
-            num_years -= 1
-
-        # Add month if participant is older than num_months
-        # plus 15 days.
-        if num_days >= 15:
-            num_months += 1
+    if len(subj_dob) != len(subj_dos):
+        raise ValueError("Length of subj DOB does not match subj DOS.")
+    dob = pd.to_datetime(pd.Series(subj_dob), cache=False).to_numpy(
+        "datetime64[ns]"
+    )
+    dos = pd.to_datetime(pd.Series(subj_dos), cache=False).to_numpy(
+        "datetime64[ns]"
+    )
 
-        # Convert all to months, add to list
-        total_months = (12 * num_years) + num_months
-        subj_age_mo.append(total_months)
-    return subj_age_mo
+    # Calculate years, months, and days
+    dob_y, dob_m, dob_d = _split_date(dob)
+    dos_y, dos_m, dos_d = _split_date(dos)
+    num_years = dos_y - dob_y
+    num_months = dos_m - dob_m
+    num_days = dos_d - dob_d
+
+    # Adjust for day-month wrap around, avoid including
+    # current partial month.
+    part_month = num_days < 0
+    num_days = np.where(part_month, num_days + 30, num_days)
+    num_months = num_months - part_month
+
+    # Adjust including current partial year
+    num_years = num_years - (num_months < 0)
+    num_months = np.mod(num_months, 12)
+
+    # Add month if participant is older than num_months
+    # plus 15 days.
+    num_months = num_months + (num_days >= 15)
+
+    # Convert all to months, missing dates to NaN
+    total_months = ((12 * num_years) + num_months).tolist()
+    miss_idx = np.flatnonzero(np.isnat(dob) | np.isnat(dos))
+    for idx in miss_idx:
+        total_months[idx] = np.NaN
+    return total_months
+
+
+def _split_date(date_arr: np.ndarray) -> tuple:
+    """Return year, month, day int arrays of datetime64 array."""
+    arr_y = date_arr.astype("datetime64[Y]")
+    arr_m = date_arr.astype("datetime64[M]")
+    return (
+        arr_y.astype(np.int64) + 1970,
+        (arr_m - arr_y).astype(np.int64) + 1,
+        (date_arr.astype("datetime64[D]") - arr_m).astype(np.int64) + 1,
+    )
 
 
 def get_survey_age(df_survey, df_demo, subj_col):
@@ -334,19 +448,26 @@ def get_survey_age(df_survey, df_demo, subj_col):
     """
     # Extract survey datetime info
     df_survey["datetime"] = pd.to_datetime(df_survey["datetime"])
-    subj_survey = df_survey[subj_col].tolist()
-    subj_dos = df_survey["datetime"].tolist()
+    subj_dos = df_survey["datetime"]
 
-    # Extract date-of-birth info for participants in survey
+    # Join date-of-birth to each survey row by participant
     df_demo["dob"] = pd.to_datetime(df_demo["dob"])
-    idx_demo = df_demo[
-        df_demo["src_subject_id"].isin(subj_survey)
-    ].index.tolist()
-    subj_dob = df_demo.loc[idx_demo, "dob"].tolist()
+    df_dob = df_demo[["src_subject_id", "dob"]].drop_duplicates(
+        subset="src_subject_id"
+    )
+    df_dob = df_dob.rename(columns={"src_subject_id": "_dob_subj"})
+    subj_dob = (
+        df_survey[[subj_col]]
+        .merge(df_dob, how="left", left_on=subj_col, right_on="_dob_subj")
+        .loc[:, "dob"]
+    )
 
-    # Check that lists match
-    if len(subj_dob) != len(subj_dos):
-        raise IndexError("Length of subj DOB does not match subj DOS.")
+    # Check that all participants have a DOB
+    if subj_dob.isna().any():
+        miss_list = df_survey.loc[subj_dob.isna().to_numpy(), subj_col]
+        raise KeyError(
+            f"DOB not found in df_demo for : {miss_list.unique().tolist()}"
+        )
 
     # Calculate age-in-months, update dataframe
     subj_age_mo = calc_age_mo(subj_dob, subj_dos)
@@ -356,6 +477,46 @@ def get_survey_age(df_survey, df_demo, subj_col):
     return df_survey
 
 
+def glob_regex(search_str):
+    """Convert a glob pattern into an equivalent regex.
+
+    Supports "*", "?", and recursive "**" path components. As with
+    glob.glob, wildcards do not match "/" or a leading ".".
+
+    Parameters
+    ----------
+    search_str : str
+        Glob pattern, e.g. "func/*events.tsv"
+
+    Returns
+    -------
+    str
+
+    """
+    seg_list = search_str.split("/")
+    path_re = ""
+    for idx, seg in enumerate(seg_list):
+        is_last = idx == len(seg_list) - 1
+
+        # Inner "**" matches zero or more directories and their "/",
+        # trailing "**" matches one or more path components.
+        if seg == "**":
+            path_re += (
+                r"(?!\.)[^/]+(?:/(?!\.)[^/]+)*"
+                if is_last
+                else r"(?:(?!\.)[^/]+/)*"
+            )
+            continue
+        seg_re = "".join(
+            "[^/]*" if x == "*" else "[^/]" if x == "?" else re.escape(x)
+            for x in seg
+        )
+        if seg[:1] in ["*", "?"]:
+            seg_re = r"(?!\.)" + seg_re
+        path_re += seg_re if is_last else seg_re + "/"
+    return "^" + path_re + "$"
+
+
 def pilot_list() -> list:
     """Return a list of pilot participants."""
     return ["ER0001", "ER0002", "ER0003", "ER0004", "ER0005"]
@@ -391,6 +552,73 @@ def qualtrics_dict() -> dict:
     }
 
 
+class ReportAccumulator:
+    """Collect report records and build a dataframe once.
+
+    Replaces building reports by concatenating one-row dataframes,
+    which copies the report for every record. Records are validated
+    against the expected columns (e.g. NDA template columns from
+    mine_template) as they are added.
+
+    Parameters
+    ----------
+    columns : list
+        Expected report columns, sets output column order
+
+    Methods
+    -------
+    add(record)
+        Validate and append dict record
+    extend(records)
+        Validate and append iterable of dict records
+    to_df()
+        Return dataframe of all records
+
+    Example
+    -------
+    nda_label, nda_cols = report_helper.mine_template("brd01_template.csv")
+    rep_acc = report_helper.ReportAccumulator(nda_cols)
+    rep_acc.add({"src_subject_id": "ER0009", "visit": "2"})
+    df_report = rep_acc.to_df()
+
+    """
+
+    def __init__(self, columns):
+        """Initialize."""
+        self._columns = list(columns)
+        self._col_set = set(self._columns)
+        self._records = []
+
+    def __len__(self):
+        """Return number of records."""
+        return len(self._records)
+
+    def add(self, record: dict):
+        """Validate and append record.
+
+        Raises
+        ------
+        KeyError
+            Record contains keys not found in columns
+
+        """
+        unk_keys = record.keys() - self._col_set
+        if unk_keys:
+            raise KeyError(
+                f"Unexpected report columns : {', '.join(sorted(unk_keys))}"
+            )
+        self._records.append(record)
+
+    def extend(self, records):
+        """Validate and append each record of an iterable."""
+        for record in records:
+            self.add(record)
+
+    def to_df(self) -> pd.DataFrame:
+        """Return dataframe of records, object dtype in column order."""
+        return pd.DataFrame(self._records, columns=self._columns, dtype=object)
+
+
 class CheckIncomplete:
     """Title.
 
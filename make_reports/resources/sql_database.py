@@ -7,6 +7,9 @@ DbUpdate : update db_emorep tables
 
 # %%
 import os
+import re
+import json
+import time
 import pandas as pd
 import numpy as np
 from typing import Type
@@ -23,6 +26,9 @@ class DbConnect:
     ----------
     con : mysql.connector.connection_cext.CMySQLConnection
         Connection object to database
+    insert_stats : list
+        One dict per exec_many call, containing table name, rows
+        submitted, rows inserted, approximate bytes, and seconds
 
     Methods
     -------
@@ -32,6 +38,8 @@ class DbConnect:
         Yield cursor
     exec_many()
         Update mysql db_emorep.tbl_* with multiple values
+    insert_summary()
+        Return per-table summary of exec_many calls
 
     Notes
     -----
@@ -59,6 +67,7 @@ class DbConnect:
             password=os.environ["SQL_PASS"],
             database="db_emorep",
         )
+        self.insert_stats = []
 
     @contextmanager
     def _con_cursor(self):
@@ -70,10 +79,66 @@ class DbConnect:
             db_cursor.close()
 
     def exec_many(self, sql_cmd: str, value_list: list):
-        """Update db_emorep via executemany."""
+        """Update db_emorep via executemany, record insert stats."""
+        start_time = time.perf_counter()
         with self._con_cursor() as con:
             con.executemany(sql_cmd, value_list)
             self.con.commit()
+            row_count = con.rowcount
+        self.insert_stats.append(
+            {
+                "table": self._tbl_name(sql_cmd),
+                "rows_submitted": len(value_list),
+                "rows_inserted": row_count,
+                "bytes": sum(
+                    len(str(x)) for row in value_list for x in row
+                ),
+                "seconds": round(time.perf_counter() - start_time, 4),
+            }
+        )
+
+    def _tbl_name(self, sql_cmd: str) -> str:
+        """Return table name targeted by insert command."""
+        tbl_match = re.search(r"into\s+(\w+)", sql_cmd, re.IGNORECASE)
+        return tbl_match.group(1) if tbl_match else "unknown"
+
+    def insert_summary(self) -> list:
+        """Return per-table totals of exec_many calls.
+
+        Returns
+        -------
+        list
+            Dicts of table, calls, rows_submitted, rows_inserted,
+            rows_ignored, bytes, and seconds, sorted by seconds
+            (descending).
+
+        """
+        sum_dict = {}
+        for stat in self.insert_stats:
+            tbl_sum = sum_dict.setdefault(
+                stat["table"],
+                {
+                    "table": stat["table"],
+                    "calls": 0,
+                    "rows_submitted": 0,
+                    "rows_inserted": 0,
+                    "bytes": 0,
+                    "seconds": 0.0,
+                },
+            )
+            tbl_sum["calls"] += 1
+            for key in ["rows_submitted", "rows_inserted", "bytes"]:
+                tbl_sum[key] += stat[key]
+            tbl_sum["seconds"] = round(tbl_sum["seconds"] + stat["seconds"], 4)
+
+        # Insert ignore skips duplicate keys, capture no-op work
+        for tbl_sum in sum_dict.values():
+            tbl_sum["rows_ignored"] = (
+                tbl_sum["rows_submitted"] - tbl_sum["rows_inserted"]
+            )
+        return sorted(
+            sum_dict.values(), key=lambda x: x["seconds"], reverse=True
+        )
 
     def fetch_rows(self, sql_cmd: str) -> list:
         """Return rows from query output."""
@@ -434,7 +499,12 @@ class DbUpdate(_Recipes, _DfManip, _TaskMaps):
     update_db(*args)
         Update appropriate table given args
     close_db()
-        Close connection with mysql server
+        Close connection with mysql server, report insert summary
+
+    Notes
+    -----
+    Per-insert stats are appended as JSON lines to the file specified
+    by close_db(stats_file) or global var 'SQL_INSERT_STATS', when set.
 
     Example
     -------
@@ -505,9 +575,42 @@ class DbUpdate(_Recipes, _DfManip, _TaskMaps):
         up_meth = getattr(self, f"_update_{data_source}")
         up_meth()
 
-    def close_db(self):
-        """Close database connection."""
+    def close_db(self, stats_file=None):
+        """Close database connection, report insert summary.
+
+        Parameters
+        ----------
+        stats_file : str, os.PathLike, optional
+            Location of JSON lines file for appending per-insert
+            stats, defaults to global var 'SQL_INSERT_STATS'
+
+        Returns
+        -------
+        list
+            Per-table summary, see DbConnect.insert_summary
+
+        """
         self._db_con.close_con()
+        tbl_summary = self._db_con.insert_summary()
+        if tbl_summary:
+            print("\tdb_emorep insert summary :")
+            for tbl_sum in tbl_summary:
+                print(
+                    f"\t\t{tbl_sum['table']} : "
+                    + f"{tbl_sum['rows_inserted']}/"
+                    + f"{tbl_sum['rows_submitted']} rows inserted, "
+                    + f"{tbl_sum['rows_ignored']} ignored, "
+                    + f"{tbl_sum['bytes']} bytes, "
+                    + f"{tbl_sum['seconds']} s"
+                )
+
+        # Append raw stats for cross-run comparison
+        stats_file = stats_file or os.environ.get("SQL_INSERT_STATS")
+        if stats_file and self._db_con.insert_stats:
+            with open(stats_file, "a") as sf:
+                for stat in self._db_con.insert_stats:
+                    sf.write(json.dumps(stat) + "\n")
+        return tbl_summary
 
     def _basic_prep(self):
         """Add subj_id and sess_id to df."""
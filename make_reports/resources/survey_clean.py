@@ -8,7 +8,6 @@ clean_rest_ratings : aggregate post-rest responses into dataframe
 
 import os
 import string
-import glob
 import re
 import pandas as pd
 import numpy as np
@@ -17,6 +16,7 @@ from make_reports.resources import report_helper
 import importlib.resources as pkg_resources
 from make_reports import reference_files
 from make_reports.resources import sql_database
+from make_reports.resources import file_catalog
 
 
 class CleanRedcap:
@@ -993,8 +993,11 @@ def clean_rest_ratings(sess, rawdata_path):
     df_sess = pd.DataFrame(columns=col_names)
 
     # Find all session files
+    bids_cat = file_catalog.get_catalog(
+        os.path.dirname(os.path.normpath(rawdata_path))
+    )
     beh_search_path = f"{rawdata_path}/sub-*/ses-{sess}/beh"
-    beh_list = sorted(glob.glob(f"{beh_search_path}/*rest-ratings*.tsv"))
+    beh_list = bids_cat.glob(f"{beh_search_path}/*rest-ratings*.tsv")
     if not beh_list:
         raise FileNotFoundError(
             f"No rest-ratings files found in {beh_search_path}."
@@ -1012,7 +1015,9 @@ def clean_rest_ratings(sess, rawdata_path):
         # events file.
         search_path = os.path.join(rawdata_path, subj, sess, "func")
         try:
-            task_path = glob.glob(f"{search_path}/*_run-02_events.tsv")[0]
+            task_path = bids_cat.glob(
+                f"{search_path}/*_run-02_events.tsv"
+            )[0]
             _, _, task, _, _ = os.path.basename(task_path).split("_")
         except IndexError:
             print(
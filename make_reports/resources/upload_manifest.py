@@ -0,0 +1,125 @@
+"""Checksum hosted NDAR upload files.
+
+write_manifest : hash ndar_upload/data_* files, write sha256sum manifest
+
+"""
+
+import os
+from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+from make_reports.resources import host_staging
+
+
+def _is_current(entry: dict, host_stat: os.stat_result) -> bool:
+    """Check whether host manifest digest matches the host file.
+
+    Entries written before host mtimes were recorded are matched by
+    source mtime, which hardlinked host files share.
+
+    """
+    if not entry or "sha256" not in entry:
+        return False
+    entry_mtime = entry.get("mtime_ns", entry.get("src_mtime_ns"))
+    return (
+        entry.get("size") == host_stat.st_size
+        and entry_mtime == host_stat.st_mtime_ns
+    )
+
+
+def _host_files(upload_dir: Union[str, os.PathLike]) -> list:
+    """Return sorted paths of files in data_* dirs, relative to upload_dir."""
+    host_list = []
+    for data_dir in sorted(os.listdir(upload_dir)):
+        if not data_dir.startswith("data_"):
+            continue
+        for root, _, file_list in os.walk(os.path.join(upload_dir, data_dir)):
+            for file_name in file_list:
+                if file_name.endswith((".part", ".tmp")):
+                    continue
+                host_list.append(
+                    os.path.relpath(os.path.join(root, file_name), upload_dir)
+                )
+    return sorted(host_list)
+
+
+def write_manifest(
+    upload_dir: Union[str, os.PathLike],
+    out_file: Union[str, os.PathLike],
+    num_threads: int = 4,
+) -> dict:
+    """Hash ndar_upload/data_* files, write sha256sum manifest.
+
+    Digests are reused from <upload_dir>/host_manifest.json (see
+    host_staging.HostStager) when the size and mtime of its entry
+    match the host file. Other files are hashed in a thread pool, once
+    per inode so hardlinked files are hashed once, and their digests
+    are added to host_manifest.json for re-runs.
+
+    Parameters
+    ----------
+    upload_dir : str, os.PathLike
+        Location of ndar_upload directory
+    out_file : str, os.PathLike
+        Location of manifest, e.g. <upload_dir>/cycle_<date>/
+        upload_manifest.sha256
+    num_threads : int, optional
+        Number of files hashed concurrently
+
+    Returns
+    -------
+    dict
+        {path relative to upload_dir: sha256 hex digest}
+
+    Notes
+    -----
+    Manifest lines follow sha256sum, with paths relative to upload_dir,
+    so hosted files are verified with:
+        cd <upload_dir>; sha256sum -c cycle_<date>/upload_manifest.sha256
+
+    """
+    host_man = host_staging.load_host_manifest(upload_dir)
+
+    # Find files without a current digest
+    host_list = _host_files(upload_dir)
+    stat_dict = {x: os.stat(os.path.join(upload_dir, x)) for x in host_list}
+    hash_dict = {}
+    for host_rel, host_stat in stat_dict.items():
+        if not _is_current(host_man.get(host_rel), host_stat):
+            ino_key = (host_stat.st_dev, host_stat.st_ino)
+            hash_dict.setdefault(ino_key, []).append(host_rel)
+    print(
+        f"\tHashing {sum(len(x) for x in hash_dict.values())} of "
+        + f"{len(host_list)} hosted files in : {upload_dir}"
+    )
+
+    # Hash files, record digests in host manifest
+    with ThreadPoolExecutor(max_workers=num_threads) as pool:
+        dig_list = list(
+            pool.map(
+                host_staging.sha256_file,
+                [os.path.join(upload_dir, x[0]) for x in hash_dict.values()],
+            )
+        )
+    for rel_list, digest in zip(hash_dict.values(), dig_list):
+        for host_rel in rel_list:
+            entry = host_man.setdefault(host_rel, {})
+            entry.update(
+                {
+                    "size": stat_dict[host_rel].st_size,
+                    "mtime_ns": stat_dict[host_rel].st_mtime_ns,
+                    "sha256": digest,
+                }
+            )
+    if hash_dict:
+        host_staging.save_host_manifest(upload_dir, host_man)
+
+    # Write manifest
+    man_dict = {x: host_man[x]["sha256"] for x in host_list}
+    os.makedirs(os.path.dirname(out_file), exist_ok=True)
+    tmp_path = f"{out_file}.tmp"
+    with open(tmp_path, "w") as mf:
+        for host_rel, digest in man_dict.items():
+            mf.write(f"{digest}  {host_rel}\n")
+    os.replace(tmp_path, out_file)
+    print(f"\tWrote : {out_file}")
+    return man_dict
@@ -10,10 +10,15 @@ check_emorep_all : check for expected EmoRep survey and rawdata files
 """
 # %%
 import os
+import re
+import time
+import pandas as pd
 from fnmatch import fnmatch
 from typing import Union
 from make_reports.resources import calc_metrics
 from make_reports.resources import check_data
+from make_reports.resources import file_catalog
+from make_reports.resources import progress_history
 
 
 # %%
@@ -75,10 +80,23 @@ class CheckProjectMri:
     Output file is named:
         [emorep | archival]_pipeline_progress.csv
 
+    Attributes
+    ----------
+    df_mri : pd.DataFrame
+        Pipeline progress of each participant * session
+
     Methods
     -------
     run_check(project)
         Conduct the check for either archival or emorep
+    watch_check(project, interval=300)
+        Conduct the check, then re-check changed participants until
+        interrupted
+    refresh_catalog(project)
+        Update the persistent file catalog of archival or emorep
+    report_trend(project, stall_days=14)
+        Report weekly throughput, stalled cells from progress history
+        of archival, emorep, or emorep_complete
 
     Example
     -------
@@ -87,6 +105,17 @@ class CheckProjectMri:
 
     """
 
+    _proj_dict = {
+        "emorep": {
+            "proj_path": "/mnt/keoki/experiments2/EmoRep/Exp2_Compute_Emotion/data_scanner_BIDS",  # noqa: E501
+            "sess": ["day2", "day3"],
+        },
+        "archival": {
+            "proj_path": "/mnt/keoki/experiments2/EmoRep/Exp3_Classify_Archival/data_mri_BIDS",  # noqa: E501
+            "sess": ["BAS1"],
+        },
+    }
+
     def run_check(self, proj_name):
         """Conduct check of expected files for specified project.
 
@@ -98,48 +127,168 @@ class CheckProjectMri:
 
         """
         # Check args and setup
-        if proj_name not in ["emorep", "archival"]:
-            raise ValueError(
-                f"Unexpected argument for --proj_name : {proj_name}"
-            )
+        self._validate(proj_name)
         self._setup(proj_name)
 
-        # Conduct planned checks
+        # Conduct planned checks, write dataframe
         print(f"\tStarting checks for {proj_name}")
+        self.df_mri = self._check_subj(proj_name, self._subj_list)
+        self._write_progress(proj_name)
+
+    def watch_check(self, proj_name, interval=300):
+        """Keep progress dataframe current as the project changes.
+
+        Conduct a full check, then poll the project file catalog every
+        interval seconds. Participants with added, removed, or modified
+        files (and newly encountered participants) are re-checked and
+        their rows replaced in the progress dataframe, which is then
+        rewritten atomically. Runs until interrupted.
+
+        Parameters
+        ----------
+        proj_name : str
+            [emorep | archival]
+            Desired project to check
+        interval : int, optional
+            Seconds between polls of the project directories
+
+        Notes
+        -----
+        Changes are detected via directory mtimes rather than inotify,
+        as inotify does not report changes made by other NFS clients.
+
+        """
+        self.run_check(proj_name)
+        bids_cat = file_catalog.get_catalog(self._proj_dir)
+        print(f"\tWatching {self._proj_dir} every {interval}s ...")
+        try:
+            while True:
+                time.sleep(interval)
+                bids_cat.refresh()
+                self._setup(proj_name)
+                subj_list = self._changed_subj(bids_cat.changed_paths)
+                if not subj_list:
+                    continue
+
+                # Replace rows of changed participants
+                print(f"\tRe-checking : {', '.join(subj_list)}")
+                df_new = self._check_subj(proj_name, subj_list)
+                self.df_mri = pd.concat(
+                    [
+                        self.df_mri.loc[~self.df_mri["subid"].isin(subj_list)],
+                        df_new,
+                    ],
+                    ignore_index=True,
+                ).sort_values(by=["subid", "sess"], ignore_index=True)
+                self._write_progress(proj_name)
+        except KeyboardInterrupt:
+            print("\tStopped watching")
+
+    def _check_subj(self, proj_name: str, subj_list: list) -> pd.DataFrame:
+        """Return progress dataframe of project participants."""
         chk_data = check_data.CheckMri(
-            self._subj_list, self._sess_list, self._raw_dir, self._deriv_dir
+            subj_list, self._sess_list, self._raw_dir, self._deriv_dir
         )
         if proj_name == "emorep":
             chk_data.check_emorep()
         else:
             chk_data.check_archival()
-
-        # Write dataframe, push
+        return chk_data.df_mri
+
+    def _changed_subj(self, changed_paths: list) -> list:
+        """Return participants with changed paths or missing rows."""
+        subj_set = set(self._subj_list) - set(self.df_mri["subid"])
+        for chg_path in changed_paths:
+            subj_match = re.search(r"/sub-([^_/.]+)", chg_path)
+            if subj_match:
+                subj_set.add(subj_match.group(1))
+        return sorted(subj_set & set(self._subj_list))
+
+    def _write_progress(self, proj_name: str):
+        """Write df_mri, replacing existing output atomically."""
         out_name = f"{proj_name}_pipeline_progress.csv"
         out_dir = os.path.join(self._deriv_dir, "track_data")
         if not os.path.exists(out_dir):
             os.makedirs(out_dir)
         out_file = os.path.join(out_dir, out_name)
         print(f"\tGenerating {out_file} ...")
-        chk_data.df_mri.to_csv(out_file, index=False, na_rep="")
+        tmp_file = f"{out_file}.tmp"
+        self.df_mri.to_csv(tmp_file, index=False, na_rep="")
+        os.replace(tmp_file, out_file)
+
+        # Keep history of changed cells
+        prog_hist = progress_history.ProgressHistory(_history_db(proj_name))
+        prog_hist.record(self.df_mri, proj_name)
+
+    def report_trend(self, proj_name, stall_days=14):
+        """Report per-step throughput and stalls from progress history.
+
+        Parameters
+        ----------
+        proj_name : str
+            [emorep | archival | emorep_complete]
+            Desired project, or the EmoRep complete check, to report
+        stall_days : int, optional
+            Minimum days since a partially complete cell last changed
+
+        Returns
+        -------
+        tuple
+            [0] = pd.DataFrame, subjects * sessions completed per week
+            [1] = pd.DataFrame, stalled cells
+
+        """
+        if proj_name != "emorep_complete":
+            self._validate(proj_name)
+        db_path = _history_db(proj_name)
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Expected history database : {db_path}")
+        prog_hist = progress_history.ProgressHistory(db_path)
+        df_week = prog_hist.throughput(proj_name)
+        df_stall = prog_hist.stalls(proj_name, days=stall_days)
+        print(f"\nCompleted subject * sessions per week : {proj_name}")
+        print(df_week.to_string())
+        print(f"\nStalled for at least {stall_days} days : {proj_name}")
+        print(df_stall.to_string(index=False))
+        return (df_week, df_stall)
+
+    def refresh_catalog(self, proj_name, full=False):
+        """Refresh persistent file catalog of specified project.
+
+        Parameters
+        ----------
+        proj_name : str
+            [emorep | archival]
+            Desired project to refresh
+        full : bool, optional
+            Re-list every directory regardless of mtime
+
+        Returns
+        -------
+        int
+            Number of directories re-listed
+
+        """
+        self._validate(proj_name)
+        bids_cat = file_catalog.get_catalog(
+            self._proj_dict[proj_name]["proj_path"]
+        )
+        return bids_cat.refresh(full=full)
+
+    def _validate(self, proj_name: str):
+        """Check for supported project name."""
+        if proj_name not in self._proj_dict:
+            raise ValueError(
+                f"Unexpected argument for --proj_name : {proj_name}"
+            )
 
     def _setup(self, project: str):
         """Set project-specific paths, lists as attributes."""
         # Set paths, lists
-        proj_dict = {
-            "emorep": {
-                "proj_path": "/mnt/keoki/experiments2/EmoRep/Exp2_Compute_Emotion/data_scanner_BIDS",  # noqa: E501
-                "sess": ["day2", "day3"],
-            },
-            "archival": {
-                "proj_path": "/mnt/keoki/experiments2/EmoRep/Exp3_Classify_Archival/data_mri_BIDS",  # noqa: E501
-                "sess": ["BAS1"],
-            },
-        }
-        self._proj_dir = proj_dict[project]["proj_path"]
+        self._proj_dir = self._proj_dict[project]["proj_path"]
         self._raw_dir = os.path.join(self._proj_dir, "rawdata")
         self._deriv_dir = os.path.join(self._proj_dir, "derivatives")
-        self._sess_list = proj_dict[project]["sess"]
+        self._sess_list = self._proj_dict[project]["sess"]
 
         # Find subjects
         if project == "emorep":
@@ -159,6 +308,22 @@ class CheckProjectMri:
         ]
 
 
+def _history_db(proj_name: str) -> str:
+    """Return progress history database of project or complete check.
+
+    Snapshots of the EmoRep complete check (emorep_complete) share the
+    database of the emorep project.
+
+    """
+    proj_key = "emorep" if proj_name == "emorep_complete" else proj_name
+    return os.path.join(
+        CheckProjectMri._proj_dict[proj_key]["proj_path"],
+        "derivatives",
+        "track_data",
+        "progress_history.db",
+    )
+
+
 def check_emorep_all():
     """Check EmoRep for missing data.
 
@@ -181,5 +346,12 @@ def check_emorep_all():
     print(f"\tGenerating {out_file} ...")
     cec.df_check.to_csv(out_file, index=False, na_rep="")
 
+    # Keep history of changed cells with the emorep project history
+    db_path = _history_db("emorep_complete")
+    if not os.path.exists(os.path.dirname(db_path)):
+        os.makedirs(os.path.dirname(db_path))
+    prog_hist = progress_history.ProgressHistory(db_path)
+    prog_hist.record(cec.df_check, "emorep_complete")
+
 
 # %%
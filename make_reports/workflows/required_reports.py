@@ -4,15 +4,25 @@ make_regular_reports : Generate reports submited to NIH or Duke
 MakeNdarReports : Generate reports, data submitted to NIH Data
                     Archive (NDAR)
 gen_guids : generate or check GUIDs
+package_ndar : Package NDAR cycle datasets and host files
 
 """
 
 # %%
 import os
+import glob
+import time
+import multiprocessing
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 from make_reports.resources import build_reports
+from make_reports.resources import build_ndar
 from make_reports.resources import manage_data
+from make_reports.resources import nda_validate
+from make_reports.resources import ndar_package
+from make_reports.resources import report_helper
+from make_reports.resources import upload_manifest
 
 
 # %%
@@ -292,6 +302,19 @@ class MakeNdarReports(_BuildArgs):
         Project's experiment directory
     close_date : datetime.date
         Submission cycle close date
+    jobs : int, optional
+        Number of worker processes for building image03
+    report_jobs : int, optional
+        Number of worker processes for building reports other
+        than image03, one report per task
+    compress : bool, optional
+        Also write gzip-compressed archive copies of datasets
+    incremental : bool, optional
+        Add only rows not found in the previous cycle's dataset,
+        and write new rows to <report>_delta.csv
+    checksums : bool, optional
+        Write sha256 manifest of hosted files to
+        cycle_<close_date>/upload_manifest.sha256
 
     Methods
     -------
@@ -308,18 +331,72 @@ class MakeNdarReports(_BuildArgs):
     Reports written to <proj_dir>/ndar_upload/cycle_<close_date>
     Data are hosted at <proj_dir>/ndar_upload/data_[mri|phys|beh]
 
+    Demographics are cleaned once into a build_ndar.DemoContext, and
+    each report builder receives a view of it.
+
+    When report_jobs > 1, reports are built in forked worker processes
+    which share df_demo and data_dict with the parent copy-on-write
+    rather than receiving pickled copies. Brd01 and image03 are built
+    in the parent as they write host files. Reports
+    are written by the parent in the requested order.
+
+    In incremental mode, the latest earlier cycle_<date> dataset of
+    each report is read. Image03 sessions already reported there are
+    not mined, and rows of other reports are matched to the previous
+    dataset by participant, visit, and data file columns. The full
+    dataset is the previous rows plus new rows, which are also written
+    to <report>_delta.csv. Without an earlier dataset, all rows are new
+    and both files hold the same rows.
+
+    Checksums of hosted files are reused from the host staging
+    manifest ndar_upload/host_manifest.json when the size and mtime
+    of the file match, so only new or changed files are hashed.
+
+    Reports are validated against reference_files/nda_definitions.json
+    (see resources.nda_validate) and all violations are raised before
+    datasets are written or host files are copied. Brd01 and image03,
+    which write host files, are built after other reports are validated.
+
     """
 
-    def __init__(self, proj_dir, close_date):
+    # Columns identifying a report row across cycles, when present
+    _key_cols = [
+        "src_subject_id",
+        "visit",
+        "visnum",
+        "image_file",
+        "data_file1",
+    ]
+
+    def __init__(
+        self,
+        proj_dir,
+        close_date,
+        jobs=1,
+        report_jobs=1,
+        compress=False,
+        incremental=False,
+        checksums=False,
+    ):
         """Initialize."""
         self._proj_dir = proj_dir
         self._close_date = close_date
+        self._jobs = jobs
+        self._report_jobs = report_jobs
+        self._compress = compress
+        self._incremental = incremental
+        self._checksums = checksums
         super().__init__()
 
     @property
     def _nda_switch(self) -> dict:
-        """Map requested report to build_ndar class and dataset name."""
-        return {
+        """Map requested report to build_ndar class and dataset name.
+
+        Survey reports declared only by a reference_files spec are
+        built by build_ndar.NdarSurvey.
+
+        """
+        nda_switch = {
             "affim01": ["NdarAffim01", "AIM"],
             "als01": ["NdarAls01", "ALS"],
             "bdi01": ["NdarBdi01", "BDI"],
@@ -337,6 +414,13 @@ class MakeNdarReports(_BuildArgs):
             "subject01": ["NdarSubject01", None],
             "tas01": ["NdarTas01", "TAS"],
         }
+        for report in report_helper.survey_specs():
+            if report not in nda_switch:
+                nda_switch[report] = [
+                    "NdarSurvey",
+                    report_helper.load_spec(report)["source"],
+                ]
+        return nda_switch
 
     def make_report(self, report_names):
         """Generate requested NDAR report(s).
@@ -354,28 +438,128 @@ class MakeNdarReports(_BuildArgs):
 
         # Download and clean data for requested reports
         gd = _GetData(self._proj_dir)
-        gd.get_data(report_names, self._close_date)
+        gd.get_data(self._data_names(report_names), self._close_date)
         self.df_demo = gd.df_demo
         self.data_dict = gd.data_dict
 
-        # Build each requested report
+        # Clean demographics once for all builders, index for builders
+        # with per-row lookups
+        self._demo_ctx = build_ndar.DemoContext(self.df_demo)
+        self._demo_idx = build_ndar.DemoIndex(self._demo_ctx.view())
+
+        # Get previously submitted datasets
+        self._prev_dict = {}
+        if self._incremental:
+            self._prev_dict = {x: self._prev_cycle(x) for x in report_names}
+
+        # Build each requested report, serially or in forked workers
+        host_list = [x for x in ["brd01", "image03"] if x in report_names]
+        pool_list = [x for x in report_names if x not in host_list]
+        if (
+            self._report_jobs > 1
+            and len(pool_list) > 1
+            and "fork" in multiprocessing.get_all_start_methods()
+        ):
+            rep_dict = self._build_pool(pool_list)
+        else:
+            rep_dict = {x: self._build_report(x) for x in pool_list}
+
+        # Validate reports against NDA definitions before any host file
+        # is written, then build reports which write host files. These
+        # validate themselves before writing their host files.
+        nda_validate.check_reports({x: rep_dict[x][:2] for x in pool_list})
+        for report in host_list:
+            rep_dict[report] = self._build_report(report)
+
+        # Write reports in requested order, report timings
         for self._report in report_names:
-            self._build_report()
-
-    def _build_report(self):
-        """Build requested report."""
-        # Build args. All classes take df_demo as arg 1. Supply project_dir
-        # to certain classes, give image03 close_date.
-        args = [self.df_demo.copy()]
-        if self._report in ["brd01", "image03", "panas01", "rrs01"]:
+            df_report, nda_label, _ = rep_dict[self._report]
+            self._write_report(df_report, nda_label)
+        print("\tReport build times (s) :")
+        for report in report_names:
+            print(f"\t\t{report} : {rep_dict[report][2]:.1f}")
+
+        # Record checksums of hosted files for upload verification
+        if self._checksums:
+            upload_dir = os.path.join(self._proj_dir, "ndar_upload")
+            upload_manifest.write_manifest(
+                upload_dir,
+                os.path.join(
+                    upload_dir,
+                    f"cycle_{self._close_date.strftime('%Y-%m-%d')}",
+                    "upload_manifest.sha256",
+                ),
+            )
+
+    def _data_names(self, report_names: list) -> list:
+        """Return report names used for getting data.
+
+        Spec-only survey reports are replaced by the report built from
+        the same survey data.
+
+        """
+        name_list = []
+        for report in report_names:
+            class_name, df_name = self._nda_switch[report]
+            if class_name == "NdarSurvey":
+                src_list = [
+                    x
+                    for x, y in self._nda_switch.items()
+                    if y[1] == df_name and y[0] != "NdarSurvey"
+                ]
+                if not src_list:
+                    raise ValueError(
+                        f"Unexpected source survey of {report} : {df_name}"
+                    )
+                report = src_list[0]
+            name_list.append(report)
+        return name_list
+
+    def _build_pool(self, report_names: list) -> dict:
+        """Build reports in forked worker processes.
+
+        The instance is set as a module global before the pool forks so
+        workers inherit it, only report names and results are pickled.
+
+        """
+        global _SHARED_NDAR
+        _SHARED_NDAR = self
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self._report_jobs,
+                mp_context=multiprocessing.get_context("fork"),
+            ) as pool:
+                rep_list = list(pool.map(_build_shared, report_names))
+        finally:
+            _SHARED_NDAR = None
+        return dict(zip(report_names, rep_list))
+
+    def _build_report(self, report: str) -> tuple:
+        """Build requested report, return df_report, nda_label, seconds."""
+        start_time = time.perf_counter()
+
+        # Build args. All classes take the shared demographic context as
+        # arg 1. Supply project_dir to certain classes, give image03
+        # close_date and jobs, and share demographic index with classes
+        # that look up each row.
+        args = [self._demo_ctx]
+        kwargs = {}
+        if report in ["brd01", "image03", "panas01", "rrs01"]:
             args = args + [self._proj_dir]
-        if self._report in ["image03"]:
+        if report in ["brd01", "image03"]:
+            kwargs["demo_idx"] = self._demo_idx
+        if report in ["image03"]:
             args = args + [self._close_date]
+            kwargs["jobs"] = self._jobs
+            kwargs["skip_sess"] = self._prev_sess()
 
         # Identify class name and get data if needed
-        class_name, df_name = self._nda_switch[self._report]
+        class_name, df_name = self._nda_switch[report]
         if df_name:
             args = args + self.build_args(self.data_dict, df_name)
+        if class_name == "NdarSurvey":
+            kwargs["report"] = report
+            kwargs["proj_dir"] = self._proj_dir
 
         # Get appropriate class for report, generate report.
         mod = __import__(
@@ -383,8 +567,12 @@ class MakeNdarReports(_BuildArgs):
             fromlist=[class_name],
         )
         rep_class = getattr(mod, class_name)
-        rep_obj = rep_class(*args)
-        self._write_report(rep_obj.df_report, rep_obj.nda_label)
+        rep_obj = rep_class(*args, **kwargs)
+        return (
+            rep_obj.df_report,
+            rep_obj.nda_label,
+            time.perf_counter() - start_time,
+        )
 
     def _write_report(self, df: pd.DataFrame, nda_label: list):
         """Write ndar report to disk."""
@@ -396,20 +584,76 @@ class MakeNdarReports(_BuildArgs):
         )
         if not os.path.exists(report_dir):
             os.makedirs(report_dir)
+
+        # In incremental mode write new rows, all rows are new when
+        # no earlier cycle exists. Add new rows to previous dataset.
+        if self._incremental:
+            df_prev = self._prev_dict.get(self._report)
+            if df_prev is not None:
+                prev_keys = set(self._row_keys(df_prev))
+                df = df.loc[[x not in prev_keys for x in self._row_keys(df)]]
+            out_delta = os.path.join(report_dir, f"{self._report}_delta.csv")
+            out_delta = report_helper.write_nda_report(
+                df, nda_label, out_delta, compress=self._compress
+            )
+            print(f"\tWrote {len(df)} new rows : {out_delta}")
+            if df_prev is not None:
+                df = pd.concat([df_prev, df], ignore_index=True)
+
         out_file = os.path.join(report_dir, f"{self._report}_dataset.csv")
-        print(f"\tWriting : {out_file}")
-        df.to_csv(out_file, index=False, na_rep="")
+        out_file = report_helper.write_nda_report(
+            df, nda_label, out_file, compress=self._compress
+        )
+        print(f"\tWrote : {out_file}")
+
+    def _prev_cycle(self, report: str) -> pd.DataFrame:
+        """Return dataset of report from latest earlier cycle, or None."""
+        cur_cycle = f"cycle_{self._close_date.strftime('%Y-%m-%d')}"
+        for cycle_dir in sorted(
+            glob.glob(f"{self._proj_dir}/ndar_upload/cycle_*"), reverse=True
+        ):
+            if os.path.basename(cycle_dir) >= cur_cycle:
+                continue
+            for suff in ["csv", "csv.gz"]:
+                prev_file = os.path.join(
+                    cycle_dir, f"{report}_dataset.{suff}"
+                )
+                if os.path.exists(prev_file):
+                    print(f"\tFound previous dataset : {prev_file}")
+                    return pd.read_csv(
+                        prev_file,
+                        skiprows=1,
+                        dtype=str,
+                        keep_default_na=False,
+                    )
+        return None
+
+    def _row_keys(self, df: pd.DataFrame) -> list:
+        """Return tuples of identifying column values as str."""
+        key_cols = [x for x in self._key_cols if x in df.columns]
+        df_key = df[key_cols].fillna("").astype(str)
+        return list(df_key.itertuples(index=False, name=None))
+
+    def _prev_sess(self) -> set:
+        """Return (src_subject_id, visit) of previous image03 sessions."""
+        df_prev = self._prev_dict.get("image03")
+        if df_prev is None:
+            return set()
+        df_prev = df_prev.loc[df_prev["visnum"] != ""]
+        return set(
+            zip(
+                df_prev["src_subject_id"],
+                df_prev["visnum"].astype(float).astype(int).astype(str),
+            )
+        )
+
 
-        # Prepend header
-        dummy_file = f"{out_file}.bak"
-        with open(out_file, "r") as read_obj, open(
-            dummy_file, "w"
-        ) as write_obj:
-            write_obj.write(f"{','.join(nda_label)}\n")
-            for line in read_obj:
-                write_obj.write(line)
-        os.remove(out_file)
-        os.rename(dummy_file, out_file)
+_SHARED_NDAR = None
+
+
+def _build_shared(report: str) -> tuple:
+    """Build report from MakeNdarReports inherited by forked worker."""
+    return _SHARED_NDAR._build_report(report)
 
 
 # %%
@@ -446,3 +690,36 @@ def generate_guids(proj_dir, user_name, user_pass, find_mismatch):
             print(f"Mismatching GUIDs :\n\t{guid_obj.mismatch_list}")
         else:
             print("No mismatches found!")
+
+
+# %%
+def package_ndar(proj_dir, close_date, compress=None):
+    """Package NDAR cycle datasets and referenced host files.
+
+    The archive is written to:
+        <proj_dir>/ndar_upload/cycle_<close_date>.tar.[zst|gz]
+
+    Parameters
+    ----------
+    proj_dir : path
+        Project's experiment directory
+    close_date : datetime.date
+        Submission cycle close date
+    compress : str, optional
+        [zstd | gz], compression of archive
+
+    Returns
+    -------
+    str
+        Location of archive
+
+    """
+    upload_dir = os.path.join(proj_dir, "ndar_upload")
+    cycle_dir = os.path.join(
+        upload_dir, f"cycle_{close_date.strftime('%Y-%m-%d')}"
+    )
+    if not os.path.exists(cycle_dir):
+        raise FileNotFoundError(f"Expected to find cycle at : {cycle_dir}")
+    return ndar_package.write_package(
+        upload_dir, cycle_dir, compress=compress
+    )
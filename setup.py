@@ -13,6 +13,7 @@ setup(
             "rep_regular=make_reports.cli.rep_regular:main",
             "rep_metrics=make_reports.cli.rep_metrics:main",
             "rep_ndar=make_reports.cli.rep_ndar:main",
+            "pkg_ndar=make_reports.cli.pkg_ndar:main",
             "chk_data=make_reports.cli.chk_data:main",
             "gen_guids=make_reports.cli.gen_guids:main",
             "sur_stats=make_reports.cli.sur_stats:main",